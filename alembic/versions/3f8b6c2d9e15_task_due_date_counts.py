@@ -0,0 +1,40 @@
+"""Task due date counts
+
+Revision ID: 3f8b6c2d9e15
+Revises: 7c3e5f1a9d84
+Create Date: 2026-10-18 17:42:08.256913
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8b6c2d9e15'
+down_revision: Union[str, None] = '7c3e5f1a9d84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Агрегат /tasks/stats по самой таблице задач обслуживает индекс
+    # ix_tasks_user_id_due_date_id; сводка нужна для чтения без
+    # просмотра всех задач пользователя.
+    op.create_table(
+        'task_due_date_counts',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('task_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'due_date'),
+    )
+    op.execute(
+        'INSERT INTO task_due_date_counts (user_id, due_date, task_count) '
+        'SELECT user_id, due_date, count(*) FROM tasks '
+        'GROUP BY user_id, due_date'
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_due_date_counts')
@@ -0,0 +1,48 @@
+"""Task keyset pagination indexes
+
+Revision ID: 5d2e8a41c7b3
+Revises: cb3ccf56a1f6
+Create Date: 2026-10-18 10:05:12.418203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2e8a41c7b3'
+down_revision: Union[str, None] = 'cb3ccf56a1f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_tasks_due_date_id', 'tasks', ['due_date', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_tasks_user_id_id', 'tasks', ['user_id', 'id'], unique=False
+    )
+    op.create_index(
+        'ix_tasks_user_id_due_date_id',
+        'tasks',
+        ['user_id', 'due_date', 'id'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_tasks_title_prefix',
+        'tasks',
+        ['title'],
+        unique=False,
+        postgresql_ops={'title': 'text_pattern_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tasks_title_prefix', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_due_date_id', table_name='tasks')
+    op.drop_index('ix_tasks_user_id_id', table_name='tasks')
+    op.drop_index('ix_tasks_due_date_id', table_name='tasks')
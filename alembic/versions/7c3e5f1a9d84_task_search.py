@@ -0,0 +1,67 @@
+"""Task full-text search
+
+Revision ID: 7c3e5f1a9d84
+Revises: e4a7d90b35c2
+Create Date: 2026-10-18 15:10:27.418305
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e5f1a9d84'
+down_revision: Union[str, None] = 'e4a7d90b35c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TASK_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    op.add_column(
+        'tasks',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(TASK_SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        'ix_tasks_search_vector',
+        'tasks',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+    # pg_trgm входит в contrib и есть не на каждом сервере: без него
+    # поиск работает без нечёткого совпадения (TASK_SEARCH_FUZZY=false).
+    available = op.get_bind().scalar(
+        sa.text(
+            "SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'"
+        )
+    )
+    if available:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_tasks_title_trgm',
+            'tasks',
+            ['title'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    op.execute('DROP INDEX IF EXISTS ix_tasks_title_trgm')
+    op.drop_index('ix_tasks_search_vector', table_name='tasks')
+    op.drop_column('tasks', 'search_vector')
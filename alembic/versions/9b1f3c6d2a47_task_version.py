@@ -0,0 +1,32 @@
+"""Task version column
+
+Revision ID: 9b1f3c6d2a47
+Revises: 5d2e8a41c7b3
+Create Date: 2026-10-18 12:40:37.115902
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1f3c6d2a47'
+down_revision: Union[str, None] = '5d2e8a41c7b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'tasks',
+        sa.Column(
+            'version', sa.Integer(), server_default='1', nullable=False
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('tasks', 'version')
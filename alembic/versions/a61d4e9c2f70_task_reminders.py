@@ -0,0 +1,43 @@
+"""Task reminders
+
+Revision ID: a61d4e9c2f70
+Revises: 3f8b6c2d9e15
+Create Date: 2026-10-18 19:26:44.081532
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a61d4e9c2f70'
+down_revision: Union[str, None] = '3f8b6c2d9e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Выборка ближайших сроков идёт по существующему индексу
+    # ix_tasks_due_date_id.
+    op.create_table(
+        'task_reminders',
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column(
+            'sent_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ['task_id'], ['tasks.id'], ondelete='CASCADE'
+        ),
+        sa.PrimaryKeyConstraint('task_id', 'due_date'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_reminders')
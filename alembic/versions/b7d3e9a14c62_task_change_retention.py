@@ -0,0 +1,40 @@
+"""Task change log retention
+
+Revision ID: b7d3e9a14c62
+Revises: d28f5b7e1c93
+Create Date: 2026-10-18 22:14:37.218904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9a14c62'
+down_revision: Union[str, None] = 'd28f5b7e1c93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_task_changes_task_id_user_id_seq',
+        'task_changes',
+        ['task_id', 'user_id', 'seq'],
+        unique=False,
+    )
+    op.create_table(
+        'task_change_horizons',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('pruned_seq', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('task_change_horizons')
+    op.drop_index(
+        'ix_task_changes_task_id_user_id_seq', table_name='task_changes'
+    )
@@ -0,0 +1,67 @@
+"""Transactional outbox
+
+Revision ID: d28f5b7e1c93
+Revises: a61d4e9c2f70
+Create Date: 2026-10-18 21:08:15.664207
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd28f5b7e1c93'
+down_revision: Union[str, None] = 'a61d4e9c2f70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('topic', sa.String(), nullable=False),
+        sa.Column(
+            'payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False
+        ),
+        sa.Column(
+            'attempts', sa.Integer(), server_default='0', nullable=False
+        ),
+        sa.Column(
+            'available_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column(
+            'created_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column(
+            'dead_lettered_at', sa.DateTime(timezone=True), nullable=True
+        ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_outbox_available_at_id',
+        'outbox',
+        ['available_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text('dead_lettered_at IS NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        'ix_outbox_available_at_id',
+        table_name='outbox',
+        postgresql_where=sa.text('dead_lettered_at IS NULL'),
+    )
+    op.drop_table('outbox')
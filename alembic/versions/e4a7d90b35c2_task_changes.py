@@ -0,0 +1,55 @@
+"""Task change log
+
+Revision ID: e4a7d90b35c2
+Revises: 9b1f3c6d2a47
+Create Date: 2026-10-18 14:02:51.730614
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a7d90b35c2'
+down_revision: Union[str, None] = '9b1f3c6d2a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'task_changes',
+        sa.Column('seq', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column(
+            'deleted', sa.Boolean(), server_default='false', nullable=False
+        ),
+        sa.Column(
+            'changed_at',
+            sa.DateTime(timezone=True),
+            server_default=sa.text('now()'),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint('seq'),
+    )
+    op.create_index(
+        'ix_task_changes_user_id_seq',
+        'task_changes',
+        ['user_id', 'seq'],
+        unique=False,
+    )
+    # Существующие задачи попадают в журнал, чтобы первая синхронизация
+    # с since=0 вернула их все.
+    op.execute(
+        'INSERT INTO task_changes (task_id, user_id) '
+        'SELECT id, user_id FROM tasks ORDER BY id'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_task_changes_user_id_seq', table_name='task_changes')
+    op.drop_table('task_changes')
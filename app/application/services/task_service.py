@@ -1,13 +1,44 @@
-from app.domain.entities.task import Task
-from app.entrypoints.api.schemas.task import TaskCreate, TaskUpdate
+from datetime import date
+from typing import AsyncIterator
+
+from app.domain.entities.task import (
+    Task,
+    TaskBatchDeleteResult,
+    TaskBatchResult,
+    TaskChangePage,
+    TaskCursor,
+    TaskEvent,
+    TaskEventType,
+    TaskFilter,
+    TaskOrdering,
+    TaskPage,
+    TaskRecord,
+    TaskStats,
+)
+from app.entrypoints.api.schemas.task import (
+    TaskBatchUpdateItem,
+    TaskCreate,
+    TaskUpdate,
+)
+from app.domain.interfaces.task_events import TaskEventPublisher
 from app.domain.interfaces.task_repository import TaskRepository
 from app.application.use_cases.task import (
     CreateTaskUseCase,
+    CreateTasksBatchUseCase,
     GetTaskByIdUseCase,
+    GetTaskVersionUseCase,
+    GetUserTasksVersionUseCase,
+    GetTaskChangesUseCase,
+    GetTaskStatsUseCase,
     GetAllTasksUseCase,
+    GetTasksPageUseCase,
+    SearchTasksUseCase,
+    ExportTasksUseCase,
     GetAllTasksByUserIdUseCase,
     UpdateTaskUseCase,
+    UpdateTasksBatchUseCase,
     DeleteTaskUseCase,
+    DeleteTasksBatchUseCase,
 )
 
 
@@ -16,20 +47,38 @@ class TaskService:
     Сервис для управления задачами.
     """
 
-    def __init__(self, task_repository: TaskRepository):
+    def __init__(
+        self,
+        task_repository: TaskRepository,
+        task_events: TaskEventPublisher | None = None,
+    ):
         """
         Инициализация сервиса с внедрением зависимостей.
 
         :param task_repository: Репозиторий задач
+        :param task_events: Публикатор событий изменения задач
         """
+        self.task_events = task_events
         self.create_task_uc = CreateTaskUseCase(task_repository)
+        self.create_tasks_batch_uc = CreateTasksBatchUseCase(task_repository)
         self.get_task_by_id_uc = GetTaskByIdUseCase(task_repository)
+        self.get_task_version_uc = GetTaskVersionUseCase(task_repository)
+        self.get_user_tasks_version_uc = GetUserTasksVersionUseCase(
+            task_repository
+        )
+        self.get_task_changes_uc = GetTaskChangesUseCase(task_repository)
+        self.get_task_stats_uc = GetTaskStatsUseCase(task_repository)
         self.get_all_tasks_uc = GetAllTasksUseCase(task_repository)
+        self.get_tasks_page_uc = GetTasksPageUseCase(task_repository)
+        self.search_tasks_uc = SearchTasksUseCase(task_repository)
+        self.export_tasks_uc = ExportTasksUseCase(task_repository)
         self.get_all_tasks_by_user_id_uc = GetAllTasksByUserIdUseCase(
             task_repository
         )
         self.update_task_uc = UpdateTaskUseCase(task_repository)
+        self.update_tasks_batch_uc = UpdateTasksBatchUseCase(task_repository)
         self.delete_task_uc = DeleteTaskUseCase(task_repository)
+        self.delete_tasks_batch_uc = DeleteTasksBatchUseCase(task_repository)
 
     async def create_task(self, task_create: TaskCreate, user_id: int) -> Task:
         """
@@ -46,10 +95,41 @@ class TaskService:
             due_date=task_create.due_date,
             user_id=user_id,
         )
-        return await self.create_task_uc.execute(task_entity)
+        task = await self.create_task_uc.execute(task_entity)
+        await self._publish(TaskEventType.CREATED, [task])
+        return task
+
+    async def create_tasks_batch(
+        self, task_creates: list[TaskCreate], user_id: int
+    ) -> TaskBatchResult:
+        """
+        Создать пакет задач одной транзакцией.
+
+        :param task_creates: Данные для создания задач
+        :param user_id: ID пользователя, которому принадлежат задачи
+        :return: Созданные задачи и ошибки по элементам
+        """
+        result = await self.create_tasks_batch_uc.execute(
+            [
+                Task(
+                    id=None,
+                    title=task_create.title,
+                    description=task_create.description,
+                    due_date=task_create.due_date,
+                    user_id=user_id,
+                )
+                for task_create in task_creates
+            ]
+        )
+        await self._publish(TaskEventType.CREATED, result.tasks)
+        return result
 
     async def update_task(
-        self, task_update: TaskUpdate, task_id: int, user_id: int
+        self,
+        task_update: TaskUpdate,
+        task_id: int,
+        user_id: int,
+        expected_version: int | None = None,
     ) -> Task:
         """
         Обновить существующую задачу.
@@ -57,6 +137,7 @@ class TaskService:
         :param task_update: Данные для обновления задачи
         :param task_id: ID задачи
         :param user_id: ID пользователя, которому принадлежит задача
+        :param expected_version: Версия из If-Match, если она передана
         :return: Обновленная задача
         """
         task_entity = Task(
@@ -66,7 +147,50 @@ class TaskService:
             due_date=task_update.due_date,
             user_id=user_id,
         )
-        return await self.update_task_uc.execute(task_entity)
+        result = await self.update_task_uc.execute(
+            task_entity, expected_version=expected_version
+        )
+        task = result.task
+        if (
+            self.task_events is not None
+            and result.previous_user_id != task.user_id
+        ):
+            # Для прежнего владельца задача исчезла из набора, как и в
+            # журнале изменений, где он получает tombstone.
+            await self.task_events.publish(
+                TaskEvent(
+                    type=TaskEventType.DELETED,
+                    task_id=task.id,
+                    user_id=result.previous_user_id,
+                )
+            )
+        await self._publish(TaskEventType.UPDATED, [task])
+        return task
+
+    async def update_tasks_batch(
+        self, items: list[TaskBatchUpdateItem], user_id: int
+    ) -> TaskBatchResult:
+        """
+        Обновить пакет задач пользователя одной транзакцией.
+
+        :param items: Данные для обновления задач с их ID
+        :param user_id: ID пользователя, которому принадлежат задачи
+        :return: Обновленные задачи и ошибки по элементам
+        """
+        result = await self.update_tasks_batch_uc.execute(
+            [
+                Task(
+                    id=item.id,
+                    title=item.title,
+                    description=item.description,
+                    due_date=item.due_date,
+                    user_id=user_id,
+                )
+                for item in items
+            ]
+        )
+        await self._publish(TaskEventType.UPDATED, result.tasks)
+        return result
 
     async def get_task_by_id(self, task_id: int) -> Task | None:
         """
@@ -77,6 +201,47 @@ class TaskService:
         """
         return await self.get_task_by_id_uc.execute(task_id)
 
+    async def get_task_version(self, task_id: int) -> int | None:
+        """
+        Получить версию задачи.
+
+        :param task_id: ID задачи
+        :return: Версия или None, если задача не найдена
+        """
+        return await self.get_task_version_uc.execute(task_id)
+
+    async def get_user_tasks_version(self, user_id: int) -> int:
+        """
+        Получить версию набора задач пользователя.
+
+        :param user_id: ID пользователя
+        :return: Версия набора
+        """
+        return await self.get_user_tasks_version_uc.execute(user_id)
+
+    async def get_task_changes(
+        self, user_id: int, since: int, limit: int
+    ) -> TaskChangePage:
+        """
+        Получить изменения задач пользователя после курсора.
+
+        :param user_id: ID пользователя
+        :param since: Курсор из предыдущего ответа (0 - с начала)
+        :param limit: Максимальное количество изменений
+        :return: Страница изменений с новым курсором
+        """
+        return await self.get_task_changes_uc.execute(user_id, since, limit)
+
+    async def get_task_stats(self, user_id: int, today: date) -> TaskStats:
+        """
+        Посчитать задачи пользователя по срокам.
+
+        :param user_id: ID пользователя
+        :param today: Текущая дата пользователя
+        :return: Количество просроченных, сегодняшних и предстоящих задач
+        """
+        return await self.get_task_stats_uc.execute(user_id, today)
+
     async def get_all_tasks(self) -> list[Task]:
         """
         Получить список всех задач.
@@ -85,6 +250,58 @@ class TaskService:
         """
         return await self.get_all_tasks_uc.execute()
 
+    async def get_tasks_page(
+        self,
+        filters: TaskFilter,
+        limit: int,
+        cursor: TaskCursor | None = None,
+        ordering: TaskOrdering = TaskOrdering.ID,
+    ) -> TaskPage:
+        """
+        Получить страницу задач с фильтрацией.
+
+        :param filters: Фильтры выборки
+        :param limit: Размер страницы
+        :param cursor: Курсор, полученный с предыдущей страницей
+        :param ordering: Порядок сортировки
+        :return: Страница задач
+        """
+        return await self.get_tasks_page_uc.execute(
+            filters, limit, cursor=cursor, ordering=ordering
+        )
+
+    async def search_tasks(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        cursor: TaskCursor | None = None,
+    ) -> TaskPage:
+        """
+        Найти задачи пользователя по заголовку и описанию.
+
+        :param user_id: ID пользователя
+        :param query: Строка поиска
+        :param limit: Максимальное количество задач на странице
+        :param cursor: Курсор следующей страницы
+        :return: Страница задач, упорядоченная по релевантности
+        """
+        return await self.search_tasks_uc.execute(
+            user_id, query, limit, cursor=cursor
+        )
+
+    def export_tasks(
+        self, filters: TaskFilter, chunk_size: int
+    ) -> AsyncIterator[list[TaskRecord]]:
+        """
+        Потоково выгрузить задачи для массовых потребителей.
+
+        :param filters: Фильтры выборки
+        :param chunk_size: Размер порции
+        :return: Асинхронный итератор порций записей задач
+        """
+        return self.export_tasks_uc.execute(filters, chunk_size)
+
     async def get_all_tasks_by_user_id(self, user_id: int) -> list[Task]:
         """
         Получить задачи, принадлежащие конкретному пользователю.
@@ -100,4 +317,42 @@ class TaskService:
 
         :param task_id: ID задачи
         """
-        await self.delete_task_uc.execute(task_id)
+        task = await self.delete_task_uc.execute(task_id)
+        await self._publish(TaskEventType.DELETED, [task])
+
+    async def delete_tasks_batch(
+        self, task_ids: list[int], user_id: int
+    ) -> TaskBatchDeleteResult:
+        """
+        Удалить пакет задач пользователя одной транзакцией.
+
+        :param task_ids: ID задач
+        :param user_id: ID пользователя, которому принадлежат задачи
+        :return: ID удалённых задач и ошибки по элементам
+        """
+        result = await self.delete_tasks_batch_uc.execute(task_ids, user_id)
+        if self.task_events is not None:
+            for task_id in result.deleted_ids:
+                await self.task_events.publish(
+                    TaskEvent(
+                        type=TaskEventType.DELETED,
+                        task_id=task_id,
+                        user_id=user_id,
+                    )
+                )
+        return result
+
+    async def _publish(
+        self, event_type: TaskEventType, tasks: list[Task]
+    ) -> None:
+        if self.task_events is None:
+            return
+        for task in tasks:
+            await self.task_events.publish(
+                TaskEvent(
+                    type=event_type,
+                    task_id=task.id,
+                    user_id=task.user_id,
+                    task=None if event_type == TaskEventType.DELETED else task,
+                )
+            )
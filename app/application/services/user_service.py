@@ -1,9 +1,11 @@
 from app.domain.entities.user import User
+from app.domain.interfaces.password_hasher import PasswordHasher
 from app.domain.interfaces.user_repository import UserRepository
 from app.application.use_cases.user import (
     CreateUserUseCase,
     GetUserByIdUseCase,
     GetUserByUsernameUseCase,
+    DeactivateUserUseCase,
     DeleteUserUseCase,
 )
 
@@ -13,17 +15,25 @@ class UserService:
     Сервис для управления пользователями.
     """
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        password_hasher: PasswordHasher,
+    ):
         """
         Инициализация сервиса с внедрением зависимостей.
 
         :param user_repository: Репозиторий пользователей
+        :param password_hasher: Сервис хеширования паролей
         """
-        self.create_user_uc = CreateUserUseCase(user_repository)
+        self.create_user_uc = CreateUserUseCase(
+            user_repository, password_hasher
+        )
         self.get_user_by_id_uc = GetUserByIdUseCase(user_repository)
         self.get_user_by_username_uc = GetUserByUsernameUseCase(
             user_repository
         )
+        self.deactivate_user_uc = DeactivateUserUseCase(user_repository)
         self.delete_user_uc = DeleteUserUseCase(user_repository)
 
     async def create_user(self, user: User) -> User:
@@ -50,6 +60,12 @@ class UserService:
         """
         return await self.get_user_by_username_uc.execute(username)
 
+    async def deactivate_user(self, user_id: int) -> None:
+        """
+        Деактивировать пользователя по его ID.
+        """
+        await self.deactivate_user_uc.execute(user_id)
+
     async def delete_user(self, user_id: int) -> None:
         """
         Удалить пользователя по его ID.
@@ -1,4 +1,21 @@
-from app.domain.entities.task import Task
+from datetime import date
+from typing import AsyncIterator
+
+from app.domain.entities.task import (
+    Task,
+    TaskBatchDeleteResult,
+    TaskBatchError,
+    TaskBatchResult,
+    TaskChangePage,
+    TaskCursor,
+    TaskFilter,
+    TaskOrdering,
+    TaskPage,
+    TaskRecord,
+    TaskStats,
+    TaskUpdateResult,
+    search_terms,
+)
 from app.domain.interfaces.task_repository import TaskRepository
 
 
@@ -19,6 +36,33 @@ class CreateTaskUseCase:
         return await self.repository.create(task)
 
 
+class CreateTasksBatchUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    async def execute(self, tasks: list[Task]) -> TaskBatchResult:
+        """
+        Создать пакет задач одной транзакцией.
+
+        Некорректные элементы не прерывают пакет, а попадают в errors
+        с индексом во входном списке.
+
+        :param tasks: задачи для создания
+        :return: созданные задачи и ошибки по элементам
+        """
+        errors = []
+        valid = []
+        for index, task in enumerate(tasks):
+            if not task.title.strip():
+                errors.append(
+                    TaskBatchError(index=index, detail="Title cannot be empty")
+                )
+                continue
+            valid.append(task)
+        created = await self.repository.create_many(valid)
+        return TaskBatchResult(tasks=created, errors=errors)
+
+
 class GetTaskByIdUseCase:
     def __init__(self, repository: TaskRepository):
         self.repository = repository
@@ -33,6 +77,71 @@ class GetTaskByIdUseCase:
         return await self.repository.get_by_id(task_id)
 
 
+class GetTaskVersionUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    async def execute(self, task_id: int) -> int | None:
+        """
+        Получить версию задачи для проверки условных запросов.
+
+        :param task_id: ID задачи
+        :return: версия или None, если задачи нет
+        """
+        return await self.repository.get_version(task_id)
+
+
+class GetUserTasksVersionUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    async def execute(self, user_id: int) -> int:
+        """
+        Получить версию набора задач пользователя.
+
+        :param user_id: ID пользователя
+        :return: версия набора
+        """
+        return await self.repository.get_user_tasks_version(user_id)
+
+
+class GetTaskStatsUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    async def execute(self, user_id: int, today: date) -> TaskStats:
+        """
+        Посчитать задачи пользователя по срокам.
+
+        :param user_id: ID пользователя
+        :param today: текущая дата пользователя
+        :return: количество просроченных, сегодняшних и предстоящих задач
+        """
+        return await self.repository.get_stats(user_id, today)
+
+
+class GetTaskChangesUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    async def execute(
+        self, user_id: int, since: int, limit: int
+    ) -> TaskChangePage:
+        """
+        Получить изменения задач пользователя после курсора.
+
+        :param user_id: ID пользователя
+        :param since: курсор, полученный в предыдущем ответе (0 - с начала)
+        :param limit: максимальное количество изменений
+        :return: страница изменений
+        :raises ValueError: если курсор отрицательный
+        :raises TaskChangesExpired: если курсор старше хранимого журнала
+        """
+        if since < 0:
+            raise ValueError("Cursor cannot be negative")
+        return await self.repository.get_changes(user_id, since, limit)
+
+
 class GetAllTasksUseCase:
     def __init__(self, repository: TaskRepository):
         self.repository = repository
@@ -46,6 +155,85 @@ class GetAllTasksUseCase:
         return await self.repository.get_all()
 
 
+class GetTasksPageUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    async def execute(
+        self,
+        filters: TaskFilter,
+        limit: int,
+        cursor: TaskCursor | None = None,
+        ordering: TaskOrdering = TaskOrdering.ID,
+    ) -> TaskPage:
+        """
+        Получить страницу задач.
+
+        :param filters: фильтры выборки
+        :param limit: размер страницы
+        :param cursor: курсор предыдущей страницы
+        :param ordering: порядок сортировки
+        :return: страница задач
+        :raises ValueError: если limit не положительный или диапазон дат пуст
+        """
+        if limit < 1:
+            raise ValueError("Limit must be positive")
+        _check_due_range(filters)
+        return await self.repository.get_page(
+            filters, limit, cursor=cursor, ordering=ordering
+        )
+
+
+class SearchTasksUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    async def execute(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        cursor: TaskCursor | None = None,
+    ) -> TaskPage:
+        """
+        Найти задачи пользователя по словам из заголовка и описания.
+
+        :param user_id: ID пользователя
+        :param query: строка поиска
+        :param limit: максимальное количество задач на странице
+        :param cursor: курсор следующей страницы из предыдущего ответа
+        :return: страница задач, упорядоченная по релевантности
+        :raises ValueError: если в запросе нет ни одного слова
+        """
+        if not search_terms(query):
+            raise ValueError("Search query must contain a word")
+        return await self.repository.search(
+            user_id, query, limit, cursor=cursor
+        )
+
+
+class ExportTasksUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    def execute(
+        self, filters: TaskFilter, chunk_size: int
+    ) -> AsyncIterator[list[TaskRecord]]:
+        """
+        Потоково выгрузить задачи порциями.
+
+        :param filters: фильтры выборки
+        :param chunk_size: размер порции
+        :return: асинхронный итератор порций записей задач
+        :raises ValueError: если chunk_size не положительный или диапазон
+            дат пуст
+        """
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be positive")
+        _check_due_range(filters)
+        return self.repository.stream(filters, chunk_size)
+
+
 class GetAllTasksByUserIdUseCase:
     def __init__(self, repository: TaskRepository):
         self.repository = repository
@@ -64,27 +252,124 @@ class UpdateTaskUseCase:
     def __init__(self, repository: TaskRepository):
         self.repository = repository
 
-    async def execute(self, task: Task) -> Task:
+    async def execute(
+        self, task: Task, expected_version: int | None = None
+    ) -> TaskUpdateResult:
         """
         Обновить задачу.
 
         :param task: обновлённый объект задачи
-        :return: обновлённая задача
+        :param expected_version: обновить, только если версия совпадает
+        :return: обновлённая задача и её прежний владелец
         :raises ValueError: если title пустой
+        :raises TaskVersionConflict: если версия задачи не совпала
         """
         if not task.title.strip():
             raise ValueError("Title cannot be empty")
-        return await self.repository.update(task)
+        return await self.repository.update(
+            task, expected_version=expected_version
+        )
+
+
+class UpdateTasksBatchUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    async def execute(self, tasks: list[Task]) -> TaskBatchResult:
+        """
+        Обновить пакет задач одной транзакцией.
+
+        :param tasks: задачи с обновленными данными
+        :return: обновленные задачи и ошибки по элементам
+        """
+        errors = []
+        valid = {}
+        for index, task in enumerate(tasks):
+            if not task.title.strip():
+                error = "Title cannot be empty"
+            elif task.id in valid:
+                error = "Duplicate task id"
+            else:
+                valid[task.id] = index
+                continue
+            errors.append(
+                TaskBatchError(index=index, detail=error, task_id=task.id)
+            )
+        updated = await self.repository.update_many(
+            [tasks[index] for index in valid.values()]
+        )
+        updated_ids = {task.id for task in updated}
+        errors.extend(
+            TaskBatchError(index=index, detail="Task not found", task_id=id_)
+            for id_, index in valid.items()
+            if id_ not in updated_ids
+        )
+        errors.sort(key=lambda error: error.index)
+        return TaskBatchResult(tasks=updated, errors=errors)
 
 
 class DeleteTaskUseCase:
     def __init__(self, repository: TaskRepository):
         self.repository = repository
 
-    async def execute(self, task_id: int) -> None:
+    async def execute(self, task_id: int) -> Task:
         """
         Удалить задачу по ID.
 
         :param task_id: ID задачи
+        :return: удалённая задача
         """
-        await self.repository.delete(task_id)
+        return await self.repository.delete(task_id)
+
+
+class DeleteTasksBatchUseCase:
+    def __init__(self, repository: TaskRepository):
+        self.repository = repository
+
+    async def execute(
+        self, task_ids: list[int], user_id: int
+    ) -> TaskBatchDeleteResult:
+        """
+        Удалить пакет задач пользователя одной транзакцией.
+
+        :param task_ids: ID задач
+        :param user_id: ID владельца задач
+        :return: ID удалённых задач и ошибки по элементам
+        """
+        errors = []
+        unique = {}
+        for index, task_id in enumerate(task_ids):
+            if task_id in unique:
+                errors.append(
+                    TaskBatchError(
+                        index=index,
+                        detail="Duplicate task id",
+                        task_id=task_id,
+                    )
+                )
+                continue
+            unique[task_id] = index
+        deleted_ids = await self.repository.delete_many(list(unique), user_id)
+        deleted = set(deleted_ids)
+        errors.extend(
+            TaskBatchError(
+                index=index, detail="Task not found", task_id=task_id
+            )
+            for task_id, index in unique.items()
+            if task_id not in deleted
+        )
+        errors.sort(key=lambda error: error.index)
+        return TaskBatchDeleteResult(deleted_ids=deleted_ids, errors=errors)
+
+
+def _check_due_range(filters: TaskFilter) -> None:
+    """
+    :param filters: фильтры выборки
+    :raises ValueError: если due_from позже due_to
+    """
+    if (
+        filters.due_from is not None
+        and filters.due_to is not None
+        and filters.due_from > filters.due_to
+    ):
+        raise ValueError("due_from must not be after due_to")
@@ -1,14 +1,17 @@
-from passlib.context import CryptContext
 from app.domain.entities.user import User
+from app.domain.interfaces.password_hasher import PasswordHasher
 from app.domain.interfaces.user_repository import UserRepository
 from app.entrypoints.api.schemas.user import UserCreate
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 class CreateUserUseCase:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        password_hasher: PasswordHasher,
+    ):
         self.user_repository = user_repository
+        self.password_hasher = password_hasher
 
     async def execute(self, user_create: UserCreate) -> User:
         """
@@ -33,7 +36,7 @@ class CreateUserUseCase:
         if existing_email:
             raise ValueError("Email already registered")
 
-        hashed_password = pwd_context.hash(user_create.password)
+        hashed_password = await self.password_hasher.hash(user_create.password)
 
         user_entity = User(
             id=None,
@@ -74,6 +77,19 @@ class GetUserByUsernameUseCase:
         return await self.repository.get_by_username(username)
 
 
+class DeactivateUserUseCase:
+    def __init__(self, repository: UserRepository):
+        self.repository = repository
+
+    async def execute(self, user_id: int) -> None:
+        """
+        Деактивировать пользователя по ID.
+
+        :param user_id: ID пользователя
+        """
+        await self.repository.deactivate(user_id)
+
+
 class DeleteUserUseCase:
     def __init__(self, repository: UserRepository):
         self.repository = repository
@@ -0,0 +1,101 @@
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    LRU-кэш с ограничением размера и временем жизни записей.
+
+    Не потокобезопасен: рассчитан на использование из одного event loop.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        :param maxsize: максимальное количество записей
+        :param ttl: время жизни записи в секундах
+        :param clock: источник монотонного времени
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """
+        Получить значение и пометить его как недавно использованное.
+
+        :param key: ключ
+        :return: значение или None, если записи нет или она устарела
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self._evicted(key, value)
+            self.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Сохранить значение, вытеснив самую давно использованную запись
+        при переполнении.
+
+        :param key: ключ
+        :param value: значение
+        """
+        self._data[key] = (self._clock() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            evicted_key, (_, evicted) = self._data.popitem(last=False)
+            self._evicted(evicted_key, evicted)
+
+    def pop(self, key: K) -> V | None:
+        """
+        Удалить запись.
+
+        :param key: ключ
+        :return: удалённое значение или None
+        """
+        entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else None
+
+    def items(self) -> list[tuple[K, V]]:
+        return [(key, value) for key, (_, value) in self._data.items()]
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def _evicted(self, key: K, value: V) -> None:
+        """
+        Вызывается, когда запись удаляется по ttl или вытесняется при
+        переполнении. Наследники поддерживают в нём свои индексы.
+        """
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -1,19 +1,183 @@
+import atexit
+import json
 import logging
+import queue
 import sys
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
+from app.common.metrics import REGISTRY
+from app.config import settings
+
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    "log_records_dropped_total",
+    "Log records discarded by reason (queue_full or sampled).",
+    labelnames=("reason",),
+)
+
+# Идентификатор текущего HTTP-запроса; выставляет RequestIdMiddleware.
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# extra для повторяющихся сообщений, которые можно прореживать:
+# logger.warning("Login failed: %s", detail, extra=SAMPLED).
+SAMPLED = {"sampled": True}
+
+_TEXT_FORMAT = "%(asctime)s | %(levelname)-8s | %(request_id)s - %(message)s"
+_TEXT_CALLER_FORMAT = (
+    "%(asctime)s | %(levelname)-8s | %(request_id)s | "
+    "%(module)s:%(funcName)s:%(lineno)d - %(message)s"
+)
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    Запись лога в одну строку JSON.
+    """
+
+    def __init__(self, caller: bool = False):
+        """
+        :param caller: добавлять модуль, функцию и строку вызова
+        """
+        super().__init__()
+        self._caller = caller
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if self._caller:
+            data.update(
+                module=record.module,
+                function=record.funcName,
+                line=record.lineno,
+            )
+        suppressed = getattr(record, "suppressed", 0)
+        if suppressed:
+            data["suppressed"] = suppressed
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class NoCallerLogger(logging.Logger):
+    """
+    Логгер без поиска вызывающего кадра стека.
+
+    Стандартный Logger на каждую запись обходит стек, чтобы заполнить
+    модуль, функцию и строку. Когда они не выводятся (LOG_CALLER=false),
+    поиск пропускается, и запись получает значения по умолчанию, как при
+    отключённом logging._srcfile, но только для логгеров приложения.
+    """
+
+    def findCaller(self, stack_info=False, stacklevel=1):
+        if stack_info:
+            return super().findCaller(stack_info, stacklevel + 1)
+        return "(unknown file)", 0, "(unknown function)", None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Прореживание повторяющихся сообщений, помеченных extra=SAMPLED.
+
+    Сообщения с одним шаблоном и уровнем пропускаются не чаще burst
+    раз за interval секунд; отброшенные считаются, и их число
+    добавляется к первой записи следующего интервала (suppressed).
+    Ключом служит шаблон, а не готовый текст, поэтому сообщения
+    с разными аргументами прореживаются вместе.
+    """
+
+    def __init__(
+        self, burst: int, interval: float, clock=time.monotonic
+    ) -> None:
+        """
+        :param burst: сколько сообщений пропускать за интервал
+        :param interval: длина интервала в секундах
+        :param clock: источник времени
+        """
+        super().__init__()
+        self._burst = burst
+        self._interval = interval
+        self._clock = clock
+        # шаблон и уровень -> начало интервала, пропущено, отброшено
+        self._windows: dict[tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "sampled", False):
+            return True
+        key = (record.msg, record.levelno)
+        now = self._clock()
+        window = self._windows.get(key)
+        if window is None or now - window[0] >= self._interval:
+            suppressed = window[2] if window is not None else 0
+            self._windows[key] = [now, 1, 0]
+            if suppressed:
+                record.suppressed = suppressed
+            return True
+        if window[1] < self._burst:
+            window[1] += 1
+            return True
+        window[2] += 1
+        LOG_RECORDS_DROPPED.labels("sampled").inc()
+        return False
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Передача записей фоновому потоку без форматирования и ожидания.
+
+    В потоке event loop запись только дополняется request_id и кладётся
+    в ограниченную очередь; сообщение, исключение и JSON форматируются
+    в потоке QueueListener. Если очередь заполнена, запись отбрасывается
+    и учитывается в метрике, а обработка запроса не блокируется.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        current_request_id = request_id.get()
+        if current_request_id is not None:
+            record.request_id = current_request_id
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels("queue_full").inc()
+
+
+def _make_formatter() -> logging.Formatter:
+    if settings.log_format == "json":
+        return JSONFormatter(caller=settings.log_caller)
+    return logging.Formatter(
+        _TEXT_CALLER_FORMAT if settings.log_caller else _TEXT_FORMAT,
+        datefmt="%Y-%m-%d %H:%M:%S",
+        defaults={"request_id": "-"},
+    )
+
 
 def get_logger(name: str = None, log_file: str = None) -> logging.Logger:
-    logger = logging.getLogger(name or __name__)
+    # Класс задаётся только на время создания логгера приложения, чтобы
+    # не менять логгеры библиотек.
+    logger_class = logging.getLoggerClass()
+    if not settings.log_caller:
+        logging.setLoggerClass(NoCallerLogger)
+    try:
+        logger = logging.getLogger(name or __name__)
+    finally:
+        logging.setLoggerClass(logger_class)
     logger.setLevel(logging.DEBUG)
 
     if logger.handlers:
         return logger
 
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)-8s | %(module)s:%(funcName)s:%(lineno)d - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
+    formatter = _make_formatter()
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
@@ -24,15 +188,32 @@ def get_logger(name: str = None, log_file: str = None) -> logging.Logger:
     error_handler.setLevel(logging.WARNING)
     error_handler.setFormatter(formatter)
 
-    logger.addHandler(console_handler)
-    logger.addHandler(error_handler)
+    handlers: list[logging.Handler] = [console_handler, error_handler]
 
     if log_file:
         Path(log_file).parent.mkdir(parents=True, exist_ok=True)
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    queue_handler = NonBlockingQueueHandler(
+        queue.Queue(settings.log_queue_size)
+    )
+    queue_handler.addFilter(
+        SamplingFilter(
+            burst=settings.log_sample_burst,
+            interval=settings.log_sample_interval_seconds,
+        )
+    )
+    logger.addHandler(queue_handler)
+
+    listener = QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    # Дописать оставшиеся в очереди записи при завершении процесса.
+    atexit.register(listener.stop)
 
     return logger
 
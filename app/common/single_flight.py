@@ -0,0 +1,61 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Объединение одновременных вызовов с одинаковым ключом.
+
+    Пока выполняется первый вызов для ключа, остальные ждут его
+    результат вместо повторного обращения к источнику. Рассчитан на
+    один event loop.
+    """
+
+    def __init__(self):
+        self._calls: dict[K, asyncio.Future] = {}
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._calls
+
+    async def do(self, key: K, func: Callable[[], Awaitable[V]]) -> V:
+        """
+        Выполнить func или дождаться уже идущего вызова с тем же ключом.
+
+        Если первый вызов отменён, ожидающие выполняют func сами.
+
+        :param key: ключ объединения
+        :param func: корутинная функция, загружающая значение
+        :return: результат func
+        """
+        future = self._calls.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+            return await func()
+
+        future = asyncio.get_running_loop().create_future()
+        # Исключение без ожидающих не должно попадать в лог asyncio.
+        future.add_done_callback(
+            lambda done: done.cancelled() or done.exception()
+        )
+        self._calls[key] = future
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
@@ -8,6 +8,73 @@ class Settings(BaseSettings):
     db_host: str
     db_port: int
 
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = -1
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    db_statement_timeout_ms: int = 0
+    db_warm_up_connections: int = 5
+    db_warm_up_timeout_seconds: float = 10.0
+    db_warm_up_max_attempts: int = 10
+
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 64
+    password_hash_use_processes: bool = False
+
+    principal_cache_ttl_seconds: float = 30.0
+    principal_cache_max_size: int = 10_000
+    token_cache_ttl_seconds: float = 300.0
+    token_cache_max_size: int = 10_000
+    auth_embed_principal_claims: bool = False
+
+    log_format: str = "json"
+    log_caller: bool = False
+    log_queue_size: int = 10_000
+    log_sample_burst: int = 10
+    log_sample_interval_seconds: float = 10.0
+
+    task_page_default_limit: int = 100
+    task_page_max_limit: int = 1000
+    task_export_chunk_size: int = 1000
+    task_batch_max_size: int = 1000
+    task_search_fuzzy: bool = False
+    task_fast_serialization: bool = False
+    task_stats_summary: bool = False
+
+    task_cache_enabled: bool = False
+    task_cache_backend: str = "memory"
+    task_cache_ttl_seconds: float = 30.0
+    task_cache_max_size: int = 10_000
+    redis_url: str = "redis://localhost:6379/0"
+
+    task_events_backend: str = "memory"
+    task_events_channel: str = "task_events"
+    task_events_queue_size: int = 100
+    task_events_heartbeat_seconds: float = 15.0
+
+    task_reminders_enabled: bool = False
+    task_reminder_lead_seconds: float = 86400.0
+    task_reminder_window_seconds: float = 300.0
+    task_reminder_batch_size: int = 1000
+
+    task_changes_retention_days: float = 30.0
+    task_changes_prune_interval_seconds: float = 3600.0
+    task_changes_prune_batch_size: int = 10000
+
+    outbox_enabled: bool = False
+    outbox_webhook_url: str = ""
+    outbox_webhook_timeout_seconds: float = 10.0
+    outbox_concurrency: int = 4
+    outbox_batch_size: int = 100
+    outbox_queue_size: int = 200
+    outbox_poll_interval_seconds: float = 1.0
+    outbox_lease_seconds: float = 60.0
+    outbox_max_attempts: int = 10
+    outbox_backoff_base_seconds: float = 1.0
+    outbox_backoff_max_seconds: float = 300.0
+
     @property
     def DATABASE_URL(self) -> str:
         return (
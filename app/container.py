@@ -1,6 +1,25 @@
 from dependency_injector import containers, providers
 
+from app.common.single_flight import SingleFlight
 from app.infrastructure.db.base import Database
+from app.infrastructure.principal_cache import PrincipalCache
+from app.infrastructure.security import (
+    AccessTokenVerifier,
+    init_password_hasher,
+)
+from app.infrastructure.task_cache import (
+    InMemoryTaskCache,
+    RedisTaskCache,
+    create_redis_client,
+)
+from app.infrastructure.task_events import (
+    InProcessTaskEventBackend,
+    PostgresTaskEventBackend,
+    TaskEventHub,
+)
+from app.infrastructure.task_reminders import TaskReminderScheduler
+from app.infrastructure.task_change_retention import TaskChangePruner
+from app.infrastructure.outbox import OutboxWorkerPool, WebhookOutboxHandler
 from app.config import settings
 from app.infrastructure.repositories.user_repository import (
     SQLAlchemyUserRepository,
@@ -10,40 +29,176 @@ from app.application.use_cases.user import CreateUserUseCase
 from app.infrastructure.repositories.task_repository import (
     SQLAlchemyTaskRepository,
 )
+from app.infrastructure.repositories.cached_task_repository import (
+    CachedTaskRepository,
+)
+from app.infrastructure.repositories.task_reminder_repository import (
+    SQLAlchemyTaskReminderRepository,
+)
+from app.infrastructure.repositories.outbox_repository import (
+    SQLAlchemyOutboxRepository,
+)
 from app.application.services.task_service import TaskService
 
 
 class Container(containers.DeclarativeContainer):
+    """
+    Зависимости приложения.
 
-    wiring_config = containers.WiringConfiguration(
-        packages=["app.entrypoints.api.routes"]
-    )
+    Репозитории, сценарии и сервисы не хранят состояния запроса и
+    создаются один раз (Singleton); на запрос приходятся только сеанс
+    и единица работы, которые репозитории получают через
+    session_contextmanager в момент обращения к базе.
+    """
 
-    db = providers.Singleton(Database, db_url=settings.DATABASE_URL)
+    db = providers.Singleton(
+        Database,
+        db_url=settings.DATABASE_URL,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        statement_cache_size=settings.db_statement_cache_size,
+        statement_timeout_ms=settings.db_statement_timeout_ms,
+    )
 
     session_contextmanager = providers.Factory(db.provided.session)
 
-    user_repository = providers.Factory(
+    password_hasher = providers.Resource(
+        init_password_hasher,
+        max_workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+        use_processes=settings.password_hash_use_processes,
+    )
+
+    principal_cache = providers.Singleton(
+        PrincipalCache,
+        maxsize=settings.principal_cache_max_size,
+        ttl=settings.principal_cache_ttl_seconds,
+    )
+
+    token_verifier = providers.Singleton(
+        AccessTokenVerifier,
+        maxsize=settings.token_cache_max_size,
+        ttl=settings.token_cache_ttl_seconds,
+    )
+
+    user_repository = providers.Singleton(
         SQLAlchemyUserRepository,
         session_contextmanager=session_contextmanager,
+        principal_cache=principal_cache,
+        outbox=settings.outbox_enabled,
     )
 
-    user_service = providers.Factory(
+    user_service = providers.Singleton(
         UserService,
         user_repository=user_repository,
+        password_hasher=password_hasher,
     )
 
-    create_user_use_case = providers.Factory(
+    create_user_use_case = providers.Singleton(
         CreateUserUseCase,
         user_repository=user_repository,
+        password_hasher=password_hasher,
     )
 
-    task_repository = providers.Factory(
+    task_cache = providers.Selector(
+        providers.Object(settings.task_cache_backend),
+        memory=providers.Singleton(
+            InMemoryTaskCache,
+            maxsize=settings.task_cache_max_size,
+            ttl=settings.task_cache_ttl_seconds,
+        ),
+        redis=providers.Singleton(
+            RedisTaskCache,
+            client=providers.Singleton(
+                create_redis_client, url=settings.redis_url
+            ),
+            ttl=settings.task_cache_ttl_seconds,
+        ),
+    )
+
+    task_single_flight = providers.Singleton(SingleFlight)
+
+    sql_task_repository = providers.Singleton(
         SQLAlchemyTaskRepository,
         session_contextmanager=session_contextmanager,
+        search_fuzzy=settings.task_search_fuzzy,
+        stats_summary=settings.task_stats_summary,
+        outbox=settings.outbox_enabled,
+    )
+
+    task_repository = providers.Selector(
+        providers.Object(
+            "cached" if settings.task_cache_enabled else "direct"
+        ),
+        direct=sql_task_repository,
+        cached=providers.Singleton(
+            CachedTaskRepository,
+            repository=sql_task_repository,
+            cache=task_cache,
+            single_flight=task_single_flight,
+        ),
+    )
+
+    task_event_hub = providers.Singleton(
+        TaskEventHub,
+        backend=providers.Selector(
+            providers.Object(settings.task_events_backend),
+            memory=providers.Singleton(InProcessTaskEventBackend),
+            postgres=providers.Singleton(
+                PostgresTaskEventBackend,
+                dsn=settings.DATABASE_URL,
+                channel=settings.task_events_channel,
+            ),
+        ),
+        queue_size=settings.task_events_queue_size,
+    )
+
+    task_reminder_scheduler = providers.Singleton(
+        TaskReminderScheduler,
+        repository=providers.Singleton(
+            SQLAlchemyTaskReminderRepository,
+            session_contextmanager=session_contextmanager,
+        ),
+        publisher=task_event_hub,
+        lead_seconds=settings.task_reminder_lead_seconds,
+        window_seconds=settings.task_reminder_window_seconds,
+        batch_size=settings.task_reminder_batch_size,
+    )
+
+    task_change_pruner = providers.Singleton(
+        TaskChangePruner,
+        repository=sql_task_repository,
+        retention_seconds=settings.task_changes_retention_days * 86400,
+        interval_seconds=settings.task_changes_prune_interval_seconds,
+        batch_size=settings.task_changes_prune_batch_size,
+    )
+
+    outbox_worker_pool = providers.Singleton(
+        OutboxWorkerPool,
+        repository=providers.Singleton(
+            SQLAlchemyOutboxRepository,
+            session_contextmanager=session_contextmanager,
+        ),
+        handler=providers.Singleton(
+            WebhookOutboxHandler,
+            url=settings.outbox_webhook_url,
+            timeout=settings.outbox_webhook_timeout_seconds,
+        ),
+        concurrency=settings.outbox_concurrency,
+        batch_size=settings.outbox_batch_size,
+        queue_size=settings.outbox_queue_size,
+        poll_interval=settings.outbox_poll_interval_seconds,
+        lease_seconds=settings.outbox_lease_seconds,
+        max_attempts=settings.outbox_max_attempts,
+        backoff_base=settings.outbox_backoff_base_seconds,
+        backoff_max=settings.outbox_backoff_max_seconds,
     )
 
-    task_service = providers.Factory(
+    task_service = providers.Singleton(
         TaskService,
         task_repository=task_repository,
+        task_events=task_event_hub,
     )
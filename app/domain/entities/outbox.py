@@ -0,0 +1,29 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+
+class OutboxTopic(str, Enum):
+    TASK_CREATED = "task.created"
+    TASK_UPDATED = "task.updated"
+    TASK_DELETED = "task.deleted"
+    USER_CREATED = "user.created"
+    USER_DEACTIVATED = "user.deactivated"
+    USER_DELETED = "user.deleted"
+
+
+@dataclass(slots=True)
+class OutboxMessage:
+    """
+    Побочный эффект изменения, записанный в той же транзакции.
+
+    attempts включает текущую попытку: сообщение получает его уже
+    увеличенным при занятии.
+    """
+
+    id: int
+    topic: str
+    payload: dict[str, Any] = field(default_factory=dict)
+    attempts: int = 1
+    created_at: datetime | None = None
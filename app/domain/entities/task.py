@@ -1,12 +1,257 @@
-from dataclasses import dataclass
+import base64
+import binascii
+import json
+import re
+from dataclasses import dataclass, field
 from datetime import date
+from enum import Enum
+from typing import TypedDict
+
 from app.domain.entities.common import EntityId
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
+    """
+    Задача пользователя.
+
+    Задачи создаются на каждую строку выборки, поэтому объявлены со
+    __slots__: экземпляр меньше и быстрее создаётся, чем с __dict__.
+    """
+
     id: EntityId
     title: str
     due_date: date
     user_id: int
     description: str | None = None
+    version: int = 1
+
+
+class TaskRecord(TypedDict):
+    """
+    Поля задачи для выгрузки и JSON-ответов (как TaskRead, без версии).
+
+    Выгрузка собирает записи прямо из строк выборки, без Task.
+    """
+
+    id: int
+    title: str
+    description: str | None
+    due_date: date
+    user_id: int
+
+
+def task_record(task: Task) -> TaskRecord:
+    """
+    :param task: задача
+    :return: запись с полями задачи для выгрузки
+    """
+    return {
+        "id": task.id,
+        "title": task.title,
+        "description": task.description,
+        "due_date": task.due_date,
+        "user_id": task.user_id,
+    }
+
+
+class TaskEventType(str, Enum):
+    CREATED = "created"
+    UPDATED = "updated"
+    DELETED = "deleted"
+    REMINDER = "reminder"
+
+
+@dataclass
+class TaskEvent:
+    """
+    Уведомление об изменении задачи для подписчиков её владельца.
+
+    task - состояние после изменения; None для удаления и напоминания,
+    а также когда задача не поместилась в сообщение бэкенда и её нужно
+    запросить по id.
+    """
+
+    type: TaskEventType
+    task_id: int
+    user_id: int
+    task: Task | None = None
+
+
+@dataclass(slots=True)
+class TaskReminder:
+    """
+    Напоминание о приближении срока задачи.
+
+    Одна задача получает одно напоминание на каждый свой срок: после
+    переноса due_date напоминание придёт снова.
+    """
+
+    task_id: int
+    user_id: int
+    due_date: date
+
+
+class TaskVersionConflict(Exception):
+    """
+    Задача изменена с момента, когда клиент получил её версию.
+    """
+
+
+class TaskChangesExpired(Exception):
+    """
+    Курсор синхронизации старше хранимого журнала изменений: удаления
+    после него уже очищены, и клиенту нужна полная синхронизация.
+    """
+
+
+class TaskOrdering(str, Enum):
+    ID = "id"
+    DUE_DATE = "due_date"
+
+
+@dataclass
+class TaskFilter:
+    user_id: int | None = None
+    due_from: date | None = None
+    due_to: date | None = None
+    title_prefix: str | None = None
+
+
+@dataclass
+class TaskCursor:
+    """
+    Позиция в упорядоченной выборке задач (keyset-пагинация).
+
+    Для сортировки по id достаточно id последней задачи страницы,
+    для сортировки по сроку нужна пара (due_date, id), для результатов
+    поиска - пара (rank, id).
+    """
+
+    id: int
+    due_date: date | None = None
+    rank: float | None = None
+
+    def encode(self) -> str:
+        payload = {"id": self.id}
+        if self.due_date is not None:
+            payload["due_date"] = self.due_date.isoformat()
+        if self.rank is not None:
+            payload["rank"] = self.rank
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "TaskCursor":
+        """
+        :raises ValueError: если курсор повреждён
+        """
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            payload = json.loads(raw)
+            due_date = payload.get("due_date")
+            rank = payload.get("rank")
+            return cls(
+                id=int(payload["id"]),
+                due_date=date.fromisoformat(due_date) if due_date else None,
+                rank=float(rank) if rank is not None else None,
+            )
+        except (
+            AttributeError,
+            binascii.Error,
+            KeyError,
+            TypeError,
+            ValueError,
+        ) as e:
+            raise ValueError("Invalid cursor") from e
+
+
+_SEARCH_TERM = re.compile(r"\w+")
+
+
+def search_terms(query: str) -> list[str]:
+    """
+    Разбить поисковую строку на термы так же, как это делает
+    конфигурация полнотекстового поиска simple: слова в нижнем регистре.
+
+    :param query: строка поиска
+    :return: термы без повторов в порядке появления
+    """
+    return list(dict.fromkeys(_SEARCH_TERM.findall(query.lower())))
+
+
+@dataclass
+class TaskPage:
+    items: list[Task] = field(default_factory=list)
+    next_cursor: TaskCursor | None = None
+
+
+@dataclass
+class TaskBatchError:
+    index: int
+    detail: str
+    task_id: int | None = None
+
+
+@dataclass
+class TaskUpdateResult:
+    """
+    Обновлённая задача и её владелец до обновления.
+
+    previous_user_id отличается от task.user_id, если задача перешла
+    к другому пользователю.
+    """
+
+    task: Task
+    previous_user_id: int
+
+
+@dataclass
+class TaskBatchResult:
+    tasks: list[Task] = field(default_factory=list)
+    errors: list[TaskBatchError] = field(default_factory=list)
+
+
+@dataclass
+class TaskBatchDeleteResult:
+    deleted_ids: list[int] = field(default_factory=list)
+    errors: list[TaskBatchError] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class TaskChange:
+    """
+    Изменение задачи после курсора синхронизации.
+
+    task равен None, если задача удалена (tombstone).
+    """
+
+    seq: int
+    task_id: int
+    task: Task | None = None
+
+    @property
+    def deleted(self) -> bool:
+        return self.task is None
+
+
+@dataclass
+class TaskChangePage:
+    changes: list[TaskChange]
+    cursor: int
+    has_more: bool = False
+
+
+@dataclass
+class TaskStats:
+    """
+    Количество задач пользователя по сроку относительно текущей даты.
+    """
+
+    overdue: int = 0
+    due_today: int = 0
+    upcoming: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.overdue + self.due_today + self.upcoming
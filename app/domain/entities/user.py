@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from app.domain.entities.common import EntityId
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     id: EntityId
     username: str
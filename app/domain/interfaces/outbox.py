@@ -0,0 +1,74 @@
+from abc import ABC, abstractmethod
+
+from app.domain.entities.outbox import OutboxMessage
+
+
+class OutboxRepository(ABC):
+    @abstractmethod
+    async def claim(
+        self, limit: int, lease_seconds: float
+    ) -> list[OutboxMessage]:
+        """
+        Занять готовые к обработке сообщения на время аренды.
+
+        Пока аренда не истекла, сообщения не выдаются другим
+        обработчикам; незавершённое сообщение после её истечения
+        выдаётся снова.
+
+        :param limit: максимальное количество сообщений
+        :param lease_seconds: длительность аренды в секундах
+        :return: занятые сообщения с увеличенным attempts
+        """
+        pass
+
+    @abstractmethod
+    async def complete(self, message: OutboxMessage) -> None:
+        """
+        Удалить обработанное сообщение.
+
+        :param message: сообщение из claim
+        """
+        pass
+
+    @abstractmethod
+    async def retry(
+        self, message: OutboxMessage, delay_seconds: float, error: str
+    ) -> None:
+        """
+        Вернуть сообщение в очередь после неудачной попытки.
+
+        :param message: сообщение из claim
+        :param delay_seconds: через сколько секунд повторить
+        :param error: описание ошибки
+        """
+        pass
+
+    @abstractmethod
+    async def dead_letter(self, message: OutboxMessage, error: str) -> None:
+        """
+        Исключить сообщение из обработки после последней попытки.
+
+        :param message: сообщение из claim
+        :param error: описание ошибки
+        """
+        pass
+
+
+class OutboxHandler(ABC):
+    @abstractmethod
+    async def handle(self, message: OutboxMessage) -> None:
+        """
+        Выполнить побочный эффект сообщения.
+
+        Доставка не менее чем однократная: одно сообщение может прийти
+        повторно, id сообщения служит ключом идемпотентности.
+
+        :param message: сообщение
+        :raises Exception: если попытку нужно повторить
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Освободить ресурсы обработчика.
+        """
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+
+
+class PasswordHasher(ABC):
+    @abstractmethod
+    async def hash(self, password: str) -> str:
+        """
+        Захешировать пароль.
+
+        :param password: пароль в открытом виде
+        :return: хеш пароля
+        """
+        pass
+
+    @abstractmethod
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Проверить пароль по хешу.
+
+        :param plain_password: пароль в открытом виде
+        :param hashed_password: сохранённый хеш
+        :return: True, если пароль совпадает
+        """
+        pass
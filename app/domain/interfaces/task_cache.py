@@ -0,0 +1,33 @@
+from abc import ABC, abstractmethod
+
+from app.domain.entities.task import Task
+
+
+class TaskCache(ABC):
+    @abstractmethod
+    async def get(self, task_id: int) -> Task | None:
+        """
+        Получить задачу из кэша.
+
+        :param task_id: идентификатор задачи
+        :return: задача или None при промахе
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, task: Task) -> None:
+        """
+        Сохранить задачу в кэше.
+
+        :param task: задача
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, task_ids: list[int]) -> None:
+        """
+        Удалить задачи из кэша.
+
+        :param task_ids: идентификаторы задач
+        """
+        pass
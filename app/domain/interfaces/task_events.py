@@ -0,0 +1,17 @@
+from abc import ABC, abstractmethod
+
+from app.domain.entities.task import TaskEvent
+
+
+class TaskEventPublisher(ABC):
+    @abstractmethod
+    async def publish(self, event: TaskEvent) -> None:
+        """
+        Опубликовать событие изменения задачи.
+
+        Внутри транзакции событие должно уйти подписчикам только после
+        её фиксации.
+
+        :param event: событие
+        """
+        pass
@@ -0,0 +1,41 @@
+from abc import ABC, abstractmethod
+from datetime import date
+
+from app.domain.entities.task import TaskReminder
+
+
+class TaskReminderRepository(ABC):
+    @abstractmethod
+    async def get_pending(
+        self,
+        due_from: date,
+        due_to: date,
+        limit: int,
+        after: TaskReminder | None = None,
+    ) -> list[TaskReminder]:
+        """
+        Получить ещё не отправленные напоминания для задач со сроком
+        в диапазоне, упорядоченные по (due_date, task_id).
+
+        :param due_from: начало диапазона сроков включительно
+        :param due_to: конец диапазона сроков включительно
+        :param limit: максимальное количество напоминаний
+        :param after: последнее напоминание предыдущей страницы
+        :return: напоминания
+        """
+        pass
+
+    @abstractmethod
+    async def claim(self, reminders: list[TaskReminder]) -> list[TaskReminder]:
+        """
+        Отметить напоминания отправленными и вернуть те, что удалось
+        занять.
+
+        Напоминание занимается ровно один раз среди всех процессов.
+        Не возвращаются напоминания, уже занятые другими, а также
+        напоминания удалённых задач и задач с изменившимся сроком.
+
+        :param reminders: напоминания, время которых наступило
+        :return: занятые этим вызовом напоминания
+        """
+        pass
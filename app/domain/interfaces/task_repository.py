@@ -1,5 +1,17 @@
 from abc import ABC, abstractmethod
-from app.domain.entities.task import Task
+from datetime import date, datetime
+from typing import AsyncIterator
+from app.domain.entities.task import (
+    Task,
+    TaskChangePage,
+    TaskCursor,
+    TaskFilter,
+    TaskOrdering,
+    TaskPage,
+    TaskRecord,
+    TaskStats,
+    TaskUpdateResult,
+)
 
 
 class TaskRepository(ABC):
@@ -14,6 +26,16 @@ class TaskRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def create_many(self, tasks: list[Task]) -> list[Task]:
+        """
+        Создать несколько задач одной транзакцией.
+
+        :param tasks: задачи для создания
+        :return: созданные задачи в порядке входного списка
+        """
+        pass
+
     @abstractmethod
     async def get_by_id(self, task_id: int) -> Task | None:
         """
@@ -33,6 +55,66 @@ class TaskRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def get_page(
+        self,
+        filters: TaskFilter,
+        limit: int,
+        cursor: TaskCursor | None = None,
+        ordering: TaskOrdering = TaskOrdering.ID,
+    ) -> TaskPage:
+        """
+        Получить страницу задач (keyset-пагинация).
+
+        :param filters: фильтры по пользователю, сроку и префиксу заголовка
+        :param limit: максимальное количество задач на странице
+        :param cursor: позиция, после которой начинается страница
+        :param ordering: порядок сортировки: по id или по (due_date, id)
+        :return: страница задач и курсор следующей страницы
+        """
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        cursor: TaskCursor | None = None,
+    ) -> TaskPage:
+        """
+        Найти задачи пользователя по словам из заголовка и описания.
+
+        Каждое слово запроса ищется как префикс слова задачи, задача
+        должна содержать все слова. Результаты упорядочены по
+        релевантности (совпадение в заголовке весит больше), затем по id.
+
+        :param user_id: ID пользователя
+        :param query: строка поиска
+        :param limit: максимальное количество задач на странице
+        :param cursor: позиция (rank, id), после которой начинается страница
+        :return: страница задач и курсор следующей страницы
+        :raises ValueError: если курсор получен не из поиска
+        """
+        pass
+
+    @abstractmethod
+    def stream(
+        self, filters: TaskFilter, chunk_size: int
+    ) -> AsyncIterator[list[TaskRecord]]:
+        """
+        Потоково выгрузить задачи порциями, упорядоченными по id.
+
+        Реализация не должна держать в памяти больше одной порции.
+        Задачи выдаются записями (TaskRecord), а не Task: выгрузка
+        только сериализует их.
+
+        :param filters: фильтры по пользователю, сроку и префиксу заголовка
+        :param chunk_size: количество задач в одной порции
+        :return: асинхронный итератор порций записей задач
+        """
+        pass
+
     @abstractmethod
     async def get_all_by_user_id(self, user_id: int) -> list[Task]:
         """
@@ -44,21 +126,121 @@ class TaskRepository(ABC):
         pass
 
     @abstractmethod
-    async def update(self, task: Task) -> Task:
+    async def get_changes(
+        self, user_id: int, since: int, limit: int
+    ) -> TaskChangePage:
         """
-        Обновить задачу.
+        Получить изменения задач пользователя после курсора.
+
+        Каждая задача попадает в страницу один раз, с последним
+        изменением; удалённые задачи и задачи, переданные другому
+        пользователю, возвращаются как tombstone.
+
+        :param user_id: идентификатор пользователя
+        :param since: курсор (seq последнего полученного изменения)
+        :param limit: максимальное количество изменений
+        :return: изменения, новый курсор и признак наличия продолжения
+        :raises TaskChangesExpired: если после курсора очищены удаления
+        """
+        pass
+
+    @abstractmethod
+    async def prune_changes(self, before: datetime, limit: int) -> int:
+        """
+        Очистить журнал изменений от записей старше before, которые не
+        нужны для синхронизации с since=0: вытесненных более поздним
+        изменением той же задачи и удалений.
+
+        Курсоры пользователя, получившие не все очищенные удаления,
+        после этого считаются устаревшими (TaskChangesExpired).
+
+        :param before: граница времени изменения
+        :param limit: максимальное количество удаляемых записей
+        :return: количество удалённых записей
+        """
+        pass
+
+    @abstractmethod
+    async def get_version(self, task_id: int) -> int | None:
+        """
+        Получить версию задачи без чтения остальных полей.
+
+        :param task_id: идентификатор задачи
+        :return: версия или None, если задачи нет
+        """
+        pass
+
+    @abstractmethod
+    async def get_user_tasks_version(self, user_id: int) -> int:
+        """
+        Получить версию набора задач пользователя: seq последнего
+        изменения в его журнале, включая tombstone при переносе задачи.
+
+        :param user_id: идентификатор пользователя
+        :return: версия набора (0, если изменений не было)
+        """
+        pass
+
+    @abstractmethod
+    async def get_stats(self, user_id: int, today: date) -> TaskStats:
+        """
+        Посчитать задачи пользователя: просроченные, на сегодня и
+        предстоящие.
+
+        :param user_id: идентификатор пользователя
+        :param today: текущая дата пользователя
+        :return: количество задач по срокам
+        """
+        pass
+
+    @abstractmethod
+    async def update(
+        self, task: Task, expected_version: int | None = None
+    ) -> TaskUpdateResult:
+        """
+        Обновить задачу и увеличить её версию.
 
         :param task: объект задачи с обновленными данными
-        :return: обновленная задача
-        :raises ValueError: если задача не найдена
+        :param expected_version: обновить, только если версия совпадает
+        :return: обновленная задача и её прежний владелец
+        :raises NoResultFound: если задача не найдена
+        :raises TaskVersionConflict: если версия задачи не совпала
+        """
+        pass
+
+    @abstractmethod
+    async def update_many(self, tasks: list[Task]) -> list[Task]:
+        """
+        Обновить несколько задач одной транзакцией.
+
+        Обновляются только задачи, принадлежащие task.user_id;
+        чужие и несуществующие задачи пропускаются.
+
+        :param tasks: задачи с обновленными данными
+        :return: обновленные задачи
         """
         pass
 
     @abstractmethod
-    async def delete(self, task_id: int) -> None:
+    async def delete(self, task_id: int) -> Task:
         """
         Удалить задачу по её идентификатору.
 
         :param task_id: идентификатор задачи
+        :return: удалённая задача
+        :raises NoResultFound: если задача не найдена
+        """
+        pass
+
+    @abstractmethod
+    async def delete_many(
+        self, task_ids: list[int], user_id: int
+    ) -> list[int]:
+        """
+        Удалить несколько задач пользователя одной транзакцией.
+
+        :param task_ids: идентификаторы задач
+        :param user_id: идентификатор владельца задач
+        :return: идентификаторы удалённых задач
         """
         pass
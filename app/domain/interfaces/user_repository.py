@@ -45,6 +45,15 @@ class UserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    async def deactivate(self, user_id: int) -> None:
+        """
+        Деактивировать пользователя.
+
+        :param user_id: идентификатор пользователя
+        """
+        pass
+
     @abstractmethod
     async def delete(self, user_id: int) -> None:
         """
@@ -1,51 +1,111 @@
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
-from dependency_injector.wiring import inject, Provide
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
-from app.container import Container
-from app.infrastructure.security import decode_access_token
+from app.application.services.task_service import TaskService
+from app.common.metrics import REGISTRY
+from app.domain.interfaces.password_hasher import PasswordHasher
+from app.infrastructure.security import AccessTokenVerifier
+from app.infrastructure.principal_cache import PrincipalCache
 from app.domain.entities.user import User
 from app.application.services.user_service import UserService
 from app.common.logs import logger
-from app.entrypoints.api.schemas.user import UserRead
+from app.entrypoints.api.schemas.user import Principal
+from app.infrastructure.task_events import TaskEventHub
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
+PRINCIPAL_LOOKUPS = REGISTRY.counter(
+    "auth_principal_lookups_total",
+    "Authenticated user lookups by source (token, cache or database).",
+    labelnames=("source",),
+)
 
-@inject
-async def get_async_session(
-    session: AsyncSession = Depends(Provide[Container.session_contextmanager]),
-) -> AsyncSession:
-    async with session() as s:
-        yield s
 
+# Все зависимости берутся из контейнера приложения (app.container).
+# Провайдеры сервисов - Singleton, поэтому на запрос это поиск готового
+# объекта, а не сборка репозитория, сервиса и сценариев заново.
 
-def get_user_service(request: Request):
+
+async def get_async_session(request: Request) -> AsyncSession:
+    async with request.app.container.db().session() as session:
+        yield session
+
+
+def get_user_service(request: Request) -> UserService:
     return request.app.container.user_service()
 
 
+def get_password_hasher(request: Request) -> PasswordHasher:
+    return request.app.container.password_hasher()
+
+
+def get_principal_cache(request: Request) -> PrincipalCache:
+    return request.app.container.principal_cache()
+
+
+def get_token_verifier(request: Request) -> AccessTokenVerifier:
+    return request.app.container.token_verifier()
+
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     user_service: UserService = Depends(get_user_service),
-) -> UserRead:
-    payload = decode_access_token(token)
+    principal_cache: PrincipalCache = Depends(get_principal_cache),
+    token_verifier: AccessTokenVerifier = Depends(get_token_verifier),
+) -> Principal:
+    """
+    Единственная зависимость аутентификации для защищённых роутов.
+
+    Если токен содержит uid и active (AUTH_EMBED_PRINCIPAL_CLAIMS),
+    пользователь берётся из claims без обращения к кэшу и базе. Иначе
+    он ищется по sub сначала в PrincipalCache, затем в базе.
+    """
+    payload = token_verifier.verify(token)
     if payload is None:
         raise HTTPException(status_code=401, detail="Invalid token")
     username = payload.get("sub")
     if not username:
         raise HTTPException(status_code=401, detail="Invalid token payload")
+    if "uid" in payload and "active" in payload:
+        PRINCIPAL_LOOKUPS.labels("token").inc()
+        principal = Principal(
+            id=payload["uid"], username=username, is_active=payload["active"]
+        )
+    else:
+        principal = await _load_principal(
+            username, user_service, principal_cache
+        )
+    if not principal.is_active:
+        raise HTTPException(status_code=403, detail="Inactive user")
+    return principal
+
+
+async def _load_principal(
+    username: str, user_service: UserService, principal_cache: PrincipalCache
+) -> Principal:
+    principal = principal_cache.get(username)
+    if principal is not None:
+        PRINCIPAL_LOOKUPS.labels("cache").inc()
+        return principal
+    PRINCIPAL_LOOKUPS.labels("database").inc()
     user = await user_service.get_user_by_username(username)
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
-    return UserRead.model_validate(user)
+    principal = Principal.model_validate(user)
+    principal_cache.set(username, principal)
+    return principal
 
 
-def get_task_service(request: Request):
+def get_task_service(request: Request) -> TaskService:
     return request.app.container.task_service()
 
 
+def get_task_event_hub(request: Request) -> TaskEventHub:
+    return request.app.container.task_event_hub()
+
+
 def make_naive(dt: datetime) -> datetime:
     if dt.tzinfo is not None:
         return dt.replace(tzinfo=None)
@@ -0,0 +1,147 @@
+import re
+import time
+import uuid
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.common.logs import request_id
+from app.common.metrics import REGISTRY
+from app.infrastructure.db.unit_of_work import UnitOfWork
+
+UNMATCHED_ROUTE = "<unmatched>"
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_VALID_REQUEST_ID = re.compile(r"[A-Za-z0-9._:-]{1,128}")
+
+REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template.",
+    labelnames=("method", "route", "status"),
+)
+REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being processed by route template.",
+    labelnames=("method", "route"),
+)
+
+
+class RequestIdMiddleware:
+    """
+    Присваивает запросу идентификатор для сквозного поиска по логам.
+
+    Идентификатор берётся из заголовка X-Request-ID, если клиент или
+    прокси его передали и он допустимого вида, иначе генерируется.
+    На время запроса он доступен логгеру через contextvar и
+    возвращается клиенту в том же заголовке.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        if incoming is not None and _VALID_REQUEST_ID.fullmatch(incoming):
+            current = incoming
+        else:
+            current = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = current
+            await send(message)
+
+        token = request_id.set(current)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
+
+
+class UnitOfWorkMiddleware:
+    """
+    Открывает UnitOfWork на каждый HTTP-запрос.
+
+    Транзакция фиксируется один раз, непосредственно перед отправкой
+    заголовков ответа: при статусе < 400 - commit, иначе rollback.
+    Так клиент не получает успешный ответ раньше, чем данные
+    зафиксированы. Тело потокового ответа отправляется уже после
+    фиксации: если ему нужна база (выгрузка задач), оно читает через
+    отдельный сеанс Database.session(detached=True) со своей
+    транзакцией, а не через сеанс единицы работы.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with UnitOfWork() as unit_of_work:
+
+            async def send_with_commit(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    if message["status"] < 400:
+                        await unit_of_work.commit()
+                    else:
+                        await unit_of_work.rollback()
+                await send(message)
+
+            await self.app(scope, receive, send_with_commit)
+
+
+class MetricsMiddleware:
+    """
+    Гистограмма задержки и счётчик запросов в обработке по шаблону роута.
+
+    Метки строятся по шаблону пути (/tasks/{task_id}), а не по самому
+    пути, чтобы количество временных рядов не зависело от идентификаторов
+    в URL. Время включает фиксацию транзакции и отправку тела ответа.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = _route_template(scope)
+        in_flight = REQUESTS_IN_FLIGHT.labels(method, route)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            REQUEST_DURATION.labels(method, route, str(status_code)).observe(
+                time.perf_counter() - started
+            )
+
+
+def _route_template(scope: Scope) -> str:
+    partial = None
+    for route in getattr(scope.get("app"), "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
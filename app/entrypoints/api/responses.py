@@ -0,0 +1,82 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.domain.entities.task import Task, TaskRecord, task_record
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Поля TaskRecord совпадают с TaskRead: быстрая сериализация должна
+# давать тот же JSON.
+_TASK_ADAPTER = TypeAdapter(TaskRecord)
+_TASK_LIST_ADAPTER = TypeAdapter(list[TaskRecord])
+
+
+def encode_task(task: Task) -> bytes:
+    """
+    Сериализовать задачу в JSON так же, как TaskRead, но без
+    промежуточной модели и повторной валидации.
+
+    :param task: задача
+    :return: JSON в UTF-8
+    """
+    if orjson is not None:
+        return orjson.dumps(task_record(task))
+    return _TASK_ADAPTER.dump_json(task_record(task))
+
+
+def encode_tasks(tasks: list[Task]) -> bytes:
+    """
+    Сериализовать список задач в JSON-массив, как list[TaskRead].
+
+    :param tasks: задачи
+    :return: JSON в UTF-8
+    """
+    return encode_records([task_record(task) for task in tasks])
+
+
+def encode_records(records: list[TaskRecord]) -> bytes:
+    """
+    Сериализовать записи задач в JSON-массив, как list[TaskRead].
+
+    :param records: записи задач
+    :return: JSON в UTF-8
+    """
+    if orjson is not None:
+        return orjson.dumps(records)
+    return _TASK_LIST_ADAPTER.dump_json(records)
+
+
+def encode_record_lines(records: list[TaskRecord]) -> bytes:
+    """
+    Сериализовать записи задач в NDJSON: по объекту на строку.
+
+    :param records: записи задач
+    :return: строки JSON в UTF-8, каждая с переводом строки
+    """
+    if orjson is not None:
+        return b"".join(orjson.dumps(record) + b"\n" for record in records)
+    return b"".join(
+        _TASK_ADAPTER.dump_json(record) + b"\n" for record in records
+    )
+
+
+class TaskJSONResponse(Response):
+    """
+    Ответ с задачей или списком задач, сериализованными напрямую.
+
+    FastAPI не валидирует и не сериализует возвращённый Response,
+    поэтому роут сохраняет response_model только для схемы OpenAPI.
+    Заголовки из параметра response роута нужно передать явно.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, Task):
+            return encode_task(content)
+        return encode_tasks(content)
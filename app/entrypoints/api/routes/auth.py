@@ -1,25 +1,31 @@
-from dependency_injector.wiring import inject, Provide
-from app.container import Container
+from app.config import settings
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from app.infrastructure.security import verify_password, create_access_token
+from app.infrastructure.security import (
+    PasswordHasherBusyError,
+    create_access_token,
+)
 from app.domain.entities.user import User
-from app.common.logs import logger
+from app.common.logs import SAMPLED, logger
+from app.entrypoints.api.dependencies import (
+    get_password_hasher,
+    get_user_service,
+)
 
 router = APIRouter()
 
 
 @router.post("/login", response_model=None, status_code=status.HTTP_200_OK)
-@inject
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    user_service=Depends(Provide[Container.user_service]),
+    user_service=Depends(get_user_service),
+    password_hasher=Depends(get_password_hasher),
 ):
     try:
         user: User | None = await user_service.get_user_by_username(
             form_data.username
         )
-        if not user or not verify_password(
+        if not user or not await password_hasher.verify(
             form_data.password, user.hashed_password
         ):
             raise HTTPException(
@@ -27,13 +33,23 @@ async def login(
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        access_token = create_access_token(data={"sub": user.username})
+        claims = {"sub": user.username}
+        if settings.auth_embed_principal_claims:
+            claims.update(uid=user.id, active=user.is_active)
+        access_token = create_access_token(data=claims)
         return {"access_token": access_token, "token_type": "bearer"}
     except HTTPException as e:
-        logger.warning(f"Login failed: {e.detail}")
+        logger.warning("Login failed: %s", e.detail, extra=SAMPLED)
         raise
+    except PasswordHasherBusyError as e:
+        logger.warning("Login rejected: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
     except Exception as e:
-        logger.error(f"Error during login: {e}")
+        logger.error("Error during login: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error",
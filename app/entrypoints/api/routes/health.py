@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Request, status
+from fastapi.responses import JSONResponse
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+
+@router.get("/live", include_in_schema=False)
+async def live():
+    return {"status": "ok"}
+
+
+@router.get("/ready", include_in_schema=False)
+async def ready(request: Request):
+    if not getattr(request.app.state, "ready", False):
+        return JSONResponse(
+            {"status": "starting"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+    return {"status": "ok"}
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.common.metrics import REGISTRY
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics", response_class=PlainTextResponse, include_in_schema=False
+)
+async def metrics():
+    return PlainTextResponse(
+        REGISTRY.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -1,26 +1,124 @@
+import asyncio
+from datetime import date
+from typing import AsyncIterator
+
 import sqlalchemy
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
 
 from app.application.services.task_service import TaskService
-from app.entrypoints.api.schemas.task import TaskCreate, TaskRead, TaskUpdate
-from app.container import Container
-from app.entrypoints.api.dependencies import get_current_user
-from app.domain.entities.user import User
-from app.entrypoints.api.schemas.user import UserRead
-from app.common.logs import logger
+from app.config import settings
+from app.domain.entities.task import (
+    Task,
+    TaskChangesExpired,
+    TaskCursor,
+    TaskFilter,
+    TaskOrdering,
+    TaskRecord,
+    TaskVersionConflict,
+)
+from app.entrypoints.api.schemas.task import (
+    TaskBatchCreate,
+    TaskBatchDelete,
+    TaskBatchDeleteRead,
+    TaskBatchRead,
+    TaskBatchUpdate,
+    TaskChangesRead,
+    TaskCreate,
+    TaskEventRead,
+    TaskExportFormat,
+    TaskRead,
+    TaskStatsRead,
+    TaskUpdate,
+)
+from app.entrypoints.api.responses import (
+    TaskJSONResponse,
+    encode_record_lines,
+    encode_records,
+)
+from app.infrastructure.task_events import (
+    TaskEventHub,
+    TaskEventSubscription,
+)
+from app.entrypoints.api.dependencies import (
+    get_current_user,
+    get_task_event_hub,
+    get_task_service,
+)
+from app.entrypoints.api.schemas.user import Principal
+from app.common.logs import SAMPLED, logger
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+ETAG_HEADER = "ETag"
+
+
+def _task_etag(task_id: int, version: int) -> str:
+    return f'"{task_id}.{version}"'
+
+
+def _user_tasks_etag(user_id: int, version: int) -> str:
+    return f'"user-{user_id}.{version}"'
+
+
+def _task_response(
+    response: Response, content: Task | list[Task]
+) -> Task | list[Task] | Response:
+    """
+    Вернуть задачи как есть для response_model или, если включена
+    быстрая сериализация, сразу готовым JSON.
+
+    :param response: ответ роута с уже выставленными заголовками
+    :param content: задача или список задач
+    """
+    if settings.task_fast_serialization:
+        return TaskJSONResponse(content, headers=response.headers)
+    return content
+
 
-def get_task_service():
-    return Container.task_service()
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def _expected_version(if_match: str | None, task_id: int) -> int | None:
+    """
+    Достать версию задачи из If-Match.
+
+    :param if_match: значение заголовка If-Match
+    :param task_id: ID обновляемой задачи
+    :return: ожидаемая версия или None, если условие не задано или "*"
+    :raises HTTPException: 412, если ETag не относится к этой задаче
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    etag_task_id, _, version = if_match.strip().strip('"').partition(".")
+    if etag_task_id != str(task_id) or not version.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match does not match the task",
+        )
+    return int(version)
 
 
 @router.post("/", response_model=TaskRead, status_code=status.HTTP_201_CREATED)
 async def create_task(
     task_create: TaskCreate,
     task_service=Depends(get_task_service),
-    current_user: UserRead = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
 ):
     try:
         created_task = await task_service.create_task(
@@ -32,19 +130,115 @@ async def create_task(
     except sqlalchemy.exc.IntegrityError as e:
         raise HTTPException(status_code=409, detail="Task already exists")
     except Exception as e:
-        logger.error(f"Unexpected error in create_task: {e}", exc_info=True)
+        logger.error("Unexpected error in create_task: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+def _check_batch_size(size: int) -> None:
+    if size > settings.task_batch_max_size:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch size exceeds {settings.task_batch_max_size}",
+        )
+
+
+@router.post(
+    "/batch", response_model=TaskBatchRead, status_code=status.HTTP_200_OK
+)
+async def create_tasks_batch(
+    batch: TaskBatchCreate,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    _check_batch_size(len(batch.items))
+    try:
+        result = await task_service.create_tasks_batch(
+            batch.items, current_user.id
+        )
+        return TaskBatchRead.model_validate(result)
+    except sqlalchemy.exc.IntegrityError:
+        raise HTTPException(status_code=409, detail="Task already exists")
+    except Exception as e:
+        logger.error("Error in create_tasks_batch: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.patch(
+    "/batch", response_model=TaskBatchRead, status_code=status.HTTP_200_OK
+)
+async def update_tasks_batch(
+    batch: TaskBatchUpdate,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    _check_batch_size(len(batch.items))
+    try:
+        result = await task_service.update_tasks_batch(
+            batch.items, current_user.id
+        )
+        return TaskBatchRead.model_validate(result)
+    except Exception as e:
+        logger.error("Error in update_tasks_batch: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.delete(
+    "/batch",
+    response_model=TaskBatchDeleteRead,
+    status_code=status.HTTP_200_OK,
+)
+async def delete_tasks_batch(
+    batch: TaskBatchDelete,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    _check_batch_size(len(batch.ids))
+    try:
+        result = await task_service.delete_tasks_batch(
+            batch.ids, current_user.id
+        )
+        return TaskBatchDeleteRead.model_validate(result)
+    except Exception as e:
+        logger.error("Error in delete_tasks_batch: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.get("/", response_model=list[TaskRead], status_code=status.HTTP_200_OK)
 async def get_all_tasks(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    user_id: int | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    title_prefix: str | None = Query(None, min_length=1),
+    order_by: TaskOrdering = TaskOrdering.ID,
+    limit: int = Query(
+        settings.task_page_default_limit,
+        ge=1,
+        le=settings.task_page_max_limit,
+    ),
+    cursor: str | None = None,
+    current_user: Principal = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service),
 ):
     try:
-        return await task_service.get_all_tasks()
+        page = await task_service.get_tasks_page(
+            TaskFilter(
+                user_id=user_id,
+                due_from=due_from,
+                due_to=due_to,
+                title_prefix=title_prefix,
+            ),
+            limit,
+            cursor=TaskCursor.decode(cursor) if cursor else None,
+            ordering=order_by,
+        )
+        if page.next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = page.next_cursor.encode()
+        return _task_response(response, page.items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Error in get_all_tasks: {e}", exc_info=True)
+        logger.error("Error in get_all_tasks: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -52,34 +246,249 @@ async def get_all_tasks(
     "/user", response_model=list[TaskRead], status_code=status.HTTP_200_OK
 )
 async def get_tasks_by_user(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    if_none_match: str | None = Header(None),
+    current_user: Principal = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service),
 ):
     try:
-        return await task_service.get_all_tasks_by_user_id(current_user.id)
+        # Версия читается до задач: изменение между запросами даст
+        # устаревший ETag и лишний 200 позже, но не 304 на старые данные.
+        etag = _user_tasks_etag(
+            current_user.id,
+            await task_service.get_user_tasks_version(current_user.id),
+        )
+        if if_none_match is not None and _etag_matches(if_none_match, etag):
+            return Response(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={ETAG_HEADER: etag},
+            )
+        tasks = await task_service.get_all_tasks_by_user_id(current_user.id)
+        response.headers[ETAG_HEADER] = etag
+        return _task_response(response, tasks)
     except Exception as e:
-        logger.error(f"Error in get_tasks_by_user: {e}", exc_info=True)
+        logger.error("Error in get_tasks_by_user: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
+@router.get(
+    "/search", response_model=list[TaskRead], status_code=status.HTTP_200_OK
+)
+async def search_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(
+        settings.task_page_default_limit,
+        ge=1,
+        le=settings.task_page_max_limit,
+    ),
+    cursor: str | None = None,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    try:
+        page = await task_service.search_tasks(
+            current_user.id,
+            q,
+            limit,
+            cursor=TaskCursor.decode(cursor) if cursor else None,
+        )
+        if page.next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = page.next_cursor.encode()
+        return _task_response(response, page.items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error in search_tasks: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get(
+    "/stats", response_model=TaskStatsRead, status_code=status.HTTP_200_OK
+)
+async def get_task_stats(
+    today: date | None = None,
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    try:
+        # Границы «сегодня» зависят от часового пояса клиента, поэтому
+        # дату можно передать явно; по умолчанию берётся дата сервера.
+        return await task_service.get_task_stats(
+            current_user.id, today or date.today()
+        )
+    except Exception as e:
+        logger.error("Error in get_task_stats: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+@router.get(
+    "/changes", response_model=TaskChangesRead, status_code=status.HTTP_200_OK
+)
+async def get_task_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(
+        settings.task_page_default_limit,
+        ge=1,
+        le=settings.task_page_max_limit,
+    ),
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    try:
+        return await task_service.get_task_changes(
+            current_user.id, since, limit
+        )
+    except TaskChangesExpired:
+        # Журнал после курсора очищен: клиент должен сбросить локальные
+        # данные и синхронизироваться заново с since=0.
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Change cursor expired, resync with since=0",
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error("Error in get_task_changes: %s", e, exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+
+# Server-Sent Events с изменениями задач текущего пользователя. Событие
+# resync означает, что часть событий потеряна: клиенту нужно
+# переподключиться и догнать изменения через /tasks/changes.
+@router.get("/events", status_code=status.HTTP_200_OK)
+async def stream_task_events(
+    current_user: Principal = Depends(get_current_user),
+    hub: TaskEventHub = Depends(get_task_event_hub),
+):
+    return StreamingResponse(
+        _stream_task_events(
+            hub, current_user.id, settings.task_events_heartbeat_seconds
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _stream_task_events(
+    hub: TaskEventHub, user_id: int, heartbeat: float
+) -> AsyncIterator[bytes]:
+    async with hub.subscribe(user_id) as subscription:
+        async for chunk in _encode_sse(subscription, heartbeat):
+            yield chunk
+
+
+async def _encode_sse(
+    subscription: TaskEventSubscription, heartbeat: float
+) -> AsyncIterator[bytes]:
+    while True:
+        try:
+            event = await subscription.get(timeout=heartbeat)
+        except asyncio.TimeoutError:
+            # Комментарий держит соединение открытым через прокси.
+            yield b": keepalive\n\n"
+            continue
+        if event is None:
+            if subscription.overflowed:
+                yield b"event: resync\ndata: {}\n\n"
+            return
+        data = TaskEventRead.model_validate(event).model_dump_json()
+        yield f"event: {event.type.value}\ndata: {data}\n\n".encode()
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_tasks(
+    export_format: TaskExportFormat = Query(
+        TaskExportFormat.NDJSON, alias="format"
+    ),
+    user_id: int | None = None,
+    due_from: date | None = None,
+    due_to: date | None = None,
+    title_prefix: str | None = Query(None, min_length=1),
+    current_user: Principal = Depends(get_current_user),
+    task_service: TaskService = Depends(get_task_service),
+):
+    try:
+        chunks = task_service.export_tasks(
+            TaskFilter(
+                user_id=user_id,
+                due_from=due_from,
+                due_to=due_to,
+                title_prefix=title_prefix,
+            ),
+            settings.task_export_chunk_size,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if export_format == TaskExportFormat.JSON:
+        return StreamingResponse(
+            _encode_json_array(chunks), media_type="application/json"
+        )
+    return StreamingResponse(
+        _encode_ndjson(chunks), media_type="application/x-ndjson"
+    )
+
+
+async def _encode_ndjson(
+    chunks: AsyncIterator[list[TaskRecord]],
+) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in chunks:
+            yield encode_record_lines(chunk)
+    except Exception as e:
+        logger.error("Error in export_tasks: %s", e, exc_info=True)
+        raise
+
+
+async def _encode_json_array(
+    chunks: AsyncIterator[list[TaskRecord]],
+) -> AsyncIterator[bytes]:
+    yield b"["
+    first = True
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            # Элементы массива без окружающих скобок.
+            body = encode_records(chunk)[1:-1]
+            yield body if first else b"," + body
+            first = False
+    except Exception as e:
+        logger.error("Error in export_tasks: %s", e, exc_info=True)
+        raise
+    yield b"]"
+
+
 @router.get(
     "/{task_id}", response_model=TaskRead, status_code=status.HTTP_200_OK
 )
 async def get_task(
     task_id: int,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    if_none_match: str | None = Header(None),
+    current_user: Principal = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service),
 ):
     try:
+        if if_none_match is not None:
+            version = await task_service.get_task_version(task_id)
+            if version is not None:
+                etag = _task_etag(task_id, version)
+                if _etag_matches(if_none_match, etag):
+                    return Response(
+                        status_code=status.HTTP_304_NOT_MODIFIED,
+                        headers={ETAG_HEADER: etag},
+                    )
         task = await task_service.get_task_by_id(task_id)
         if task is None:
-            logger.error(f"Task not found: task_id={task_id}")
+            logger.error("Task not found: task_id=%s", task_id, extra=SAMPLED)
             raise HTTPException(status_code=404, detail="Task not found")
-        return task
+        response.headers[ETAG_HEADER] = _task_etag(task.id, task.version)
+        return _task_response(response, task)
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in get_task: {e}", exc_info=True)
+        logger.error("Error in get_task: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
@@ -89,36 +498,59 @@ async def get_task(
 async def update_task(
     task_id: int,
     task_update: TaskUpdate,
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    if_match: str | None = Header(None),
+    current_user: Principal = Depends(get_current_user),
     task_service=Depends(get_task_service),
 ):
+    expected_version = _expected_version(if_match, task_id)
     try:
         updated_task = await task_service.update_task(
-            task_update, task_id, current_user.id
+            task_update,
+            task_id,
+            current_user.id,
+            expected_version=expected_version,
+        )
+        response.headers[ETAG_HEADER] = _task_etag(
+            updated_task.id, updated_task.version
         )
         return TaskRead.model_validate(updated_task)
+    except TaskVersionConflict as e:
+        logger.warning("Version conflict in update_task: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Task has been modified",
+        )
     except ValueError as e:
-        logger.error(f"Validation error in update_task: {e}")
+        logger.error("Validation error in update_task: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
     except sqlalchemy.exc.NoResultFound:
-        logger.error(f"Task not found in update_task: task_id={task_id}")
+        logger.error(
+            "Task not found in update_task: task_id=%s",
+            task_id,
+            extra=SAMPLED,
+        )
         raise HTTPException(status_code=404, detail="Task not found")
     except Exception as e:
-        logger.error(f"Unexpected error in update_task: {e}", exc_info=True)
+        logger.error("Unexpected error in update_task: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     task_service: TaskService = Depends(get_task_service),
 ):
     try:
         await task_service.delete_task(task_id)
     except sqlalchemy.exc.NoResultFound:
-        logger.error(f"Task not found in delete_task: task_id={task_id}")
+        logger.error(
+            "Task not found in delete_task: task_id=%s",
+            task_id,
+            extra=SAMPLED,
+        )
         raise HTTPException(status_code=404, detail="Task not found")
     except Exception as e:
-        logger.error(f"Error in delete_task: {e}", exc_info=True)
+        logger.error("Error in delete_task: %s", e, exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 
 from app.entrypoints.api.schemas.user import UserCreate, UserRead
 from app.entrypoints.api.dependencies import get_user_service
+from app.infrastructure.security import PasswordHasherBusyError
 from app.common.logs import logger
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -16,8 +17,15 @@ async def create_user(
         user = await user_service.create_user(user_create)
         return UserRead.model_validate(user)
     except ValueError as e:
-        logger.error(f"Error creating user: {e}")
+        logger.error("Error creating user: %s", e)
         raise HTTPException(status_code=400, detail="Invalid user data")
+    except PasswordHasherBusyError as e:
+        logger.warning("User creation rejected: %s", e)
+        raise HTTPException(
+            status_code=503,
+            detail="Service is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
 
 
 @router.get(
@@ -29,6 +37,6 @@ async def get_user(
 ):
     user = await user_service.get_user_by_id(user_id)
     if user is None:
-        logger.warning(f"User with ID {user_id} not found")
+        logger.warning("User with ID %s not found", user_id)
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -1,6 +1,9 @@
+from enum import Enum
 from pydantic import BaseModel
 from datetime import date
 
+from app.domain.entities.task import TaskEventType
+
 
 class TaskCreate(BaseModel):
     title: str
@@ -23,3 +26,87 @@ class TaskRead(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class TaskBatchCreate(BaseModel):
+    items: list[TaskCreate]
+
+
+class TaskBatchUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBatchUpdate(BaseModel):
+    items: list[TaskBatchUpdateItem]
+
+
+class TaskBatchDelete(BaseModel):
+    ids: list[int]
+
+
+class TaskBatchErrorRead(BaseModel):
+    index: int
+    detail: str
+    task_id: int | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class TaskBatchRead(BaseModel):
+    tasks: list[TaskRead]
+    errors: list[TaskBatchErrorRead]
+
+    class Config:
+        from_attributes = True
+
+
+class TaskBatchDeleteRead(BaseModel):
+    deleted_ids: list[int]
+    errors: list[TaskBatchErrorRead]
+
+    class Config:
+        from_attributes = True
+
+
+class TaskExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    JSON = "json"
+
+
+class TaskChangeRead(BaseModel):
+    seq: int
+    task_id: int
+    deleted: bool
+    task: TaskRead | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class TaskChangesRead(BaseModel):
+    changes: list[TaskChangeRead]
+    cursor: int
+    has_more: bool
+
+    class Config:
+        from_attributes = True
+
+
+class TaskStatsRead(BaseModel):
+    overdue: int
+    due_today: int
+    upcoming: int
+    total: int
+
+    class Config:
+        from_attributes = True
+
+
+class TaskEventRead(BaseModel):
+    type: TaskEventType
+    task_id: int
+    task: TaskRead | None = None
+
+    class Config:
+        from_attributes = True
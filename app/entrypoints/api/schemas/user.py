@@ -8,11 +8,17 @@ class UserCreate(BaseModel):
     is_active: bool = True
 
 
-class UserRead(BaseModel):
+class Principal(BaseModel):
     id: int
     username: str
-    email: EmailStr
     is_active: bool
 
     class Config:
         from_attributes = True
+
+
+class UserRead(Principal):
+    email: EmailStr
+
+    class Config:
+        from_attributes = True
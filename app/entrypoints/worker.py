@@ -0,0 +1,13 @@
+from uvicorn.workers import UvicornWorker as BaseUvicornWorker
+
+
+class UvicornWorker(BaseUvicornWorker):
+    """
+    Воркер gunicorn с явно выбранными uvloop и httptools.
+
+    Без явного выбора uvicorn молча откатывается на asyncio и h11, если
+    пакеты не установлены; здесь их отсутствие - ошибка запуска.
+    lifespan=on делает ошибку старта приложения фатальной для воркера.
+    """
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
@@ -1,44 +1,283 @@
-from asyncio import current_task
+import asyncio
+import re
+import time
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Awaitable, Callable
 
-from sqlalchemy import MetaData
+from sqlalchemy import MetaData, event, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
     AsyncSession,
-    async_scoped_session,
 )
 from sqlalchemy.orm import declarative_base, declared_attr
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.common.logs import logger
+from app.common.metrics import REGISTRY
+from app.infrastructure.db.unit_of_work import (
+    UnitOfWork,
+    current_unit_of_work,
+)
+
+POOL_CHECKOUT_WAIT = REGISTRY.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection.",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_CONNECTIONS_IN_USE = REGISTRY.gauge(
+    "db_pool_connections_in_use",
+    "Database connections currently checked out of the pool.",
+)
+POOL_CONNECTIONS_IDLE = REGISTRY.gauge(
+    "db_pool_connections_idle",
+    "Database connections currently idle in the pool.",
+)
+POOL_SIZE = REGISTRY.gauge(
+    "db_pool_size",
+    "Configured number of persistent connections in the pool.",
+)
+POOL_OVERFLOW = REGISTRY.gauge(
+    "db_pool_overflow",
+    "Connections opened beyond pool_size (negative while below it).",
+)
+POOL_CHECKOUT_TIMEOUTS = REGISTRY.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up after pool_timeout.",
+)
+POOL_WARM_UP_DURATION = REGISTRY.gauge(
+    "db_pool_warm_up_duration_seconds",
+    "Duration of the last completed connection pool warm-up.",
+)
+POOL_WARM_UP_CONNECTIONS = REGISTRY.gauge(
+    "db_pool_warm_up_connections",
+    "Connections opened and prepared by the last pool warm-up.",
+)
+QUERY_DURATION = REGISTRY.histogram(
+    "db_query_duration_seconds",
+    "Database statement latency by statement fingerprint.",
+    labelnames=("statement",),
+)
+QUERY_ROWS = REGISTRY.counter(
+    "db_query_rows_total",
+    "Rows returned or affected by statement fingerprint.",
+    labelnames=("statement",),
+)
+
+_PARAMETER = re.compile(r"\$\d+(?:::\w+(?:\[\])?)?|%\(\w+\)s|\b\d+\b")
+_REPEATED_GROUP = re.compile(r"(\([^()]*\))(?:, \1)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def statement_fingerprint(statement: str) -> str:
+    """
+    Нормализовать SQL для использования в метке метрики.
+
+    Параметры и числовые литералы заменяются на ?, а повторяющиеся
+    группы VALUES многострочных вставок сворачиваются в одну, чтобы
+    пакеты разного размера попадали в один временной ряд.
+
+    :param statement: текст SQL, отправляемый драйверу
+    :return: отпечаток выражения
+    """
+    fingerprint = _WHITESPACE.sub(" ", statement).strip()
+    fingerprint = _PARAMETER.sub("?", fingerprint)
+    return _REPEATED_GROUP.sub(r"\1, ...", fingerprint)
+
+
+def _before_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn, cursor, statement, parameters, context, executemany
+):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    fingerprint = statement_fingerprint(statement)
+    QUERY_DURATION.labels(fingerprint).observe(time.perf_counter() - started)
+    # Для серверных курсоров (stream) rowcount неизвестен и равен -1.
+    if cursor.rowcount > 0:
+        QUERY_ROWS.labels(fingerprint).inc(cursor.rowcount)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, измеряющий время ожидания свободного соединения.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
 
 
 class Database:
-    def __init__(self, db_url: str, pool_size: int = 5) -> None:
+    def __init__(
+        self,
+        db_url: str,
+        pool_size: int = 5,
+        max_overflow: int = 10,
+        pool_timeout: float = 30.0,
+        pool_recycle: int = -1,
+        pool_pre_ping: bool = True,
+        statement_cache_size: int = 100,
+        statement_timeout_ms: int = 0,
+    ) -> None:
+        """
+        :param db_url: строка подключения SQLAlchemy
+        :param pool_size: количество постоянных соединений в пуле
+        :param max_overflow: сколько соединений можно открыть сверх pool_size
+        :param pool_timeout: сколько секунд ждать свободного соединения
+        :param pool_recycle: пересоздавать соединения старше N секунд
+            (-1 - не пересоздавать)
+        :param pool_pre_ping: проверять соединение SELECT 1 при выдаче
+            из пула
+        :param statement_cache_size: размер кэша подготовленных выражений
+            на соединение (0 - отключить, например за pgbouncer)
+        :param statement_timeout_ms: statement_timeout на стороне сервера
+            (0 - без ограничения)
+        """
         self.db_url = db_url
+        connect_args: dict[str, Any] = {
+            "prepared_statement_cache_size": statement_cache_size,
+            "statement_cache_size": statement_cache_size,
+        }
+        if statement_timeout_ms > 0:
+            connect_args["server_settings"] = {
+                "statement_timeout": str(statement_timeout_ms)
+            }
         self._async_engine = create_async_engine(
             self.db_url,
-            pool_pre_ping=True,
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_pre_ping=pool_pre_ping,
             pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            connect_args=connect_args,
+        )
+        sync_engine = self._async_engine.sync_engine
+        event.listen(
+            sync_engine, "before_cursor_execute", _before_cursor_execute
+        )
+        event.listen(
+            sync_engine, "after_cursor_execute", _after_cursor_execute
         )
-        self._session_factory = async_scoped_session(
-            async_sessionmaker(
-                self._async_engine,
-                autocommit=False,
-                autoflush=False,
-                expire_on_commit=False,
-                class_=AsyncSession,
-            ),
-            scopefunc=current_task,
+        pool = sync_engine.pool
+        POOL_CONNECTIONS_IN_USE.set_function(pool.checkedout)
+        POOL_CONNECTIONS_IDLE.set_function(pool.checkedin)
+        POOL_SIZE.set_function(pool.size)
+        POOL_OVERFLOW.set_function(pool.overflow)
+        self._session_factory = async_sessionmaker(
+            self._async_engine,
+            autocommit=False,
+            autoflush=False,
+            expire_on_commit=False,
+            class_=AsyncSession,
         )
 
     def get_session(self) -> AsyncSession:
         return self._session_factory()
 
+    async def warm_up(
+        self,
+        connections: int,
+        prepare: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
+        """
+        Заранее открыть соединения пула и подготовить на них выражения.
+
+        Каждое соединение берётся своей UnitOfWork, и все они
+        удерживаются, пока не будут получены остальные, поэтому пул
+        выдаёт connections разных соединений, а не одно несколько раз.
+        Затем на каждом выполняется prepare, и транзакция откатывается:
+        asyncpg кэширует подготовленные выражения на соединении, и после
+        прогрева первые запросы не тратят время ни на подключение, ни на
+        разбор SQL. Больше pool_size соединений не открывается: лишние
+        всё равно закрылись бы при возврате в пул.
+
+        :param connections: сколько соединений открыть
+        :param prepare: корутинная функция, выполняющая частые выражения
+            через репозитории (они получат сеанс текущей UnitOfWork)
+        """
+        connections = min(connections, self._async_engine.pool.size())
+        if connections <= 0:
+            return
+        started = time.perf_counter()
+        checked_out = asyncio.Barrier(connections)
+
+        async def warm_up_connection() -> None:
+            async with UnitOfWork() as unit_of_work:
+                async with self.session() as session:
+                    await session.execute(text("SELECT 1"))
+                await checked_out.wait()
+                if prepare is not None:
+                    await prepare()
+                await unit_of_work.rollback()
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                for _ in range(connections):
+                    group.create_task(warm_up_connection())
+        except ExceptionGroup as errors:
+            # Соединения обычно падают по одной причине: достаточно первой.
+            raise errors.exceptions[0]
+
+        duration = time.perf_counter() - started
+        POOL_WARM_UP_DURATION.set(duration)
+        POOL_WARM_UP_CONNECTIONS.set(connections)
+        logger.info(
+            "Database pool warmed up: connections=%s, duration=%.3fs",
+            connections,
+            duration,
+        )
+
+    async def dispose(self) -> None:
+        """
+        Закрыть все соединения пула.
+        """
+        await self._async_engine.dispose()
+
     @asynccontextmanager
-    async def session(self) -> AsyncGenerator[AsyncSession, None]:
+    async def session(
+        self, detached: bool = False
+    ) -> AsyncGenerator[AsyncSession, None]:
+        """
+        Сеанс для одного обращения репозитория к базе.
+
+        Внутри активной UnitOfWork возвращается её общий сеанс: фиксацию
+        и откат выполняет владелец единицы работы. Вне её (фоновые задачи,
+        скрипты) открывается отдельный сеанс, который фиксируется при
+        успешном выходе из блока.
+
+        :param detached: открыть отдельный сеанс и внутри UnitOfWork;
+            нужен чтениям, которые идут при отправке тела потокового
+            ответа, когда транзакция запроса уже зафиксирована
+        """
+        unit_of_work = current_unit_of_work()
+        if unit_of_work is not None and not detached:
+            if unit_of_work.session is None:
+                unit_of_work.session = self._session_factory()
+            yield unit_of_work.session
+            return
+
         session: AsyncSession = self._session_factory()
         try:
             yield session
+            await session.commit()
         except Exception:
             await session.rollback()
             raise
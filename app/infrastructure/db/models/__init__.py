@@ -1,4 +1,17 @@
 from .user import UserModel
 from .task import TaskModel
+from .task_change import TaskChangeModel
+from .task_change_horizon import TaskChangeHorizonModel
+from .task_due_date_count import TaskDueDateCountModel
+from .task_reminder import TaskReminderModel
+from .outbox import OutboxModel
 
-__all__ = ["UserModel", "TaskModel"]
+__all__ = [
+    "UserModel",
+    "TaskModel",
+    "TaskChangeModel",
+    "TaskChangeHorizonModel",
+    "TaskDueDateCountModel",
+    "TaskReminderModel",
+    "OutboxModel",
+]
@@ -0,0 +1,47 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from app.infrastructure.db.base import Base
+
+
+class OutboxModel(Base):
+    """
+    Транзакционный outbox: побочные эффекты изменений задач и
+    пользователей, записанные в той же транзакции, что и изменение.
+
+    Обработанные сообщения удаляются; dead_lettered_at отмечает
+    сообщения, исчерпавшие попытки. Частичный индекс содержит только
+    ожидающие сообщения, поэтому выборка очереди не растёт вместе
+    с dead letter.
+    """
+
+    __tablename__ = "outbox"
+    __table_args__ = (
+        Index(
+            "ix_outbox_available_at_id",
+            "available_at",
+            "id",
+            postgresql_where=text("dead_lettered_at IS NULL"),
+        ),
+    )
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    topic = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    attempts = Column(Integer, nullable=False, server_default="0")
+    available_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    created_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+    last_error = Column(String, nullable=True)
+    dead_lettered_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,12 +1,50 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import (
+    Column,
+    Computed,
+    Integer,
+    String,
+    Date,
+    ForeignKey,
+    Index,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.infrastructure.db.base import Base
 
+# Заголовок весит больше описания (веса A и B ts_rank); конфигурация
+# simple не зависит от языка задачи и не применяет стемминг.
+TASK_SEARCH_VECTOR = (
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
 
 class TaskModel(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_due_date_id", "due_date", "id"),
+        Index("ix_tasks_user_id_id", "user_id", "id"),
+        Index("ix_tasks_user_id_due_date_id", "user_id", "due_date", "id"),
+        Index(
+            "ix_tasks_title_prefix",
+            "title",
+            postgresql_ops={"title": "text_pattern_ops"},
+        ),
+        Index(
+            "ix_tasks_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        # ix_tasks_title_trgm (gin_trgm_ops) миграция создаёт, только
+        # если на сервере есть pg_trgm, поэтому в модели он не объявлен.
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
     due_date = Column(Date, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    version = Column(Integer, nullable=False, server_default="1")
+    search_vector = deferred(
+        Column(TSVECTOR, Computed(TASK_SEARCH_VECTOR, persisted=True))
+    )
@@ -0,0 +1,36 @@
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    func,
+)
+from app.infrastructure.db.base import Base
+
+
+class TaskChangeModel(Base):
+    """
+    Журнал изменений задач для инкрементальной синхронизации.
+
+    Внешних ключей нет намеренно: запись об удалении (tombstone)
+    переживает саму задачу.
+    """
+
+    __tablename__ = "task_changes"
+    __table_args__ = (
+        Index("ix_task_changes_user_id_seq", "user_id", "seq"),
+        # Поиск более позднего изменения той же задачи при очистке.
+        Index(
+            "ix_task_changes_task_id_user_id_seq", "task_id", "user_id", "seq"
+        ),
+    )
+
+    seq = Column(BigInteger, primary_key=True, autoincrement=True)
+    task_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=False)
+    deleted = Column(Boolean, nullable=False, server_default="false")
+    changed_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -0,0 +1,16 @@
+from sqlalchemy import BigInteger, Column, Integer
+from app.infrastructure.db.base import Base
+
+
+class TaskChangeHorizonModel(Base):
+    """
+    Граница очистки журнала изменений пользователя.
+
+    pruned_seq - наибольший seq очищенного удаления: курсор меньше него
+    мог не получить это удаление и требует полной синхронизации.
+    """
+
+    __tablename__ = "task_change_horizons"
+
+    user_id = Column(Integer, primary_key=True)
+    pruned_seq = Column(BigInteger, nullable=False)
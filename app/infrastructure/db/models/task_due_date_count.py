@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Date, Integer
+from app.infrastructure.db.base import Base
+
+
+class TaskDueDateCountModel(Base):
+    """
+    Сводка количества задач пользователя по сроку выполнения.
+
+    Поддерживается SQLAlchemyTaskRepository в тех же выражениях, что
+    меняют задачи. Строки с нулевым количеством не удаляются: они не
+    влияют на суммы и будут переиспользованы следующей задачей на ту же
+    дату.
+    """
+
+    __tablename__ = "task_due_date_counts"
+
+    user_id = Column(Integer, primary_key=True)
+    due_date = Column(Date, primary_key=True)
+    task_count = Column(Integer, nullable=False)
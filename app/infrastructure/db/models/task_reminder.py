@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, func
+from app.infrastructure.db.base import Base
+
+
+class TaskReminderModel(Base):
+    """
+    Отправленные напоминания о сроках задач.
+
+    Первичный ключ (task_id, due_date) делает отправку однократной для
+    всех воркеров: напоминание занимает тот, чья вставка прошла.
+    """
+
+    __tablename__ = "task_reminders"
+
+    task_id = Column(
+        Integer,
+        ForeignKey("tasks.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    due_date = Column(Date, primary_key=True)
+    sent_at = Column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
@@ -1,6 +1,5 @@
 from sqlalchemy import Boolean, Column, Integer, String
 
-from app.domain.entities.user import User
 from app.infrastructure.db.base import Base
 
 
@@ -12,22 +11,3 @@ class UserModel(Base):
     email = Column(String, unique=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
-
-    @classmethod
-    def from_entity(cls, user: User) -> "UserModel":
-        return cls(
-            id=user.id,
-            username=user.username,
-            email=user.email,
-            hashed_password=user.hashed_password,
-            is_active=user.is_active,
-        )
-
-    def to_entity(self) -> User:
-        return User(
-            id=self.id,
-            username=self.username,
-            email=self.email,
-            hashed_password=self.hashed_password,
-            is_active=self.is_active,
-        )
@@ -0,0 +1,98 @@
+from contextvars import ContextVar, Token
+from typing import Awaitable, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.common.logs import logger
+
+_current_unit_of_work: ContextVar["UnitOfWork | None"] = ContextVar(
+    "unit_of_work", default=None
+)
+
+
+class UnitOfWork:
+    """
+    Единица работы: один сеанс и одна транзакция на HTTP-запрос.
+
+    Пока единица работы активна, Database.session() отдаёт всем
+    репозиториям один и тот же сеанс, а фиксирует транзакцию только
+    владелец единицы работы. Сеанс создаётся лениво, поэтому запросы,
+    не обращающиеся к базе, не занимают соединение из пула.
+
+    Сеанс нельзя использовать из нескольких корутин одновременно:
+    обращения к репозиториям внутри запроса должны идти последовательно.
+    """
+
+    def __init__(self):
+        self.session: AsyncSession | None = None
+        self._token: Token | None = None
+        self._callbacks: list[Callable[[], Awaitable[None]]] = []
+        self._commit_callbacks: list[Callable[[], Awaitable[None]]] = []
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._token = _current_unit_of_work.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        _current_unit_of_work.reset(self._token)
+        try:
+            if self.session is not None:
+                try:
+                    if exc_type is not None:
+                        await self.session.rollback()
+                finally:
+                    await self.session.close()
+                    self.session = None
+        finally:
+            self._commit_callbacks = []
+            await self._run_callbacks()
+
+    def after_transaction(self, callback: Callable[[], Awaitable[None]]):
+        """
+        Выполнить callback после фиксации или отката транзакции.
+
+        Используется кэшами: запись, сброшенная до фиксации, может быть
+        снова заполнена старыми данными конкурентным чтением.
+
+        :param callback: корутинная функция без аргументов
+        """
+        self._callbacks.append(callback)
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]):
+        """
+        Выполнить callback только после успешной фиксации транзакции.
+
+        Используется для уведомлений: подписчики не должны узнать
+        об изменении, которое затем откатится.
+
+        :param callback: корутинная функция без аргументов
+        """
+        self._commit_callbacks.append(callback)
+
+    async def commit(self) -> None:
+        if self.session is not None:
+            await self.session.commit()
+        await self._run_callbacks()
+        callbacks, self._commit_callbacks = self._commit_callbacks, []
+        await self._run_callbacks(callbacks)
+
+    async def rollback(self) -> None:
+        if self.session is not None:
+            await self.session.rollback()
+        self._commit_callbacks = []
+        await self._run_callbacks()
+
+    async def _run_callbacks(
+        self, callbacks: list[Callable[[], Awaitable[None]]] | None = None
+    ) -> None:
+        if callbacks is None:
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                await callback()
+            except Exception as e:
+                logger.error("After-transaction callback failed: %s", e)
+
+
+def current_unit_of_work() -> UnitOfWork | None:
+    return _current_unit_of_work.get()
@@ -0,0 +1,232 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from app.common.logs import SAMPLED, logger
+from app.common.metrics import REGISTRY
+from app.domain.entities.outbox import OutboxMessage
+from app.domain.interfaces.outbox import OutboxHandler, OutboxRepository
+
+OUTBOX_MESSAGES = REGISTRY.counter(
+    "outbox_messages_total",
+    "Outbox messages processed by result (done, retried or dead_lettered).",
+    labelnames=("result",),
+)
+OUTBOX_HANDLER_DURATION = REGISTRY.histogram(
+    "outbox_handler_duration_seconds",
+    "Time spent in the outbox handler per message attempt.",
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0),
+)
+OUTBOX_DELIVERY_LAG = REGISTRY.histogram(
+    "outbox_delivery_lag_seconds",
+    "Delay between writing an outbox message and handling it.",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0, 3600.0),
+)
+OUTBOX_QUEUE_DEPTH = REGISTRY.gauge(
+    "outbox_queue_depth",
+    "Claimed outbox messages waiting for a free worker in this process.",
+)
+OUTBOX_WORKERS_BUSY = REGISTRY.gauge(
+    "outbox_workers_busy",
+    "Outbox workers currently handling a message.",
+)
+OUTBOX_WORKERS = REGISTRY.gauge(
+    "outbox_workers",
+    "Configured outbox worker concurrency.",
+)
+
+# Длина last_error в таблице: трассировки не нужны, нужна причина.
+_ERROR_LIMIT = 1000
+
+
+class WebhookOutboxHandler(OutboxHandler):
+    """
+    Доставка сообщений outbox POST-запросом на webhook.
+
+    Тело - JSON с id, topic и payload; id дублируется в заголовке
+    Idempotency-Key, так как сообщение может прийти повторно. Ответ
+    не 2xx считается ошибкой и повторяется.
+    """
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        """
+        :param url: адрес webhook
+        :param timeout: таймаут запроса в секундах
+        """
+        if not url:
+            raise ValueError("Outbox webhook URL is not configured")
+        self._url = url
+        self._client = httpx.AsyncClient(timeout=timeout)
+
+    async def handle(self, message: OutboxMessage) -> None:
+        response = await self._client.post(
+            self._url,
+            json={
+                "id": message.id,
+                "topic": message.topic,
+                "payload": message.payload,
+            },
+            headers={"Idempotency-Key": str(message.id)},
+        )
+        response.raise_for_status()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+class OutboxWorkerPool:
+    """
+    Фоновая обработка outbox пулом asyncio-воркеров.
+
+    Один сборщик занимает пакеты сообщений (OutboxRepository.claim) и
+    кладёт их в ограниченную очередь, а concurrency воркеров выполняют
+    обработчик. Сборщик занимает не больше свободного места в очереди:
+    занятые сообщения не ждут дольше аренды, а остальные остаются в
+    базе другим процессам. Пустая выборка - пауза poll_interval.
+
+    Неудачная попытка повторяется через backoff_base * 2 ** (n - 1)
+    секунд (не больше backoff_max, со случайным разбросом до половины),
+    после max_attempts попыток сообщение уходит в dead letter. Доставка
+    не менее чем однократная: после падения процесса незавершённое
+    сообщение выдаётся снова по истечении аренды.
+    """
+
+    def __init__(
+        self,
+        repository: OutboxRepository,
+        handler: OutboxHandler,
+        concurrency: int = 4,
+        batch_size: int = 100,
+        queue_size: int = 200,
+        poll_interval: float = 1.0,
+        lease_seconds: float = 60.0,
+        max_attempts: int = 10,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+    ):
+        """
+        :param repository: репозиторий outbox
+        :param handler: обработчик сообщений
+        :param concurrency: количество воркеров
+        :param batch_size: максимальный размер занимаемого пакета
+        :param queue_size: ёмкость очереди занятых сообщений
+        :param poll_interval: пауза после пустой выборки в секундах
+        :param lease_seconds: аренда занятого сообщения в секундах;
+            должна покрывать ожидание в очереди и обработку
+        :param max_attempts: попыток до dead letter
+        :param backoff_base: задержка первого повтора в секундах
+        :param backoff_max: предельная задержка повтора в секундах
+        """
+        self._repository = repository
+        self._handler = handler
+        self._concurrency = concurrency
+        self._batch_size = batch_size
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._queue: asyncio.Queue[OutboxMessage] = asyncio.Queue(queue_size)
+        self._has_room = asyncio.Event()
+        self._has_room.set()
+        OUTBOX_QUEUE_DEPTH.set_function(self._queue.qsize)
+        OUTBOX_WORKERS.set(concurrency)
+
+    def retry_delay(self, attempts: int) -> float:
+        """
+        :param attempts: номер неудачной попытки, начиная с 1
+        :return: задержка повтора в секундах
+        """
+        delay = min(
+            self._backoff_max, self._backoff_base * 2 ** (attempts - 1)
+        )
+        return delay * random.uniform(0.5, 1.0)
+
+    async def run(self) -> None:
+        """
+        Работать до отмены задачи; затем закрыть обработчик.
+        """
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._fetch())
+                for _ in range(self._concurrency):
+                    group.create_task(self._work())
+        finally:
+            await self._handler.close()
+
+    async def _fetch(self) -> None:
+        delay = self._poll_interval
+        while True:
+            await self._has_room.wait()
+            room = self._queue.maxsize - self._queue.qsize()
+            limit = min(self._batch_size, room)
+            try:
+                messages = await self._repository.claim(
+                    limit, self._lease_seconds
+                )
+            except Exception as e:
+                logger.warning("Outbox claim failed, retrying: %s", e)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 60.0)
+                continue
+            delay = self._poll_interval
+            for message in messages:
+                self._queue.put_nowait(message)
+            if self._queue.full():
+                self._has_room.clear()
+            if len(messages) < limit:
+                await asyncio.sleep(self._poll_interval)
+
+    async def _work(self) -> None:
+        while True:
+            message = await self._queue.get()
+            self._has_room.set()
+            OUTBOX_WORKERS_BUSY.inc()
+            try:
+                await self._process(message)
+            except Exception as e:
+                # Сообщение вернётся в очередь по истечении аренды.
+                logger.error(
+                    "Outbox message %s bookkeeping failed: %s", message.id, e
+                )
+            finally:
+                OUTBOX_WORKERS_BUSY.dec()
+
+    async def _process(self, message: OutboxMessage) -> None:
+        error = None
+        started = time.perf_counter()
+        try:
+            await self._handler.handle(message)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:_ERROR_LIMIT]
+        OUTBOX_HANDLER_DURATION.observe(time.perf_counter() - started)
+
+        if error is None:
+            await self._repository.complete(message)
+            OUTBOX_MESSAGES.labels("done").inc()
+            if message.created_at is not None:
+                lag = datetime.now(timezone.utc) - message.created_at
+                OUTBOX_DELIVERY_LAG.observe(lag.total_seconds())
+        elif message.attempts >= self._max_attempts:
+            await self._repository.dead_letter(message, error)
+            OUTBOX_MESSAGES.labels("dead_lettered").inc()
+            logger.error(
+                "Outbox message %s (%s) dead-lettered after %s attempts: %s",
+                message.id,
+                message.topic,
+                message.attempts,
+                error,
+            )
+        else:
+            await self._repository.retry(
+                message, self.retry_delay(message.attempts), error
+            )
+            OUTBOX_MESSAGES.labels("retried").inc()
+            logger.warning(
+                "Outbox message failed, will retry: %s",
+                error,
+                extra=SAMPLED,
+            )
@@ -0,0 +1,64 @@
+import time
+from typing import Callable
+
+from app.common.cache import TTLCache
+from app.entrypoints.api.schemas.user import Principal
+
+
+class PrincipalCache(TTLCache[str, Principal]):
+    """
+    Кэш аутентифицированных пользователей по subject токена (username).
+
+    Кэш локален для процесса: другие воркеры узнают об удалении или
+    деактивации пользователя не позже, чем истечёт ttl записи.
+
+    Ключи каждого пользователя хранятся в индексе user_id -> usernames,
+    который обновляется при записи и вытеснении, поэтому сброс
+    пользователя не перебирает весь кэш.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(maxsize, ttl, clock=clock)
+        self._keys_by_user: dict[int, set[str]] = {}
+
+    def set(self, key: str, value: Principal) -> None:
+        previous = self._data.get(key)
+        if previous is not None:
+            self._unindex(key, previous[1])
+        self._keys_by_user.setdefault(value.id, set()).add(key)
+        super().set(key, value)
+
+    def pop(self, key: str) -> Principal | None:
+        value = super().pop(key)
+        if value is not None:
+            self._unindex(key, value)
+        return value
+
+    def clear(self) -> None:
+        super().clear()
+        self._keys_by_user.clear()
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Удалить из кэша все записи пользователя.
+
+        :param user_id: идентификатор пользователя
+        """
+        for username in self._keys_by_user.pop(user_id, ()):
+            self._data.pop(username, None)
+
+    def _evicted(self, key: str, value: Principal) -> None:
+        self._unindex(key, value)
+
+    def _unindex(self, key: str, value: Principal) -> None:
+        keys = self._keys_by_user.get(value.id)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_user[value.id]
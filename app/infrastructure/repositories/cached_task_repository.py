@@ -0,0 +1,186 @@
+from dataclasses import replace
+from datetime import date, datetime
+from typing import AsyncIterator
+from weakref import WeakKeyDictionary
+
+from app.common.metrics import REGISTRY
+from app.common.single_flight import SingleFlight
+from app.domain.entities.task import (
+    Task,
+    TaskChangePage,
+    TaskCursor,
+    TaskFilter,
+    TaskOrdering,
+    TaskPage,
+    TaskRecord,
+    TaskStats,
+    TaskUpdateResult,
+)
+from app.domain.interfaces.task_cache import TaskCache
+from app.domain.interfaces.task_repository import TaskRepository
+from app.infrastructure.db.unit_of_work import (
+    UnitOfWork,
+    current_unit_of_work,
+)
+
+TASK_CACHE_LOOKUPS = REGISTRY.counter(
+    "task_cache_lookups_total",
+    "Task cache lookups by result (hit, miss or coalesced).",
+    labelnames=("result",),
+)
+
+# Задачи, изменённые в ещё не завершённой транзакции: их чтение внутри
+# той же транзакции идёт мимо кэша, чтобы не закэшировать незафиксированное.
+_written_in_transaction: WeakKeyDictionary[UnitOfWork, set[int]] = (
+    WeakKeyDictionary()
+)
+
+
+class CachedTaskRepository(TaskRepository):
+    """
+    Кэширующий декоратор репозитория задач для чтения по идентификатору.
+
+    get_by_id читает из кэша, а при промахе загружает задачу из
+    основного репозитория; одновременные промахи по одному id
+    объединяются в один запрос. Запись сбрасывает затронутые задачи
+    сразу и ещё раз после завершения транзакции, чтобы чтение, успевшее
+    до фиксации, не оставило в кэше старую версию. Списки, выборки и
+    выгрузка не кэшируются и идут напрямую в основной репозиторий.
+    """
+
+    def __init__(
+        self,
+        repository: TaskRepository,
+        cache: TaskCache,
+        single_flight: SingleFlight[int, Task | None],
+    ):
+        """
+        :param repository: основной репозиторий задач
+        :param cache: бэкенд кэша
+        :param single_flight: общий для всех запросов объединитель промахов
+        """
+        self._repository = repository
+        self._cache = cache
+        self._single_flight = single_flight
+
+    async def create(self, task: Task) -> Task:
+        created = await self._repository.create(task)
+        await self._invalidate([created.id])
+        return created
+
+    async def create_many(self, tasks: list[Task]) -> list[Task]:
+        created = await self._repository.create_many(tasks)
+        await self._invalidate([task.id for task in created])
+        return created
+
+    async def get_by_id(self, task_id: int) -> Task | None:
+        unit_of_work = current_unit_of_work()
+        if unit_of_work is not None and task_id in (
+            _written_in_transaction.get(unit_of_work, ())
+        ):
+            return await self._repository.get_by_id(task_id)
+
+        task = await self._cache.get(task_id)
+        if task is not None:
+            TASK_CACHE_LOOKUPS.labels("hit").inc()
+            return task
+
+        async def load() -> Task | None:
+            TASK_CACHE_LOOKUPS.labels("miss").inc()
+            loaded = await self._repository.get_by_id(task_id)
+            if loaded is not None:
+                await self._cache.set(loaded)
+            return loaded
+
+        coalesced = task_id in self._single_flight
+        task = await self._single_flight.do(task_id, load)
+        if coalesced:
+            TASK_CACHE_LOOKUPS.labels("coalesced").inc()
+        # Результат общий для всех ожидающих: каждому отдаётся своя копия.
+        return replace(task) if task is not None else None
+
+    async def get_all(self) -> list[Task]:
+        return await self._repository.get_all()
+
+    async def get_page(
+        self,
+        filters: TaskFilter,
+        limit: int,
+        cursor: TaskCursor | None = None,
+        ordering: TaskOrdering = TaskOrdering.ID,
+    ) -> TaskPage:
+        return await self._repository.get_page(
+            filters, limit, cursor=cursor, ordering=ordering
+        )
+
+    async def search(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        cursor: TaskCursor | None = None,
+    ) -> TaskPage:
+        return await self._repository.search(
+            user_id, query, limit, cursor=cursor
+        )
+
+    def stream(
+        self, filters: TaskFilter, chunk_size: int
+    ) -> AsyncIterator[list[TaskRecord]]:
+        return self._repository.stream(filters, chunk_size)
+
+    async def get_all_by_user_id(self, user_id: int) -> list[Task]:
+        return await self._repository.get_all_by_user_id(user_id)
+
+    async def get_changes(
+        self, user_id: int, since: int, limit: int
+    ) -> TaskChangePage:
+        return await self._repository.get_changes(user_id, since, limit)
+
+    async def prune_changes(self, before: datetime, limit: int) -> int:
+        return await self._repository.prune_changes(before, limit)
+
+    async def get_version(self, task_id: int) -> int | None:
+        return await self._repository.get_version(task_id)
+
+    async def get_user_tasks_version(self, user_id: int) -> int:
+        return await self._repository.get_user_tasks_version(user_id)
+
+    async def get_stats(self, user_id: int, today: date) -> TaskStats:
+        return await self._repository.get_stats(user_id, today)
+
+    async def update(
+        self, task: Task, expected_version: int | None = None
+    ) -> TaskUpdateResult:
+        await self._invalidate([task.id])
+        return await self._repository.update(
+            task, expected_version=expected_version
+        )
+
+    async def update_many(self, tasks: list[Task]) -> list[Task]:
+        await self._invalidate([task.id for task in tasks])
+        return await self._repository.update_many(tasks)
+
+    async def delete(self, task_id: int) -> Task:
+        await self._invalidate([task_id])
+        return await self._repository.delete(task_id)
+
+    async def delete_many(
+        self, task_ids: list[int], user_id: int
+    ) -> list[int]:
+        await self._invalidate(task_ids)
+        return await self._repository.delete_many(task_ids, user_id)
+
+    async def _invalidate(self, task_ids: list[int]) -> None:
+        await self._cache.delete(task_ids)
+        unit_of_work = current_unit_of_work()
+        if unit_of_work is None:
+            return
+        written = _written_in_transaction.setdefault(unit_of_work, set())
+        written.update(task_ids)
+
+        async def invalidate_after_transaction() -> None:
+            written.difference_update(task_ids)
+            await self._cache.delete(task_ids)
+
+        unit_of_work.after_transaction(invalidate_after_transaction)
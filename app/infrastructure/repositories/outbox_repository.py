@@ -0,0 +1,170 @@
+from datetime import timedelta
+from typing import Callable, AsyncContextManager
+from sqlalchemy import (
+    CTE,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.outbox import OutboxMessage, OutboxTopic
+from app.domain.interfaces.outbox import OutboxRepository
+from app.infrastructure.db.models.outbox import OutboxModel
+
+
+class SQLAlchemyOutboxRepository(OutboxRepository):
+    session_contextmanager: Callable[
+        ..., AsyncContextManager[AsyncSession]
+    ] = None
+
+    def __init__(
+        self,
+        session_contextmanager: Callable[
+            ..., AsyncContextManager[AsyncSession]
+        ],
+    ):
+        """
+        :param session_contextmanager: фабрика сеансов
+        """
+        self.session_contextmanager = session_contextmanager
+
+    async def claim(
+        self, limit: int, lease_seconds: float
+    ) -> list[OutboxMessage]:
+        """
+        Занять готовые к обработке сообщения на время аренды.
+
+        Строки выбираются SELECT ... FOR UPDATE SKIP LOCKED, поэтому
+        конкурирующие обработчики получают разные сообщения, не ожидая
+        друг друга, а тот же UPDATE переносит available_at на конец
+        аренды. Транзакция фиксируется сразу: во время обработки
+        сообщения не держат ни блокировок, ни соединения.
+
+        :param limit: максимальное количество сообщений
+        :param lease_seconds: длительность аренды в секундах
+        :return: занятые сообщения с увеличенным attempts
+        """
+        ready = (
+            select(OutboxModel.id)
+            .where(
+                OutboxModel.dead_lettered_at.is_(None),
+                OutboxModel.available_at <= func.now(),
+            )
+            .order_by(OutboxModel.available_at, OutboxModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_contextmanager() as session:
+            result = await session.execute(
+                update(OutboxModel)
+                .where(OutboxModel.id.in_(ready.scalar_subquery()))
+                .values(
+                    attempts=OutboxModel.attempts + 1,
+                    available_at=func.now() + timedelta(seconds=lease_seconds),
+                )
+                .returning(
+                    OutboxModel.id,
+                    OutboxModel.topic,
+                    OutboxModel.payload,
+                    OutboxModel.attempts,
+                    OutboxModel.created_at,
+                )
+            )
+            messages = [
+                OutboxMessage(
+                    id=id,
+                    topic=topic,
+                    payload=payload,
+                    attempts=attempts,
+                    created_at=created_at,
+                )
+                for id, topic, payload, attempts, created_at in result
+            ]
+        messages.sort(key=lambda message: message.id)
+        return messages
+
+    async def complete(self, message: OutboxMessage) -> None:
+        """
+        Удалить обработанное сообщение.
+
+        Условие по attempts не даёт удалить сообщение, которое после
+        истечения аренды уже занял другой обработчик.
+
+        :param message: сообщение из claim
+        """
+        async with self.session_contextmanager() as session:
+            await session.execute(
+                delete(OutboxModel).where(
+                    OutboxModel.id == message.id,
+                    OutboxModel.attempts == message.attempts,
+                )
+            )
+
+    async def retry(
+        self, message: OutboxMessage, delay_seconds: float, error: str
+    ) -> None:
+        """
+        Вернуть сообщение в очередь после неудачной попытки.
+
+        :param message: сообщение из claim
+        :param delay_seconds: через сколько секунд повторить
+        :param error: описание ошибки
+        """
+        async with self.session_contextmanager() as session:
+            await session.execute(
+                update(OutboxModel)
+                .where(
+                    OutboxModel.id == message.id,
+                    OutboxModel.attempts == message.attempts,
+                )
+                .values(
+                    available_at=func.now() + timedelta(seconds=delay_seconds),
+                    last_error=error,
+                )
+            )
+
+    async def dead_letter(self, message: OutboxMessage, error: str) -> None:
+        """
+        Исключить сообщение из обработки после последней попытки.
+
+        :param message: сообщение из claim
+        :param error: описание ошибки
+        """
+        async with self.session_contextmanager() as session:
+            await session.execute(
+                update(OutboxModel)
+                .where(
+                    OutboxModel.id == message.id,
+                    OutboxModel.attempts == message.attempts,
+                )
+                .values(dead_lettered_at=func.now(), last_error=error)
+            )
+
+
+def outbox_insert(changed: CTE, topic: OutboxTopic, **payload) -> CTE:
+    """
+    CTE, записывающий в outbox по сообщению на каждую строку changed.
+
+    Добавляется к изменяющему выражению (data-modifying CTE), поэтому
+    сообщение фиксируется или откатывается вместе с изменением.
+
+    :param changed: CTE изменяющего выражения с RETURNING
+    :param topic: тема сообщений
+    :param payload: ключ полезной нагрузки -> имя колонки changed
+    :return: CTE вставки в outbox
+    """
+    fields = []
+    for key, name in payload.items():
+        fields += [literal(key), changed.c[name]]
+    return (
+        insert(OutboxModel)
+        .from_select(
+            ["topic", "payload"],
+            select(literal(topic.value), func.jsonb_build_object(*fields)),
+        )
+        .cte(f"outbox_{changed.name}")
+    )
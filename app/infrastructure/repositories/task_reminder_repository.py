@@ -0,0 +1,130 @@
+from datetime import date
+from typing import Callable, AsyncContextManager
+from sqlalchemy import (
+    Date,
+    Integer,
+    column,
+    exists,
+    select,
+    tuple_,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.domain.entities.task import TaskReminder
+from app.domain.interfaces.task_reminder_repository import (
+    TaskReminderRepository,
+)
+from app.infrastructure.db.models.task import TaskModel
+from app.infrastructure.db.models.task_reminder import TaskReminderModel
+
+
+class SQLAlchemyTaskReminderRepository(TaskReminderRepository):
+    session_contextmanager: Callable[
+        ..., AsyncContextManager[AsyncSession]
+    ] = None
+
+    def __init__(
+        self,
+        session_contextmanager: Callable[
+            ..., AsyncContextManager[AsyncSession]
+        ],
+    ):
+        """
+        :param session_contextmanager: фабрика сеансов
+        """
+        self.session_contextmanager = session_contextmanager
+
+    async def get_pending(
+        self,
+        due_from: date,
+        due_to: date,
+        limit: int,
+        after: TaskReminder | None = None,
+    ) -> list[TaskReminder]:
+        """
+        Получить ещё не отправленные напоминания для задач со сроком
+        в диапазоне, упорядоченные по (due_date, task_id).
+
+        Диапазон и порядок совпадают с индексом ix_tasks_due_date_id,
+        поэтому окно читается range scan'ом, а страницы продолжаются
+        по ключу (due_date, id), без OFFSET.
+
+        :param due_from: начало диапазона сроков включительно
+        :param due_to: конец диапазона сроков включительно
+        :param limit: максимальное количество напоминаний
+        :param after: последнее напоминание предыдущей страницы
+        :return: напоминания
+        """
+        stmt = (
+            select(TaskModel.id, TaskModel.user_id, TaskModel.due_date)
+            .where(
+                TaskModel.due_date.between(due_from, due_to),
+                ~exists().where(
+                    TaskReminderModel.task_id == TaskModel.id,
+                    TaskReminderModel.due_date == TaskModel.due_date,
+                ),
+            )
+            .order_by(TaskModel.due_date, TaskModel.id)
+            .limit(limit)
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(TaskModel.due_date, TaskModel.id)
+                > tuple_(after.due_date, after.task_id)
+            )
+        async with self.session_contextmanager() as session:
+            result = await session.execute(stmt)
+            return [
+                TaskReminder(task_id=task_id, user_id=user_id, due_date=due)
+                for task_id, user_id, due in result
+            ]
+
+    async def claim(self, reminders: list[TaskReminder]) -> list[TaskReminder]:
+        """
+        Отметить напоминания отправленными и вернуть те, что удалось
+        занять.
+
+        Один INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING:
+        конкурентная вставка того же ключа ждёт фиксации первой и
+        ничего не возвращает, а соединение с tasks отбрасывает удалённые
+        задачи и задачи с другим сроком.
+
+        :param reminders: напоминания, время которых наступило
+        :return: занятые этим вызовом напоминания
+        """
+        if not reminders:
+            return []
+        batch = values(
+            column("task_id", Integer),
+            column("due_date", Date),
+            name="batch",
+        ).data(
+            [(reminder.task_id, reminder.due_date) for reminder in reminders]
+        )
+        stmt = (
+            pg_insert(TaskReminderModel)
+            .from_select(
+                ["task_id", "due_date"],
+                select(TaskModel.id, TaskModel.due_date).where(
+                    TaskModel.id == batch.c.task_id,
+                    TaskModel.due_date == batch.c.due_date,
+                ),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[
+                    TaskReminderModel.task_id,
+                    TaskReminderModel.due_date,
+                ]
+            )
+            .returning(TaskReminderModel.task_id, TaskReminderModel.due_date)
+        )
+        async with self.session_contextmanager() as session:
+            result = await session.execute(stmt)
+            claimed = set(result.all())
+        return [
+            reminder
+            for reminder in reminders
+            if (reminder.task_id, reminder.due_date) in claimed
+        ]
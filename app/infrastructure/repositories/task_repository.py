@@ -1,10 +1,68 @@
-from typing import Callable, AsyncContextManager
-from sqlalchemy import select, update, delete
+from collections import Counter
+from datetime import date, datetime
+from typing import AsyncIterator, Callable, AsyncContextManager
+from sqlalchemy import (
+    Date,
+    Float,
+    Integer,
+    Select,
+    String,
+    any_,
+    bindparam,
+    case,
+    cast,
+    column,
+    delete,
+    exists,
+    and_,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    union,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.domain.entities.task import Task
+from app.common.logs import logger
+from app.domain.entities.task import (
+    Task,
+    TaskChange,
+    TaskChangePage,
+    TaskChangesExpired,
+    TaskCursor,
+    TaskFilter,
+    TaskOrdering,
+    TaskPage,
+    TaskRecord,
+    TaskStats,
+    TaskUpdateResult,
+    TaskVersionConflict,
+    search_terms,
+)
+from app.domain.entities.outbox import OutboxTopic
 from app.domain.interfaces.task_repository import TaskRepository
+from app.infrastructure.db.models.outbox import OutboxModel
 from app.infrastructure.db.models.task import TaskModel
+from app.infrastructure.db.models.task_change import TaskChangeModel
+from app.infrastructure.db.models.task_change_horizon import (
+    TaskChangeHorizonModel,
+)
+from app.infrastructure.db.models.task_due_date_count import (
+    TaskDueDateCountModel,
+)
+from app.infrastructure.repositories.outbox_repository import outbox_insert
+
+# Пространство ключей pg_advisory_xact_lock(int, int) для журнала изменений.
+_TASK_CHANGES_LOCK_NAMESPACE = 0x7461736B
 
 
 class SQLAlchemyTaskRepository(TaskRepository):
@@ -17,34 +75,126 @@ class SQLAlchemyTaskRepository(TaskRepository):
         session_contextmanager: Callable[
             ..., AsyncContextManager[AsyncSession]
         ],
+        search_fuzzy: bool = False,
+        stats_summary: bool = False,
+        outbox: bool = False,
     ):
+        """
+        :param session_contextmanager: фабрика сеансов
+        :param search_fuzzy: добавлять к поиску нечёткое совпадение
+            заголовка по триграммам (нужно расширение pg_trgm)
+        :param stats_summary: считать статистику по сводке
+            task_due_date_counts, а не по таблице задач
+        :param outbox: записывать изменения задач в outbox в той же
+            транзакции
+        """
         self.session_contextmanager = session_contextmanager
+        self.search_fuzzy = search_fuzzy
+        self.stats_summary = stats_summary
+        self.outbox = outbox
 
     async def create(self, task: Task) -> Task:
         """
         Создать новую задачу.
 
+        INSERT ... RETURNING возвращает созданную строку тем же запросом,
+        без отдельного SELECT; запись в журнал изменений делается в том же
+        выражении через CTE.
+
         :param task: объект задачи для создания
         :return: созданная задача с присвоенным id
         :raises ValueError: если title пустой
         """
         async with self.session_contextmanager() as session:
-            db_task = TaskModel(
-                title=task.title,
-                description=task.description,
-                due_date=task.due_date,
-                user_id=task.user_id,
+            await _lock_change_log(session, [task.user_id])
+            result = await session.execute(
+                _with_change_log(
+                    insert(TaskModel)
+                    .values(
+                        title=task.title,
+                        description=task.description,
+                        due_date=task.due_date,
+                        user_id=task.user_id,
+                    )
+                    .returning(*_TASK_COLUMNS),
+                    outbox=self._outbox_topic(OutboxTopic.TASK_CREATED),
+                )
+            )
+            row = result.one()
+            return _row_to_task(row)
+
+    async def create_many(self, tasks: list[Task]) -> list[Task]:
+        """
+        Создать несколько задач одной транзакцией.
+
+        Строки вставляются многострочным INSERT ... RETURNING;
+        sort_by_parameter_order гарантирует порядок входного списка.
+        Вставка идёт через таблицу, а не через ORM-модель: ORM bulk insert
+        разбивает пакет на отдельные INSERT по набору NULL-колонок.
+
+        :param tasks: задачи для создания
+        :return: созданные задачи в порядке входного списка
+        """
+        if not tasks:
+            return []
+        async with self.session_contextmanager() as session:
+            await _lock_change_log(session, [task.user_id for task in tasks])
+            result = await session.execute(
+                insert(TaskModel.__table__).returning(
+                    *_TASK_COLUMNS, sort_by_parameter_order=True
+                ),
+                [
+                    {
+                        "title": task.title,
+                        "description": task.description,
+                        "due_date": task.due_date,
+                        "user_id": task.user_id,
+                    }
+                    for task in tasks
+                ],
             )
-            session.add(db_task)
-            await session.commit()
-            await session.refresh(db_task)
-            return Task(
-                id=db_task.id,
-                title=db_task.title,
-                description=db_task.description,
-                due_date=db_task.due_date,
-                user_id=db_task.user_id,
+            created = [_row_to_task(row) for row in result.all()]
+            await session.execute(
+                insert(TaskChangeModel).values(
+                    [
+                        {"task_id": task.id, "user_id": task.user_id}
+                        for task in created
+                    ]
+                )
             )
+            if self.outbox:
+                await session.execute(
+                    insert(OutboxModel).values(
+                        [
+                            {
+                                "topic": OutboxTopic.TASK_CREATED.value,
+                                "payload": {
+                                    "task_id": task.id,
+                                    "user_id": task.user_id,
+                                },
+                            }
+                            for task in created
+                        ]
+                    )
+                )
+            due_date_counts = Counter(
+                (task.user_id, task.due_date) for task in created
+            )
+            await session.execute(
+                _add_due_date_counts(
+                    pg_insert(TaskDueDateCountModel).values(
+                        [
+                            {
+                                "user_id": key[0],
+                                "due_date": key[1],
+                                "task_count": task_count,
+                            }
+                            for key, task_count in due_date_counts.items()
+                        ]
+                    )
+                )
+            )
+            return created
 
     async def get_by_id(self, task_id: int) -> Task | None:
         """
@@ -55,18 +205,10 @@ class SQLAlchemyTaskRepository(TaskRepository):
         """
         async with self.session_contextmanager() as session:
             result = await session.execute(
-                select(TaskModel).where(TaskModel.id == task_id)
-            )
-            db_task = result.scalar_one_or_none()
-            if db_task is None:
-                return None
-            return Task(
-                id=db_task.id,
-                title=db_task.title,
-                description=db_task.description,
-                due_date=db_task.due_date,
-                user_id=db_task.user_id,
+                select(*_TASK_COLUMNS).where(TaskModel.id == task_id)
             )
+            row = result.one_or_none()
+            return _row_to_task(row) if row is not None else None
 
     async def get_all(self) -> list[Task]:
         """
@@ -75,18 +217,157 @@ class SQLAlchemyTaskRepository(TaskRepository):
         :return: список всех задач
         """
         async with self.session_contextmanager() as session:
-            result = await session.execute(select(TaskModel))
-            db_tasks = result.scalars().all()
-            return [
-                Task(
-                    id=t.id,
-                    title=t.title,
-                    description=t.description,
-                    due_date=t.due_date,
-                    user_id=t.user_id,
+            result = await session.execute(select(*_TASK_COLUMNS))
+            return [_row_to_task(row) for row in result]
+
+    async def get_page(
+        self,
+        filters: TaskFilter,
+        limit: int,
+        cursor: TaskCursor | None = None,
+        ordering: TaskOrdering = TaskOrdering.ID,
+    ) -> TaskPage:
+        """
+        Получить страницу задач (keyset-пагинация).
+
+        Запрашивается limit + 1 строка: лишняя строка только сообщает,
+        что следующая страница существует.
+
+        :param filters: фильтры по пользователю, сроку и префиксу заголовка
+        :param limit: максимальное количество задач на странице
+        :param cursor: позиция, после которой начинается страница
+        :param ordering: порядок сортировки: по id или по (due_date, id)
+        :return: страница задач и курсор следующей страницы
+        :raises ValueError: если курсор не подходит к порядку сортировки
+        """
+        stmt = _apply_filters(select(*_TASK_COLUMNS), filters)
+        if ordering == TaskOrdering.DUE_DATE:
+            if cursor is not None:
+                if cursor.due_date is None:
+                    raise ValueError("Cursor does not match ordering")
+                stmt = stmt.where(
+                    tuple_(TaskModel.due_date, TaskModel.id)
+                    > tuple_(cursor.due_date, cursor.id)
                 )
-                for t in db_tasks
-            ]
+            stmt = stmt.order_by(TaskModel.due_date, TaskModel.id)
+        else:
+            if cursor is not None:
+                stmt = stmt.where(TaskModel.id > cursor.id)
+            stmt = stmt.order_by(TaskModel.id)
+
+        async with self.session_contextmanager() as session:
+            rows = (await session.execute(stmt.limit(limit + 1))).all()
+
+        items = [_row_to_task(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = TaskCursor(
+                id=last.id,
+                due_date=(
+                    last.due_date
+                    if ordering == TaskOrdering.DUE_DATE
+                    else None
+                ),
+            )
+        return TaskPage(items=items, next_cursor=next_cursor)
+
+    async def search(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        cursor: TaskCursor | None = None,
+    ) -> TaskPage:
+        """
+        Найти задачи пользователя полнотекстовым поиском.
+
+        Слова запроса превращаются в префиксный tsquery (слово:* & ...)
+        по GIN-индексу search_vector; ранг - ts_rank_cd. При search_fuzzy
+        к совпадениям добавляются заголовки, в которых есть фрагмент,
+        похожий на запрос по триграммам (опечатки), а к рангу - их
+        word_similarity. Ранг
+        вычисляется для всех совпадений пользователя, поэтому стоимость
+        растёт с их числом, а не с номером страницы.
+
+        :param user_id: ID пользователя
+        :param query: строка поиска
+        :param limit: максимальное количество задач на странице
+        :param cursor: позиция (rank, id), после которой начинается страница
+        :return: страница задач и курсор следующей страницы
+        :raises ValueError: если курсор получен не из поиска
+        """
+        if cursor is not None and cursor.rank is None:
+            raise ValueError("Cursor does not match ordering")
+        terms = search_terms(query)
+        if not terms:
+            return TaskPage()
+        tsquery = func.to_tsquery(
+            "simple", " & ".join(f"{term}:*" for term in terms)
+        )
+        matched = TaskModel.search_vector.op("@@")(tsquery)
+        rank = func.ts_rank_cd(TaskModel.search_vector, tsquery)
+        if self.search_fuzzy:
+            matched = or_(matched, literal(query).op("<%")(TaskModel.title))
+            rank = rank + func.word_similarity(query, TaskModel.title)
+        ranked = (
+            select(*_TASK_COLUMNS, cast(rank, Float).label("rank"))
+            .where(TaskModel.user_id == user_id, matched)
+            .subquery("ranked")
+        )
+        stmt = select(ranked).order_by(ranked.c.rank.desc(), ranked.c.id)
+        if cursor is not None:
+            stmt = stmt.where(
+                or_(
+                    ranked.c.rank < cursor.rank,
+                    and_(
+                        ranked.c.rank == cursor.rank,
+                        ranked.c.id > cursor.id,
+                    ),
+                )
+            )
+
+        async with self.session_contextmanager() as session:
+            result = await session.execute(stmt.limit(limit + 1))
+            rows = result.all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = TaskCursor(id=last.id, rank=last.rank)
+        return TaskPage(
+            items=[_row_to_task(row) for row in rows[:limit]],
+            next_cursor=next_cursor,
+        )
+
+    async def stream(
+        self, filters: TaskFilter, chunk_size: int
+    ) -> AsyncIterator[list[TaskRecord]]:
+        """
+        Потоково выгрузить задачи порциями, упорядоченными по id.
+
+        Строки читаются серверным курсором (yield_per) как кортежи колонок,
+        без ORM-объектов, поэтому потребление памяти ограничено одной
+        порцией независимо от размера таблицы. Выбираются только поля
+        TaskRecord, и запись собирается из строки сразу, без Task.
+
+        Курсор живёт, пока отправляется тело ответа, то есть после
+        фиксации транзакции запроса, поэтому выгрузка открывает свой
+        сеанс и свою транзакцию, а не продолжает сеанс UnitOfWork.
+
+        :param filters: фильтры по пользователю, сроку и префиксу заголовка
+        :param chunk_size: количество задач в одной порции
+        :return: асинхронный итератор порций записей задач
+        """
+        stmt = (
+            _apply_filters(select(*_RECORD_COLUMNS), filters)
+            .order_by(TaskModel.id)
+            .execution_options(yield_per=chunk_size)
+        )
+        async with self.session_contextmanager(detached=True) as session:
+            result = await session.stream(stmt)
+            async for rows in result.partitions():
+                yield _rows_to_records(rows)
 
     async def get_all_by_user_id(self, user_id: int) -> list[Task]:
         """
@@ -97,50 +378,655 @@ class SQLAlchemyTaskRepository(TaskRepository):
         """
         async with self.session_contextmanager() as session:
             result = await session.execute(
-                select(TaskModel).where(TaskModel.user_id == user_id)
-            )
-            db_tasks = result.scalars().all()
-            return [
-                Task(
-                    id=t.id,
-                    title=t.title,
-                    description=t.description,
-                    due_date=t.due_date,
-                    user_id=t.user_id,
-                )
-                for t in db_tasks
-            ]
+                select(*_TASK_COLUMNS).where(TaskModel.user_id == user_id)
+            )
+            return [_row_to_task(row) for row in result]
+
+    async def get_changes(
+        self, user_id: int, since: int, limit: int
+    ) -> TaskChangePage:
+        """
+        Получить изменения задач пользователя после курсора.
+
+        Журнал сворачивается до последнего seq на задачу (индекс
+        (user_id, seq)), и к нему присоединяется текущее состояние задачи:
+        если строки задачи нет или она принадлежит другому пользователю,
+        это удаление. Стоимость пропорциональна числу изменений после
+        курсора, а не числу задач пользователя.
+
+        Ненулевой курсор меньше границы очистки пользователя
+        (task_change_horizons) мог пропустить очищенное удаление.
+
+        :param user_id: идентификатор пользователя
+        :param since: курсор (seq последнего полученного изменения)
+        :param limit: максимальное количество изменений
+        :return: изменения, новый курсор и признак наличия продолжения
+        :raises TaskChangesExpired: если после курсора очищены удаления
+        """
+        latest_seq = func.max(TaskChangeModel.seq)
+        latest = (
+            select(TaskChangeModel.task_id, latest_seq.label("seq"))
+            .where(
+                TaskChangeModel.user_id == user_id,
+                TaskChangeModel.seq > since,
+            )
+            .group_by(TaskChangeModel.task_id)
+            .order_by(latest_seq)
+            .limit(limit + 1)
+            .subquery("latest")
+        )
+        stmt = (
+            select(latest.c.seq, latest.c.task_id, *_TASK_COLUMNS)
+            .outerjoin(
+                TaskModel,
+                and_(
+                    TaskModel.id == latest.c.task_id,
+                    TaskModel.user_id == user_id,
+                ),
+            )
+            .order_by(latest.c.seq)
+        )
+        async with self.session_contextmanager() as session:
+            if since > 0:
+                pruned_seq = await session.scalar(
+                    select(TaskChangeHorizonModel.pruned_seq).where(
+                        TaskChangeHorizonModel.user_id == user_id
+                    )
+                )
+                if pruned_seq is not None and since < pruned_seq:
+                    raise TaskChangesExpired(
+                        f"Cursor {since} is older than the change log"
+                    )
+            rows = (await session.execute(stmt)).all()
+
+        changes = [
+            TaskChange(
+                seq=row[0],
+                task_id=row[1],
+                task=(
+                    _row_to_task(row, start=2) if row[2] is not None else None
+                ),
+            )
+            for row in rows[:limit]
+        ]
+        return TaskChangePage(
+            changes=changes,
+            cursor=changes[-1].seq if changes else since,
+            has_more=len(rows) > limit,
+        )
+
+    async def get_version(self, task_id: int) -> int | None:
+        """
+        Получить только версию задачи: чтение по первичному ключу
+        без выборки и преобразования остальных колонок.
+
+        :param task_id: идентификатор задачи
+        :return: версия или None, если задачи нет
+        """
+        async with self.session_contextmanager() as session:
+            result = await session.execute(
+                select(TaskModel.version).where(TaskModel.id == task_id)
+            )
+            return result.scalar_one_or_none()
+
+    async def get_user_tasks_version(self, user_id: int) -> int:
+        """
+        Получить версию набора задач пользователя.
+
+        Любое изменение набора, включая перенос задачи к другому
+        пользователю, пишет в журнал строку для каждого затронутого
+        владельца, а seq одного пользователя растёт в порядке фиксации
+        (см. _lock_change_log). Поэтому версия - наибольший seq журнала
+        пользователя. Очистка удаляет только вытесненные строки и
+        tombstone; наибольший очищенный tombstone хранится в
+        task_change_horizons, так что версия не уменьшается.
+
+        :param user_id: идентификатор пользователя
+        :return: версия набора (0, если изменений не было)
+        """
+        latest_seq = (
+            select(func.max(TaskChangeModel.seq))
+            .where(TaskChangeModel.user_id == user_id)
+            .scalar_subquery()
+        )
+        pruned_seq = (
+            select(TaskChangeHorizonModel.pruned_seq)
+            .where(TaskChangeHorizonModel.user_id == user_id)
+            .scalar_subquery()
+        )
+        async with self.session_contextmanager() as session:
+            return await session.scalar(
+                select(
+                    func.greatest(
+                        func.coalesce(latest_seq, 0),
+                        func.coalesce(pruned_seq, 0),
+                    )
+                )
+            )
+
+    async def get_stats(self, user_id: int, today: date) -> TaskStats:
+        """
+        Посчитать задачи пользователя: просроченные, на сегодня и
+        предстоящие.
+
+        Один агрегат GROUP BY по корзинам срока: по таблице задач это
+        index-only scan индекса (user_id, due_date, id), по сводке
+        task_due_date_counts - чтение по строке на каждую дату
+        пользователя, независимо от числа задач.
 
-    async def update(self, task: Task) -> Task:
+        :param user_id: идентификатор пользователя
+        :param today: текущая дата пользователя
+        :return: количество задач по срокам
         """
-        Обновить задачу.
+        if self.stats_summary:
+            source = TaskDueDateCountModel
+            weight = TaskDueDateCountModel.task_count
+        else:
+            source = TaskModel
+            weight = literal(1)
+        # Корзина вычисляется в подзапросе: в GROUP BY выражение с
+        # параметром today получило бы другой номер параметра и не
+        # совпало бы с выражением в SELECT.
+        buckets = (
+            select(
+                case(
+                    (source.due_date < today, "overdue"),
+                    (source.due_date == today, "due_today"),
+                    else_="upcoming",
+                ).label("bucket"),
+                weight.label("weight"),
+            )
+            .where(source.user_id == user_id)
+            .subquery("buckets")
+        )
+        async with self.session_contextmanager() as session:
+            result = await session.execute(
+                select(buckets.c.bucket, func.sum(buckets.c.weight)).group_by(
+                    buckets.c.bucket
+                )
+            )
+            return TaskStats(
+                **{bucket: int(total) for bucket, total in result}
+            )
+
+    async def update(
+        self, task: Task, expected_version: int | None = None
+    ) -> TaskUpdateResult:
+        """
+        Обновить задачу и увеличить её версию.
+
+        С expected_version выполняется условный UPDATE ... WHERE version =
+        expected_version: оптимистичная блокировка без SELECT FOR UPDATE.
+        Отдельный запрос версии делается только при неудаче, чтобы
+        отличить отсутствующую задачу от конфликта.
 
         :param task: объект задачи с обновленными данными
-        :return: обновленная задача
-        :raises ValueError: если задача не найдена
+        :param expected_version: версия, которую видел клиент
+        :return: обновленная задача и её прежний владелец
+        :raises NoResultFound: если задача не найдена
+        :raises TaskVersionConflict: если версия задачи не совпала
         """
+        old = TaskModel.__table__.alias("old")
+        stmt = update(TaskModel).where(
+            TaskModel.id == task.id, old.c.id == TaskModel.id
+        )
+        if expected_version is not None:
+            stmt = stmt.where(TaskModel.version == expected_version)
         async with self.session_contextmanager() as session:
-            await session.execute(
-                update(TaskModel)
-                .where(TaskModel.id == task.id)
-                .values(
-                    title=task.title,
-                    description=task.description,
-                    due_date=task.due_date,
-                    user_id=task.user_id,
+            # Задача может перейти к другому пользователю: его журнал
+            # получит tombstone и тоже блокируется.
+            await _lock_change_log(session, [task.user_id], task_id=task.id)
+            result = await session.execute(
+                _with_change_log(
+                    stmt.values(
+                        title=task.title,
+                        description=task.description,
+                        due_date=task.due_date,
+                        user_id=task.user_id,
+                        version=TaskModel.version + 1,
+                    ).returning(*_TASK_COLUMNS, *_old_due_date(old)),
+                    outbox=self._outbox_topic(OutboxTopic.TASK_UPDATED),
                 )
             )
-            await session.commit()
-            return await self.get_by_id(task.id)
+            row = result.one_or_none()
+        if row is not None:
+            return TaskUpdateResult(
+                task=_row_to_task(row),
+                previous_user_id=row[len(_TASK_COLUMNS)],
+            )
+        if (
+            expected_version is not None
+            and await self.get_version(task.id) is not None
+        ):
+            raise TaskVersionConflict(
+                f"Task {task.id} version is not {expected_version}"
+            )
+        raise NoResultFound(f"Task {task.id} not found")
+
+    async def update_many(self, tasks: list[Task]) -> list[Task]:
+        """
+        Обновить несколько задач одной транзакцией.
+
+        Выполняется один UPDATE ... FROM (VALUES ...) ... RETURNING;
+        условие по user_id не даёт изменить чужие задачи.
 
-    async def delete(self, task_id: int) -> None:
+        :param tasks: задачи с обновленными данными
+        :return: обновленные задачи
+        """
+        if not tasks:
+            return []
+        batch = values(
+            column("id", Integer),
+            column("title", String),
+            column("description", String),
+            column("due_date", Date),
+            column("user_id", Integer),
+            name="batch",
+        ).data(
+            [
+                (
+                    task.id,
+                    task.title,
+                    task.description,
+                    task.due_date,
+                    task.user_id,
+                )
+                for task in tasks
+            ]
+        )
+        old = TaskModel.__table__.alias("old")
+        async with self.session_contextmanager() as session:
+            await _lock_change_log(session, [task.user_id for task in tasks])
+            result = await session.execute(
+                _with_change_log(
+                    update(TaskModel)
+                    .where(
+                        TaskModel.id == batch.c.id,
+                        TaskModel.user_id == batch.c.user_id,
+                        old.c.id == TaskModel.id,
+                    )
+                    .values(
+                        title=batch.c.title,
+                        description=batch.c.description,
+                        due_date=batch.c.due_date,
+                        version=TaskModel.version + 1,
+                    )
+                    .returning(*_TASK_COLUMNS, *_old_due_date(old)),
+                    outbox=self._outbox_topic(OutboxTopic.TASK_UPDATED),
+                )
+            )
+            rows = result.all()
+            return [_row_to_task(row) for row in rows]
+
+    async def delete(self, task_id: int) -> Task:
         """
         Удалить задачу по её идентификатору.
 
         :param task_id: идентификатор задачи
+        :return: удалённая задача
+        :raises NoResultFound: если задача не найдена
         """
         async with self.session_contextmanager() as session:
             await session.execute(
-                delete(TaskModel).where(TaskModel.id == task_id)
+                select(
+                    func.pg_advisory_xact_lock(
+                        _TASK_CHANGES_LOCK_NAMESPACE, TaskModel.user_id
+                    )
+                ).where(TaskModel.id == task_id)
+            )
+            result = await session.execute(
+                _with_change_log(
+                    delete(TaskModel)
+                    .where(TaskModel.id == task_id)
+                    .returning(*_TASK_COLUMNS),
+                    deleted=True,
+                    outbox=self._outbox_topic(OutboxTopic.TASK_DELETED),
+                )
+            )
+            row = result.first()
+            if row is None:
+                raise NoResultFound(f"Task {task_id} not found")
+            return _row_to_task(row)
+
+    async def delete_many(
+        self, task_ids: list[int], user_id: int
+    ) -> list[int]:
+        """
+        Удалить несколько задач пользователя одной транзакцией.
+
+        Список передаётся одним параметром-массивом:
+        DELETE ... WHERE id = ANY($1) RETURNING id.
+
+        :param task_ids: идентификаторы задач
+        :param user_id: идентификатор владельца задач
+        :return: идентификаторы удалённых задач
+        """
+        if not task_ids:
+            return []
+        async with self.session_contextmanager() as session:
+            await _lock_change_log(session, [user_id])
+            result = await session.execute(
+                _with_change_log(
+                    delete(TaskModel)
+                    .where(
+                        TaskModel.id
+                        == any_(
+                            bindparam(
+                                "task_ids", task_ids, type_=ARRAY(Integer)
+                            )
+                        ),
+                        TaskModel.user_id == user_id,
+                    )
+                    .returning(
+                        TaskModel.id, TaskModel.user_id, TaskModel.due_date
+                    ),
+                    deleted=True,
+                    outbox=self._outbox_topic(OutboxTopic.TASK_DELETED),
+                )
+            )
+            deleted_ids = list(result.scalars())
+            return deleted_ids
+
+    async def prune_changes(self, before: datetime, limit: int) -> int:
+        """
+        Очистить журнал изменений от записей старше before.
+
+        Удаляются записи, после которых у той же задачи и пользователя
+        есть более позднее изменение (get_changes их не читает), и
+        удаления (tombstone). Последнее изменение существующей задачи
+        остаётся, поэтому синхронизация с since=0 по-прежнему отдаёт все
+        задачи. Тем же выражением граница очистки пользователя
+        поднимается до наибольшего seq удалённого tombstone.
+
+        :param before: граница времени изменения
+        :param limit: максимальное количество удаляемых записей
+        :return: количество удалённых записей
+        """
+        later = TaskChangeModel.__table__.alias("later")
+        expired = (
+            select(TaskChangeModel.seq)
+            .where(
+                TaskChangeModel.changed_at < before,
+                or_(
+                    TaskChangeModel.deleted,
+                    exists().where(
+                        later.c.task_id == TaskChangeModel.task_id,
+                        later.c.user_id == TaskChangeModel.user_id,
+                        later.c.seq > TaskChangeModel.seq,
+                    ),
+                ),
             )
-            await session.commit()
+            .order_by(TaskChangeModel.seq)
+            .limit(limit)
+        )
+        pruned = (
+            delete(TaskChangeModel)
+            .where(TaskChangeModel.seq.in_(expired.scalar_subquery()))
+            .returning(
+                TaskChangeModel.user_id,
+                TaskChangeModel.seq,
+                TaskChangeModel.deleted,
+            )
+            .cte("pruned")
+        )
+        horizon = pg_insert(TaskChangeHorizonModel).from_select(
+            ["user_id", "pruned_seq"],
+            select(pruned.c.user_id, func.max(pruned.c.seq))
+            .where(pruned.c.deleted)
+            .group_by(pruned.c.user_id),
+        )
+        horizon = horizon.on_conflict_do_update(
+            index_elements=[TaskChangeHorizonModel.user_id],
+            set_={
+                "pruned_seq": func.greatest(
+                    TaskChangeHorizonModel.pruned_seq,
+                    horizon.excluded.pruned_seq,
+                )
+            },
+        ).cte("horizon")
+        async with self.session_contextmanager() as session:
+            return await session.scalar(
+                select(func.count()).select_from(pruned).add_cte(horizon)
+            )
+
+    def _outbox_topic(self, topic: OutboxTopic) -> OutboxTopic | None:
+        return topic if self.outbox else None
+
+    async def warm_up(self) -> None:
+        """
+        Выполнить самые частые выражения, чтобы asyncpg подготовил их
+        на текущем соединении заранее, а не на первом запросе.
+
+        Здесь же проверяется, что для search_fuzzy установлено
+        расширение pg_trgm; без него нечёткий поиск выключается, а не
+        роняет каждый запрос поиска.
+
+        Вызывается внутри UnitOfWork, которую затем откатывают.
+        Выполняются только чтения: запись ради подготовки выражения
+        брала бы блокировки журнала изменений и оставляла ошибки
+        в логах и статистике сервера.
+        """
+        if self.search_fuzzy and not await self._has_pg_trgm():
+            logger.warning(
+                "pg_trgm extension is not installed, "
+                "disabling fuzzy task search"
+            )
+            self.search_fuzzy = False
+        await self.get_by_id(0)
+        await self.get_page(TaskFilter(user_id=0), limit=1)
+        await self.get_all_by_user_id(0)
+        await self.get_version(0)
+
+    async def _has_pg_trgm(self) -> bool:
+        async with self.session_contextmanager() as session:
+            installed = await session.scalar(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            )
+        return installed is not None
+
+
+_TASK_COLUMNS = (
+    TaskModel.id,
+    TaskModel.title,
+    TaskModel.description,
+    TaskModel.due_date,
+    TaskModel.user_id,
+    TaskModel.version,
+)
+# Колонки TaskRecord для выгрузки.
+_RECORD_COLUMNS = _TASK_COLUMNS[:-1]
+
+
+def _rows_to_records(rows: list[Row]) -> list[TaskRecord]:
+    """
+    Собрать записи выгрузки из строк с колонками _RECORD_COLUMNS.
+
+    :param rows: строки результата
+    :return: записи задач
+    """
+    return [
+        {
+            "id": id,
+            "title": title,
+            "description": description,
+            "due_date": due_date,
+            "user_id": user_id,
+        }
+        for id, title, description, due_date, user_id in rows
+    ]
+
+
+def _row_to_task(row: Row, start: int = 0) -> Task:
+    """
+    Собрать задачу из строки, в которой с позиции start идут колонки
+    _TASK_COLUMNS.
+
+    Единственное место отображения строк в Task: все чтения выбирают
+    кортежи колонок, а не ORM-объекты, которым нужны identity map и
+    состояние для отслеживания изменений. Колонки берутся распаковкой
+    по позиции: доступ к Row по имени атрибута в несколько раз дороже.
+
+    :param row: строка результата
+    :param start: позиция первой колонки задачи в строке
+    :return: задача
+    """
+    id, title, description, due_date, user_id, version = row[
+        start : start + len(_TASK_COLUMNS)
+    ]
+    return Task(
+        id=id,
+        title=title,
+        description=description,
+        due_date=due_date,
+        user_id=user_id,
+        version=version,
+    )
+
+
+def _apply_filters(stmt: Select, filters: TaskFilter) -> Select:
+    if filters.user_id is not None:
+        stmt = stmt.where(TaskModel.user_id == filters.user_id)
+    if filters.due_from is not None:
+        stmt = stmt.where(TaskModel.due_date >= filters.due_from)
+    if filters.due_to is not None:
+        stmt = stmt.where(TaskModel.due_date <= filters.due_to)
+    if filters.title_prefix:
+        stmt = stmt.where(
+            TaskModel.title.startswith(filters.title_prefix, autoescape=True)
+        )
+    return stmt
+
+
+async def _lock_change_log(
+    session: AsyncSession, user_ids: list[int], task_id: int | None = None
+):
+    """
+    Взять транзакционные advisory-блокировки журнала для пользователей.
+
+    seq выдаётся при вставке, а видимым становится при фиксации, поэтому
+    без блокировки транзакция с меньшим seq может зафиксироваться позже
+    и курсор клиента её пропустит. Блокировка до конца транзакции
+    упорядочивает seq одного пользователя в порядке фиксации.
+
+    С task_id блокируется и текущий владелец задачи. Все блокировки
+    берутся одним выражением в порядке user_id, как и в остальных
+    случаях, поэтому встречные переносы задач не взаимоблокируются.
+    """
+    if task_id is not None:
+        owners = union(
+            *(
+                select(literal(user_id).label("user_id"))
+                for user_id in user_ids
+            ),
+            select(TaskModel.user_id).where(TaskModel.id == task_id),
+        ).subquery("owners")
+        await session.execute(
+            select(
+                func.pg_advisory_xact_lock(
+                    _TASK_CHANGES_LOCK_NAMESPACE, owners.c.user_id
+                )
+            ).order_by(owners.c.user_id)
+        )
+        return
+    for user_id in sorted(set(user_ids)):
+        await session.execute(
+            select(
+                func.pg_advisory_xact_lock(
+                    _TASK_CHANGES_LOCK_NAMESPACE, user_id
+                )
+            )
+        )
+
+
+def _with_change_log(
+    stmt, deleted: bool = False, outbox: OutboxTopic | None = None
+) -> Select:
+    """
+    Добавить к INSERT/UPDATE/DELETE ... RETURNING id, user_id, due_date
+    запись в журнал изменений и пересчёт сводки task_due_date_counts
+    тем же выражением (data-modifying CTE).
+
+    UPDATE дополнительно возвращает прежние user_id и due_date
+    (_old_due_date), чтобы перенести задачу между датами сводки. Если
+    задача перешла к другому пользователю, прежний владелец получает
+    в журнал удаление (tombstone).
+
+    :param stmt: изменяющее выражение с RETURNING
+    :param deleted: записать изменения как удаления
+    :param outbox: тема сообщений outbox (None - не записывать)
+    :return: SELECT, возвращающий строки RETURNING исходного выражения
+    """
+    changed = stmt.cte("changed")
+    entries = select(changed.c.id, changed.c.user_id, literal(deleted))
+    if "old_user_id" in changed.c:
+        entries = union_all(
+            entries,
+            select(changed.c.id, changed.c.old_user_id, literal(True)).where(
+                changed.c.old_user_id != changed.c.user_id
+            ),
+        )
+    logged = (
+        insert(TaskChangeModel)
+        .from_select(["task_id", "user_id", "deleted"], entries)
+        .cte("logged")
+    )
+    deltas = [
+        select(
+            changed.c.user_id,
+            changed.c.due_date,
+            literal(-1 if deleted else 1).label("delta"),
+        )
+    ]
+    if "old_due_date" in changed.c:
+        deltas.append(
+            select(changed.c.old_user_id, changed.c.old_due_date, literal(-1))
+        )
+    delta = union_all(*deltas).subquery("delta")
+    # Одна строка на дату: ON CONFLICT не может изменить строку дважды,
+    # а задача без смены даты даёт нулевую сумму и сводку не трогает.
+    total = func.sum(delta.c.delta)
+    counted = _add_due_date_counts(
+        pg_insert(TaskDueDateCountModel).from_select(
+            ["user_id", "due_date", "task_count"],
+            select(delta.c.user_id, delta.c.due_date, total)
+            .group_by(delta.c.user_id, delta.c.due_date)
+            .having(total != 0),
+        )
+    ).cte("counted")
+    stmt = select(changed).add_cte(logged).add_cte(counted)
+    if outbox is not None:
+        stmt = stmt.add_cte(
+            outbox_insert(changed, outbox, task_id="id", user_id="user_id")
+        )
+    return stmt
+
+
+def _old_due_date(old) -> tuple:
+    """
+    Колонки RETURNING с user_id и due_date задачи до UPDATE.
+
+    old - псевдоним таблицы задач в FROM того же UPDATE: он читает
+    снимок до изменения. Запись задач пользователя сериализована
+    блокировкой журнала, поэтому прежние значения актуальны.
+    """
+    return (
+        old.c.user_id.label("old_user_id"),
+        old.c.due_date.label("old_due_date"),
+    )
+
+
+def _add_due_date_counts(stmt):
+    """
+    Превратить INSERT в сводку task_due_date_counts в прибавление
+    task_count к существующей строке той же даты.
+    """
+    return stmt.on_conflict_do_update(
+        index_elements=[
+            TaskDueDateCountModel.user_id,
+            TaskDueDateCountModel.due_date,
+        ],
+        set_={
+            "task_count": TaskDueDateCountModel.task_count
+            + stmt.excluded.task_count
+        },
+    )
@@ -1,12 +1,17 @@
 from typing import Callable, AsyncContextManager
-from sqlalchemy import select, delete
+from sqlalchemy import select, insert, delete, update
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.domain.entities.outbox import OutboxTopic
 from app.domain.entities.user import User
 from app.domain.interfaces.user_repository import UserRepository
+from app.infrastructure.db.unit_of_work import current_unit_of_work
 from app.infrastructure.db.models.user import (
     UserModel,
 )
+from app.infrastructure.principal_cache import PrincipalCache
+from app.infrastructure.repositories.outbox_repository import outbox_insert
 
 
 class SQLAlchemyUserRepository(UserRepository):
@@ -19,9 +24,19 @@ class SQLAlchemyUserRepository(UserRepository):
         session_contextmanager: Callable[
             ..., AsyncContextManager[AsyncSession]
         ],
+        principal_cache: PrincipalCache | None = None,
+        outbox: bool = False,
     ):
+        """
+        :param session_contextmanager: фабрика сеансов
+        :param principal_cache: кэш пользователей аутентификации
+        :param outbox: записывать изменения пользователей в outbox
+            в той же транзакции
+        """
         super().__init__()
         self.session_contextmanager = session_contextmanager
+        self.principal_cache = principal_cache
+        self.outbox = outbox
 
     async def create(self, user: User) -> User:
         """
@@ -32,11 +47,21 @@ class SQLAlchemyUserRepository(UserRepository):
         :raises ValueError: если email или username уже существуют
         """
         async with self.session_contextmanager() as session:
-            db_user = UserModel.from_entity(user)
-            session.add(db_user)
-            await session.commit()
-            await session.refresh(db_user)
-            return db_user.to_entity()
+            result = await session.execute(
+                self._with_outbox(
+                    insert(UserModel)
+                    .values(
+                        username=user.username,
+                        email=user.email,
+                        hashed_password=user.hashed_password,
+                        is_active=user.is_active,
+                    )
+                    .returning(*_USER_COLUMNS),
+                    OutboxTopic.USER_CREATED,
+                )
+            )
+            row = result.one()
+            return _row_to_user(row)
 
     async def get_by_id(self, user_id: int) -> User | None:
         """
@@ -47,10 +72,10 @@ class SQLAlchemyUserRepository(UserRepository):
         """
         async with self.session_contextmanager() as session:
             result = await session.execute(
-                select(UserModel).where(UserModel.id == user_id)
+                select(*_USER_COLUMNS).where(UserModel.id == user_id)
             )
-            db_user = result.scalar_one_or_none()
-            return db_user.to_entity() if db_user else None
+            row = result.one_or_none()
+            return _row_to_user(row) if row is not None else None
 
     async def get_by_email(self, email: str) -> User | None:
         """
@@ -60,12 +85,11 @@ class SQLAlchemyUserRepository(UserRepository):
         :return: найденный пользователь или None
         """
         async with self.session_contextmanager() as session:
-            stmt = select(UserModel).where(UserModel.email == email)
-            result = await session.execute(stmt)
-            user_row = result.scalar_one_or_none()
-            if user_row:
-                return user_row.to_entity()
-            return None
+            result = await session.execute(
+                select(*_USER_COLUMNS).where(UserModel.email == email)
+            )
+            row = result.one_or_none()
+            return _row_to_user(row) if row is not None else None
 
     async def get_by_username(self, username: str) -> User | None:
         """
@@ -76,10 +100,28 @@ class SQLAlchemyUserRepository(UserRepository):
         """
         async with self.session_contextmanager() as session:
             result = await session.execute(
-                select(UserModel).where(UserModel.username == username)
+                select(*_USER_COLUMNS).where(UserModel.username == username)
             )
-            db_user = result.scalar_one_or_none()
-            return db_user.to_entity() if db_user else None
+            row = result.one_or_none()
+            return _row_to_user(row) if row is not None else None
+
+    async def deactivate(self, user_id: int) -> None:
+        """
+        Деактивировать пользователя.
+
+        :param user_id: идентификатор пользователя
+        """
+        async with self.session_contextmanager() as session:
+            await session.execute(
+                self._with_outbox(
+                    update(UserModel)
+                    .where(UserModel.id == user_id)
+                    .values(is_active=False)
+                    .returning(UserModel.id),
+                    OutboxTopic.USER_DEACTIVATED,
+                )
+            )
+        self._invalidate_principal(user_id)
 
     async def delete(self, user_id: int) -> None:
         """
@@ -89,6 +131,69 @@ class SQLAlchemyUserRepository(UserRepository):
         """
         async with self.session_contextmanager() as session:
             await session.execute(
-                delete(UserModel).where(UserModel.id == user_id)
+                self._with_outbox(
+                    delete(UserModel)
+                    .where(UserModel.id == user_id)
+                    .returning(UserModel.id),
+                    OutboxTopic.USER_DELETED,
+                )
             )
-            await session.commit()
+        self._invalidate_principal(user_id)
+
+    async def warm_up(self) -> None:
+        """
+        Подготовить на текущем соединении поиск по имени: он выполняется
+        при входе и при промахе кэша пользователей в аутентификации.
+        """
+        await self.get_by_username("")
+
+    def _with_outbox(self, stmt, topic: OutboxTopic):
+        """
+        Добавить к изменяющему выражению с RETURNING id запись в outbox
+        (data-modifying CTE), если outbox включён.
+        """
+        if not self.outbox:
+            return stmt
+        changed = stmt.cte("changed")
+        return select(changed).add_cte(
+            outbox_insert(changed, topic, user_id="id")
+        )
+
+    def _invalidate_principal(self, user_id: int) -> None:
+        """
+        Сбросить пользователя в кэше аутентификации после завершения
+        транзакции: сброшенная до фиксации запись может быть снова
+        заполнена конкурентной аутентификацией ещё активного
+        пользователя.
+        """
+        if self.principal_cache is None:
+            return
+        unit_of_work = current_unit_of_work()
+        if unit_of_work is None:
+            self.principal_cache.invalidate_user(user_id)
+            return
+
+        async def invalidate_after_transaction() -> None:
+            self.principal_cache.invalidate_user(user_id)
+
+        unit_of_work.after_transaction(invalidate_after_transaction)
+
+
+_USER_COLUMNS = (
+    UserModel.id,
+    UserModel.username,
+    UserModel.email,
+    UserModel.hashed_password,
+    UserModel.is_active,
+)
+
+
+def _row_to_user(row: Row) -> User:
+    id, username, email, hashed_password, is_active = row
+    return User(
+        id=id,
+        username=username,
+        email=email,
+        hashed_password=hashed_password,
+        is_active=is_active,
+    )
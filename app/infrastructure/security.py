@@ -1,13 +1,48 @@
+import asyncio
+import hashlib
 import os
+import time
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterator
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from dotenv import load_dotenv
-from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
+
+from app.common.cache import TTLCache
+from app.common.metrics import REGISTRY
+from app.domain.interfaces.password_hasher import PasswordHasher
 
 load_dotenv()
 
+PASSWORD_HASH_SECONDS = REGISTRY.counter(
+    "password_hash_seconds_total",
+    "Time spent inside bcrypt by operation, excluding queueing.",
+    labelnames=("operation",),
+)
+PASSWORD_HASH_OPERATIONS = REGISTRY.counter(
+    "password_hash_operations_total",
+    "Completed bcrypt operations.",
+    labelnames=("operation",),
+)
+PASSWORD_HASH_REJECTED = REGISTRY.counter(
+    "password_hash_rejected_total",
+    "bcrypt operations rejected because the hashing pool was saturated.",
+)
+JWT_DECODE = REGISTRY.counter(
+    "jwt_decode_total",
+    "Access token verifications by result (ok, cached or invalid).",
+    labelnames=("result",),
+)
+JWT_DECODE_SECONDS = REGISTRY.counter(
+    "jwt_decode_seconds_total",
+    "Time spent decoding and verifying access tokens.",
+)
+
 SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(
@@ -25,6 +60,96 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasherBusyError(Exception):
+    """
+    Очередь пула хеширования паролей заполнена.
+    """
+
+
+class PooledPasswordHasher(PasswordHasher):
+    """
+    Хеширование и проверка паролей bcrypt в пуле потоков или процессов.
+
+    bcrypt занимает CPU на 100-300 мс, поэтому вызов из event loop
+    останавливает обработку всех остальных запросов. Количество
+    одновременно принятых операций ограничено: при переполнении очереди
+    сразу выбрасывается PasswordHasherBusyError, а не копится задержка.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 64,
+        use_processes: bool = False,
+    ):
+        """
+        :param max_workers: количество потоков или процессов пула
+        :param max_pending: сколько операций может ждать свободного воркера
+        :param use_processes: использовать процессы вместо потоков
+        """
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_pending
+        self.in_flight = 0
+        self.rejected = 0
+        self._executor: Executor = (
+            ProcessPoolExecutor(max_workers=max_workers)
+            if use_processes
+            else ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="bcrypt"
+            )
+        )
+
+    async def hash(self, password: str) -> str:
+        return await self._run("hash", get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(
+            "verify", verify_password, plain_password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(
+        self, operation: str, func: Callable[..., Any], *args: Any
+    ) -> Any:
+        if self.in_flight >= self.capacity:
+            self.rejected += 1
+            PASSWORD_HASH_REJECTED.inc()
+            raise PasswordHasherBusyError("Password hashing pool is saturated")
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(
+                self._executor, _timed, func, *args
+            )
+        finally:
+            self.in_flight -= 1
+        PASSWORD_HASH_SECONDS.labels(operation).inc(elapsed)
+        PASSWORD_HASH_OPERATIONS.labels(operation).inc()
+        return result
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    # Время замеряется в воркере, чтобы не учитывать ожидание в очереди;
+    # функция модульная, поэтому сериализуется и для пула процессов.
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def init_password_hasher(
+    max_workers: int, max_pending: int, use_processes: bool
+) -> Iterator[PooledPasswordHasher]:
+    hasher = PooledPasswordHasher(
+        max_workers=max_workers,
+        max_pending=max_pending,
+        use_processes=use_processes,
+    )
+    yield hasher
+    hasher.shutdown()
+
+
 def create_access_token(
     data: dict, expires_delta: timedelta | None = None
 ) -> str:
@@ -41,23 +166,59 @@ def create_access_token(
 
 
 def decode_access_token(token: str) -> dict:
+    started = time.perf_counter()
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        JWT_DECODE.labels("ok").inc()
         return payload
     except JWTError:
+        JWT_DECODE.labels("invalid").inc()
         return None
+    finally:
+        JWT_DECODE_SECONDS.inc(time.perf_counter() - started)
 
 
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
+class AccessTokenVerifier:
+    """
+    Проверка access-токенов с кэшем уже проверенных claims.
 
+    Клиент присылает один и тот же токен в каждом запросе, поэтому
+    разбор и проверка подписи нужны только при первом предъявлении.
+    Ключ кэша - SHA-256 токена, чтобы не держать сами токены в памяти.
+    Запись живёт не дольше ttl и не дольше exp токена; недействительные
+    токены не кэшируются.
+    """
 
-def get_current_user(token: str = Depends(oauth2_scheme)) -> dict:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    payload = decode_access_token(token)
-    if payload is None:
-        raise credentials_exception
-    return payload
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        :param maxsize: максимальное количество токенов в кэше
+        :param ttl: время жизни записи в секундах
+        :param clock: источник времени для сравнения с exp
+        """
+        self._cache: TTLCache[bytes, dict] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._clock = clock
+
+    def verify(self, token: str) -> dict | None:
+        """
+        :param token: access-токен
+        :return: claims токена или None, если он недействителен;
+            возвращаемый словарь общий для всех запросов с этим токеном
+        """
+        digest = hashlib.sha256(token.encode()).digest()
+        claims = self._cache.get(digest)
+        if claims is not None:
+            if claims["exp"] > self._clock():
+                JWT_DECODE.labels("cached").inc()
+                return claims
+            self._cache.pop(digest)
+            JWT_DECODE.labels("invalid").inc()
+            return None
+        claims = decode_access_token(token)
+        if claims is not None and "exp" in claims:
+            self._cache.set(digest, claims)
+        return claims
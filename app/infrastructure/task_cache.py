@@ -0,0 +1,108 @@
+import json
+from dataclasses import asdict, replace
+from datetime import date
+from typing import Any
+
+from app.common.cache import TTLCache
+from app.common.logs import logger
+from app.domain.entities.task import Task
+from app.domain.interfaces.task_cache import TaskCache
+
+
+class InMemoryTaskCache(TaskCache):
+    """
+    Кэш задач в памяти процесса: LRU с временем жизни записей.
+
+    Каждый воркер держит свою копию, поэтому изменения, сделанные другим
+    процессом, становятся видны не позже чем через ttl.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        """
+        :param maxsize: максимальное количество задач в кэше
+        :param ttl: время жизни записи в секундах
+        """
+        self._cache: TTLCache[int, Task] = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, task_id: int) -> Task | None:
+        task = self._cache.get(task_id)
+        return replace(task) if task is not None else None
+
+    async def set(self, task: Task) -> None:
+        self._cache.set(task.id, replace(task))
+
+    async def delete(self, task_ids: list[int]) -> None:
+        for task_id in task_ids:
+            self._cache.pop(task_id)
+
+
+class RedisTaskCache(TaskCache):
+    """
+    Кэш задач в Redis или совместимом хранилище, общий для всех воркеров.
+
+    Нужны только команды GET, SET с PX и DELETE. Ошибки хранилища не
+    прерывают запрос: чтение и запись считаются промахом.
+    """
+
+    def __init__(self, client: Any, ttl: float, prefix: str = "task:"):
+        """
+        :param client: асинхронный клиент, совместимый с redis.asyncio
+        :param ttl: время жизни записи в секундах
+        :param prefix: префикс ключей
+        """
+        self._client = client
+        self._ttl_ms = int(ttl * 1000)
+        self._prefix = prefix
+
+    def _key(self, task_id: int) -> str:
+        return f"{self._prefix}{task_id}"
+
+    async def get(self, task_id: int) -> Task | None:
+        try:
+            raw = await self._client.get(self._key(task_id))
+        except Exception as e:
+            logger.warning("Task cache read failed: %s", e)
+            return None
+        return _decode_task(raw) if raw is not None else None
+
+    async def set(self, task: Task) -> None:
+        try:
+            await self._client.set(
+                self._key(task.id), _encode_task(task), px=self._ttl_ms
+            )
+        except Exception as e:
+            logger.warning("Task cache write failed: %s", e)
+
+    async def delete(self, task_ids: list[int]) -> None:
+        if not task_ids:
+            return
+        try:
+            await self._client.delete(*(self._key(i) for i in task_ids))
+        except Exception as e:
+            logger.error("Task cache invalidation failed: %s", e)
+
+
+def create_redis_client(url: str) -> Any:
+    """
+    Создать клиент redis.asyncio.
+
+    Пакет redis нужен только для бэкенда кэша redis и не входит
+    в базовые зависимости.
+
+    :param url: адрес в формате redis://host:port/db
+    """
+    from redis.asyncio import from_url
+
+    return from_url(url)
+
+
+def _encode_task(task: Task) -> str:
+    data = asdict(task)
+    data["due_date"] = task.due_date.isoformat()
+    return json.dumps(data)
+
+
+def _decode_task(raw: str | bytes) -> Task:
+    data = json.loads(raw)
+    data["due_date"] = date.fromisoformat(data["due_date"])
+    return Task(**data)
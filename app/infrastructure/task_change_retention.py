@@ -0,0 +1,79 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from app.common.logs import logger
+from app.common.metrics import REGISTRY
+from app.domain.interfaces.task_repository import TaskRepository
+
+TASK_CHANGES_PRUNED = REGISTRY.counter(
+    "task_changes_pruned_total",
+    "Task change log rows removed by retention.",
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TaskChangePruner:
+    """
+    Периодическая очистка журнала изменений задач старше retention.
+
+    Каждый проход удаляет записи пакетами по batch_size, пока очередной
+    пакет не окажется неполным, и спит interval секунд. Очистка
+    идемпотентна, поэтому может работать в каждом воркере: конкурентные
+    проходы просто удалят меньше.
+    """
+
+    def __init__(
+        self,
+        repository: TaskRepository,
+        retention_seconds: float,
+        interval_seconds: float = 3600.0,
+        batch_size: int = 10000,
+        clock: Callable[[], datetime] = _utcnow,
+    ):
+        """
+        :param repository: репозиторий задач
+        :param retention_seconds: сколько секунд хранить удаления
+            и вытесненные изменения
+        :param interval_seconds: пауза между проходами в секундах
+        :param batch_size: максимальный размер одного удаления
+        :param clock: источник текущего времени (с часовым поясом)
+        """
+        self._repository = repository
+        self._retention = timedelta(seconds=retention_seconds)
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._clock = clock
+
+    async def run(self) -> None:
+        """
+        Работать до отмены задачи; ошибки базы повторяются в следующем
+        проходе.
+        """
+        while True:
+            try:
+                await self.prune()
+            except Exception as e:
+                logger.warning("Task change log pruning failed: %s", e)
+            await asyncio.sleep(self._interval)
+
+    async def prune(self) -> int:
+        """
+        :return: количество удалённых записей журнала
+        """
+        before = self._clock() - self._retention
+        total = 0
+        while True:
+            pruned = await self._repository.prune_changes(
+                before, self._batch_size
+            )
+            total += pruned
+            TASK_CHANGES_PRUNED.inc(pruned)
+            if pruned < self._batch_size:
+                break
+        if total:
+            logger.info("Pruned %s task change log rows", total)
+        return total
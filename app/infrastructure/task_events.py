@@ -0,0 +1,331 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from dataclasses import asdict
+from datetime import date
+from typing import AsyncIterator
+
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.common.logs import logger
+from app.common.metrics import REGISTRY
+from app.domain.entities.task import Task, TaskEvent, TaskEventType
+from app.domain.interfaces.task_events import TaskEventPublisher
+from app.infrastructure.db.unit_of_work import current_unit_of_work
+
+TASK_EVENTS_PUBLISHED = REGISTRY.counter(
+    "task_events_published_total",
+    "Task change events published by type.",
+    labelnames=("type",),
+)
+TASK_EVENT_SUBSCRIBERS = REGISTRY.gauge(
+    "task_event_subscribers",
+    "Open task event subscriptions in this process.",
+)
+TASK_EVENT_SUBSCRIPTIONS_DROPPED = REGISTRY.counter(
+    "task_event_subscriptions_dropped_total",
+    "Subscriptions closed because their queue overflowed.",
+)
+
+# Предел полезной нагрузки NOTIFY в PostgreSQL - 8000 байт.
+_NOTIFY_PAYLOAD_LIMIT = 7900
+
+
+class TaskEventSubscription:
+    """
+    Подписка одного соединения на события задач пользователя.
+
+    Очередь ограничена: если клиент не успевает читать, подписка
+    закрывается с overflowed=True вместо того, чтобы копить память
+    или молча терять события. Клиенту нужно переподключиться
+    и догнать пропущенное через журнал изменений.
+    """
+
+    def __init__(self, user_id: int, queue_size: int):
+        """
+        :param user_id: пользователь, чьи события доставляются
+        :param queue_size: сколько событий может ждать чтения
+        """
+        self.user_id = user_id
+        self.overflowed = False
+        self._queue: asyncio.Queue[TaskEvent | None] = asyncio.Queue(
+            queue_size
+        )
+
+    async def get(self, timeout: float | None = None) -> TaskEvent | None:
+        """
+        Дождаться следующего события.
+
+        :param timeout: сколько секунд ждать (None - без ограничения)
+        :return: событие или None, если подписка закрыта
+        :raises asyncio.TimeoutError: если событий не было за timeout
+        """
+        return await asyncio.wait_for(self._queue.get(), timeout)
+
+    def _offer(self, event: TaskEvent) -> bool:
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            return False
+        return True
+
+    def _close(self, overflowed: bool = False) -> None:
+        self.overflowed = overflowed
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+
+class TaskEventBackend(ABC):
+    """
+    Транспорт событий между процессами.
+
+    Бэкенд доставляет опубликованное событие в hub.dispatch каждого
+    процесса, подписанного на канал, включая публикующий.
+    """
+
+    @abstractmethod
+    async def start(self, hub: "TaskEventHub") -> None:
+        """
+        Подключиться к транспорту; повторный вызов ничего не делает.
+
+        :param hub: получатель событий
+        """
+        pass
+
+    @abstractmethod
+    async def publish(self, event: TaskEvent) -> None:
+        pass
+
+    @abstractmethod
+    async def stop(self) -> None:
+        pass
+
+
+class InProcessTaskEventBackend(TaskEventBackend):
+    """
+    Доставка событий только подписчикам этого процесса.
+    """
+
+    def __init__(self):
+        self._hub: TaskEventHub | None = None
+
+    async def start(self, hub: "TaskEventHub") -> None:
+        self._hub = hub
+
+    async def publish(self, event: TaskEvent) -> None:
+        if self._hub is not None:
+            self._hub.dispatch(event)
+
+    async def stop(self) -> None:
+        self._hub = None
+
+
+class PostgresTaskEventBackend(TaskEventBackend):
+    """
+    Доставка событий всем воркерам через LISTEN/NOTIFY PostgreSQL.
+
+    Каждый процесс держит одно отдельное от пула соединение: на нём
+    слушается канал и через него же отправляются уведомления. Если
+    соединение обрывается, события за время обрыва теряются, поэтому
+    все подписки процесса закрываются как переполненные.
+    """
+
+    def __init__(self, dsn: str, channel: str = "task_events"):
+        """
+        :param dsn: строка подключения SQLAlchemy или asyncpg
+        :param channel: имя канала NOTIFY
+        """
+        self._dsn = (
+            make_url(dsn)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._channel = channel
+        self._connection: asyncpg.Connection | None = None
+        self._hub: TaskEventHub | None = None
+        self._lock = asyncio.Lock()
+
+    async def start(self, hub: "TaskEventHub") -> None:
+        self._hub = hub
+        async with self._lock:
+            await self._connect()
+
+    async def publish(self, event: TaskEvent) -> None:
+        async with self._lock:
+            await self._connect()
+            await self._connection.execute(
+                "SELECT pg_notify($1, $2)",
+                self._channel,
+                _encode_event(event, _NOTIFY_PAYLOAD_LIMIT),
+            )
+
+    async def stop(self) -> None:
+        async with self._lock:
+            connection, self._connection = self._connection, None
+            if connection is not None:
+                await connection.close()
+
+    async def _connect(self) -> None:
+        if self._connection is not None:
+            return
+        connection = await asyncpg.connect(self._dsn)
+        await connection.add_listener(self._channel, self._on_notify)
+        connection.add_termination_listener(self._on_terminate)
+        self._connection = connection
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            event = _decode_event(payload)
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Malformed task event payload: %s", e)
+            return
+        self._hub.dispatch(event)
+
+    def _on_terminate(self, connection) -> None:
+        if connection is not self._connection:
+            return
+        logger.error("Task event connection lost, dropping subscriptions")
+        self._connection = None
+        self._hub.reset()
+
+
+class TaskEventHub(TaskEventPublisher):
+    """
+    Раздача событий задач подписчикам процесса.
+
+    Публикация внутри UnitOfWork откладывается до фиксации транзакции.
+    Ошибки транспорта не прерывают запрос, изменивший задачу: клиенты
+    восстанавливают пропущенное по журналу изменений.
+    """
+
+    def __init__(self, backend: TaskEventBackend, queue_size: int = 100):
+        """
+        :param backend: транспорт событий
+        :param queue_size: размер очереди одной подписки
+        """
+        self._backend = backend
+        self._queue_size = queue_size
+        self._subscriptions: dict[int, set[TaskEventSubscription]] = {}
+        TASK_EVENT_SUBSCRIBERS.set_function(self.subscriber_count)
+
+    def subscriber_count(self) -> int:
+        return sum(len(subs) for subs in self._subscriptions.values())
+
+    async def publish(self, event: TaskEvent) -> None:
+        unit_of_work = current_unit_of_work()
+        if unit_of_work is not None:
+
+            async def publish_after_commit() -> None:
+                await self._publish(event)
+
+            unit_of_work.after_commit(publish_after_commit)
+            return
+        await self._publish(event)
+
+    @asynccontextmanager
+    async def subscribe(
+        self, user_id: int
+    ) -> AsyncIterator[TaskEventSubscription]:
+        """
+        Подписаться на события задач пользователя на время блока.
+
+        :param user_id: ID пользователя
+        :return: подписка
+        """
+        await self._backend.start(self)
+        subscription = TaskEventSubscription(user_id, self._queue_size)
+        self._subscriptions.setdefault(user_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._remove(subscription)
+
+    def dispatch(self, event: TaskEvent) -> None:
+        """
+        Положить событие в очереди подписчиков его владельца.
+
+        Вызывается бэкендом; переполненные подписки закрываются.
+
+        :param event: событие
+        """
+        for subscription in list(self._subscriptions.get(event.user_id, ())):
+            if not subscription._offer(event):
+                TASK_EVENT_SUBSCRIPTIONS_DROPPED.inc()
+                logger.warning(
+                    "Dropping slow task event subscriber: user_id=%s",
+                    event.user_id,
+                )
+                subscription._close(overflowed=True)
+                self._remove(subscription)
+
+    def reset(self) -> None:
+        """
+        Закрыть все подписки как переполненные после потери событий.
+        """
+        self._close_all(overflowed=True)
+
+    async def close(self) -> None:
+        """
+        Завершить все подписки и отключиться от транспорта.
+        """
+        self._close_all(overflowed=False)
+        await self._backend.stop()
+
+    async def _publish(self, event: TaskEvent) -> None:
+        try:
+            await self._backend.start(self)
+            await self._backend.publish(event)
+        except Exception as e:
+            logger.error("Task event publish failed: %s", e)
+            return
+        TASK_EVENTS_PUBLISHED.labels(event.type.value).inc()
+
+    def _remove(self, subscription: TaskEventSubscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is None:
+            return
+        subscriptions.discard(subscription)
+        if not subscriptions:
+            del self._subscriptions[subscription.user_id]
+
+    def _close_all(self, overflowed: bool) -> None:
+        subscriptions, self._subscriptions = self._subscriptions, {}
+        for user_subscriptions in subscriptions.values():
+            for subscription in user_subscriptions:
+                subscription._close(overflowed=overflowed)
+
+
+def _encode_event(event: TaskEvent, limit: int) -> str:
+    data = {
+        "type": event.type.value,
+        "task_id": event.task_id,
+        "user_id": event.user_id,
+        "task": None,
+    }
+    if event.task is not None:
+        task = asdict(event.task)
+        task["due_date"] = event.task.due_date.isoformat()
+        data["task"] = task
+        payload = json.dumps(data)
+        if len(payload.encode()) <= limit:
+            return payload
+        # Задача не помещается в уведомление: клиент запросит её по id.
+        data["task"] = None
+    return json.dumps(data)
+
+
+def _decode_event(payload: str) -> TaskEvent:
+    data = json.loads(payload)
+    task = data["task"]
+    if task is not None:
+        task["due_date"] = date.fromisoformat(task["due_date"])
+        task = Task(**task)
+    return TaskEvent(
+        type=TaskEventType(data["type"]),
+        task_id=data["task_id"],
+        user_id=data["user_id"],
+        task=task,
+    )
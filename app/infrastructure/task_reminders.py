@@ -0,0 +1,198 @@
+import asyncio
+import heapq
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable
+
+from app.common.logs import logger
+from app.common.metrics import REGISTRY
+from app.domain.entities.task import TaskEvent, TaskEventType, TaskReminder
+from app.domain.interfaces.task_events import TaskEventPublisher
+from app.domain.interfaces.task_reminder_repository import (
+    TaskReminderRepository,
+)
+
+TASK_REMINDERS_FIRED = REGISTRY.counter(
+    "task_reminders_fired_total",
+    "Task due date reminders claimed and published by this process.",
+)
+TASK_REMINDERS_SKIPPED = REGISTRY.counter(
+    "task_reminders_skipped_total",
+    "Due reminders not fired here: claimed by another worker, "
+    "or the task was deleted or rescheduled.",
+)
+TASK_REMINDER_LAG = REGISTRY.histogram(
+    "task_reminder_lag_seconds",
+    "Delay between a reminder becoming due and its publication.",
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0),
+)
+TASK_REMINDER_QUEUE_SIZE = REGISTRY.gauge(
+    "task_reminder_queue_size",
+    "Reminders loaded into the scheduler heap and not yet due.",
+)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TaskReminderScheduler:
+    """
+    Фоновая отправка напоминаний о приближении срока задач.
+
+    Ближайшие напоминания держатся в куче, упорядоченной по времени
+    отправки, и подгружаются окнами по window секунд одним диапазонным
+    запросом по индексу (due_date, id); таблица задач не сканируется
+    периодически, а между окнами планировщик спит до ближайшего
+    напоминания. Задача, созданная или перенесённая внутри уже
+    загруженного окна, попадёт в кучу со следующим окном.
+
+    Время напоминания - начало дня срока (UTC) минус lead. Задачи со
+    сроком в прошлом не напоминаются, а пропущенные, пока планировщик
+    не работал, отправляются сразу.
+
+    Планировщик запускается в каждом воркере: напоминание занимается
+    в базе (TaskReminderRepository.claim) до публикации, и его
+    публикует только занявший воркер. Публикация идёт после фиксации
+    занятия, поэтому при падении процесса между ними напоминание
+    теряется, но не дублируется.
+    """
+
+    def __init__(
+        self,
+        repository: TaskReminderRepository,
+        publisher: TaskEventPublisher,
+        lead_seconds: float = 86400.0,
+        window_seconds: float = 300.0,
+        batch_size: int = 1000,
+        clock: Callable[[], datetime] = _utcnow,
+    ):
+        """
+        :param repository: репозиторий напоминаний
+        :param publisher: публикатор событий задач
+        :param lead_seconds: за сколько секунд до начала дня срока
+            отправлять напоминание
+        :param window_seconds: на сколько секунд вперёд загружать кучу
+        :param batch_size: размер страницы загрузки и пакета занятия
+        :param clock: источник текущего времени (с часовым поясом)
+        """
+        self._repository = repository
+        self._publisher = publisher
+        self._lead = timedelta(seconds=lead_seconds)
+        self._window = timedelta(seconds=window_seconds)
+        self._batch_size = batch_size
+        self._clock = clock
+        # (время напоминания, task_id, напоминание, время готовности)
+        self._heap: list[tuple[datetime, int, TaskReminder, datetime]] = []
+        self._scheduled: set[tuple[int, date]] = set()
+        self._horizon: datetime | None = None
+        TASK_REMINDER_QUEUE_SIZE.set_function(self.queue_size)
+
+    def queue_size(self) -> int:
+        return len(self._heap)
+
+    def remind_at(self, due_date: date) -> datetime:
+        """
+        :param due_date: срок задачи
+        :return: время отправки напоминания
+        """
+        return datetime.combine(due_date, time.min, timezone.utc) - self._lead
+
+    async def run(self) -> None:
+        """
+        Работать до отмены задачи; ошибки базы повторяются с паузой.
+        """
+        delay = 0.5
+        while True:
+            try:
+                timeout = await self.tick()
+                delay = 0.5
+            except Exception as e:
+                logger.warning("Task reminder scheduler failed: %s", e)
+                timeout = delay
+                delay = min(delay * 2, 60.0)
+            await asyncio.sleep(timeout)
+
+    async def tick(self) -> float:
+        """
+        Загрузить следующее окно, если текущее истекло, и отправить
+        наступившие напоминания.
+
+        :return: сколько секунд можно спать до следующего вызова
+        """
+        now = self._clock()
+        if self._horizon is None or now >= self._horizon:
+            await self._refill(now)
+        await self._fire(now)
+        wake_at = self._horizon
+        if self._heap:
+            wake_at = min(wake_at, self._heap[0][0])
+        return max((wake_at - self._clock()).total_seconds(), 0.0)
+
+    async def _refill(self, now: datetime) -> None:
+        horizon = now + self._window
+        due_from = now.date()
+        due_to = (horizon + self._lead).date()
+        after = None
+        while True:
+            reminders = await self._repository.get_pending(
+                due_from, due_to, self._batch_size, after=after
+            )
+            for reminder in reminders:
+                self._schedule(reminder, now, horizon)
+            if len(reminders) < self._batch_size:
+                break
+            after = reminders[-1]
+        self._horizon = horizon
+
+    def _schedule(
+        self, reminder: TaskReminder, now: datetime, horizon: datetime
+    ) -> None:
+        key = (reminder.task_id, reminder.due_date)
+        remind_at = self.remind_at(reminder.due_date)
+        if key in self._scheduled or remind_at >= horizon:
+            return
+        self._scheduled.add(key)
+        # Задержка считается от момента, когда напоминание могло быть
+        # отправлено: для догоняемых напоминаний - от загрузки.
+        ready_at = max(remind_at, now)
+        heapq.heappush(
+            self._heap, (remind_at, reminder.task_id, reminder, ready_at)
+        )
+
+    async def _fire(self, now: datetime) -> None:
+        while self._heap and self._heap[0][0] <= now:
+            batch = []
+            while (
+                self._heap
+                and self._heap[0][0] <= now
+                and len(batch) < self._batch_size
+            ):
+                batch.append(heapq.heappop(self._heap))
+            try:
+                claimed = await self._repository.claim(
+                    [entry[2] for entry in batch]
+                )
+            except Exception:
+                for entry in batch:
+                    heapq.heappush(self._heap, entry)
+                raise
+            claimed_keys = {
+                (reminder.task_id, reminder.due_date) for reminder in claimed
+            }
+            for _, _, reminder, ready_at in batch:
+                key = (reminder.task_id, reminder.due_date)
+                self._scheduled.discard(key)
+                if key not in claimed_keys:
+                    TASK_REMINDERS_SKIPPED.inc()
+                    continue
+                await self._publisher.publish(
+                    TaskEvent(
+                        type=TaskEventType.REMINDER,
+                        task_id=reminder.task_id,
+                        user_id=reminder.user_id,
+                    )
+                )
+                TASK_REMINDERS_FIRED.inc()
+                TASK_REMINDER_LAG.observe(
+                    (self._clock() - ready_at).total_seconds()
+                )
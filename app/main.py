@@ -1,53 +1,158 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from typing import Awaitable, Callable
 
+from app.common.logs import logger
+from app.config import settings
 from app.container import Container
+from app.infrastructure.db.base import Database
 
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse, JSONResponse
 from starlette.responses import RedirectResponse
 
+from app.entrypoints.api.middleware import (
+    REQUEST_ID_HEADER,
+    MetricsMiddleware,
+    RequestIdMiddleware,
+    UnitOfWorkMiddleware,
+)
 from app.entrypoints.api.routes.users import router as users_router
-from app.entrypoints.api.routes.tasks import router as tasks_router
+from app.entrypoints.api.routes.tasks import (
+    ETAG_HEADER,
+    NEXT_CURSOR_HEADER,
+    router as tasks_router,
+)
 from app.entrypoints.api.routes.auth import router as auth_router
+from app.entrypoints.api.routes.metrics import router as metrics_router
+from app.entrypoints.api.routes.health import router as health_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    container = Container()
-    container.wire(
-        modules=[
-            "app.entrypoints.api.routes.users",
-            "app.entrypoints.api.routes.tasks",
-            "app.entrypoints.api.routes.auth",
-        ]
+    container: Container = app.container
+    # Движок и пул создаются здесь, уже в процессе воркера.
+    database = container.db()
+    app.state.ready = False
+    warm_up = asyncio.create_task(
+        _warm_up(app, database, _hot_statements(container))
     )
-    app.container = container
+    background = []
+    if settings.task_reminders_enabled:
+        background.append(
+            asyncio.create_task(container.task_reminder_scheduler().run())
+        )
+    if settings.task_changes_retention_days > 0:
+        background.append(
+            asyncio.create_task(container.task_change_pruner().run())
+        )
+    if settings.outbox_enabled and settings.outbox_concurrency > 0:
+        background.append(
+            asyncio.create_task(container.outbox_worker_pool().run())
+        )
     yield
+    app.state.ready = False
+    warm_up.cancel()
+    for task in background:
+        task.cancel()
+        # Дождаться выхода из запроса к базе до закрытия пула.
+        with suppress(asyncio.CancelledError):
+            await task
+    await container.task_event_hub().close()
+    container.shutdown_resources()
+    await database.dispose()
+    # Сервисы держат ссылки на закрытые ресурсы (пул хеширования паролей).
+    container.reset_singletons()
+
+
+async def _warm_up(
+    app: FastAPI,
+    database: Database,
+    prepare: Callable[[], Awaitable[None]],
+) -> None:
+    """
+    Прогреть пул соединений и только после этого объявить готовность.
+
+    Ошибка подключения не останавливает воркер: прогрев повторяется
+    до db_warm_up_max_attempts раз, а /health/ready отвечает 503, пока
+    база недоступна. Медленный прогрев ограничен
+    db_warm_up_timeout_seconds. В обоих случаях воркер затем
+    объявляется готовым с непрогретым пулом, как без прогрева вовсе.
+    """
+    delay = 0.5
+    for attempt in range(1, settings.db_warm_up_max_attempts + 1):
+        try:
+            await asyncio.wait_for(
+                database.warm_up(settings.db_warm_up_connections, prepare),
+                settings.db_warm_up_timeout_seconds,
+            )
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Database warm-up timed out after %ss, "
+                "continuing with a cold pool",
+                settings.db_warm_up_timeout_seconds,
+            )
+        except Exception as e:
+            if attempt < settings.db_warm_up_max_attempts:
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 10.0)
+                continue
+            logger.error(
+                "Database warm-up failed after %s attempts, "
+                "continuing with a cold pool: %s",
+                attempt,
+                e,
+            )
+        break
+    app.state.ready = True
+
+
+def _hot_statements(container: Container) -> Callable[[], Awaitable[None]]:
+    """
+    Частые выражения, которые подготавливаются на каждом соединении
+    при прогреве: задача и её версия по id, задачи пользователя
+    и пользователь по имени.
+    """
+
+    async def prepare() -> None:
+        await container.user_repository().warm_up()
+        await container.sql_task_repository().warm_up()
+
+    return prepare
 
 
 app = FastAPI(
     title="Task Management System",
     lifespan=lifespan,
 )
+app.container = Container()
 
 app.include_router(users_router)
 app.include_router(tasks_router)
 app.include_router(auth_router)
+app.include_router(metrics_router)
+app.include_router(health_router)
 
+app.add_middleware(UnitOfWorkMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER, REQUEST_ID_HEADER],
 )
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 
 @app.exception_handler(HTTPException)
 async def http_validation_exception_handler(_: Request, exc: HTTPException):
     content = {"detail": exc.detail}
-    return JSONResponse(status_code=exc.status_code, content=content)
+    return JSONResponse(
+        status_code=exc.status_code, content=content, headers=exc.headers
+    )
 
 
 @app.get("/", response_class=HTMLResponse)
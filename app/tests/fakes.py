@@ -0,0 +1,536 @@
+"""
+Репозитории в памяти для тестов и бенчмарков.
+"""
+
+from bisect import bisect_left, insort
+from dataclasses import replace
+from datetime import date, datetime, timezone
+from itertools import count
+from time import monotonic
+from typing import AsyncIterator, Callable
+
+from sqlalchemy.exc import NoResultFound
+
+from app.domain.entities.task import (
+    Task,
+    TaskChange,
+    TaskChangePage,
+    TaskChangesExpired,
+    TaskCursor,
+    TaskFilter,
+    TaskOrdering,
+    TaskPage,
+    TaskRecord,
+    TaskReminder,
+    TaskStats,
+    TaskUpdateResult,
+    TaskVersionConflict,
+    search_terms,
+    task_record,
+)
+from app.domain.entities.outbox import OutboxMessage, OutboxTopic
+from app.domain.entities.user import User
+from app.domain.interfaces.outbox import OutboxRepository
+from app.domain.interfaces.task_reminder_repository import (
+    TaskReminderRepository,
+)
+from app.domain.interfaces.task_repository import TaskRepository
+from app.domain.interfaces.user_repository import UserRepository
+
+# Веса совпадения в заголовке и в описании, как у весов A и B ts_rank.
+_TITLE_WEIGHT = 1.0
+_DESCRIPTION_WEIGHT = 0.4
+
+
+class InMemoryTaskRepository(TaskRepository):
+    """
+    Репозиторий задач в памяти процесса.
+
+    Используется в тестах и бенчмарках вместо PostgreSQL; повторяет
+    семантику SQLAlchemyTaskRepository, включая NoResultFound.
+    """
+
+    def __init__(self):
+        self._tasks: dict[int, Task] = {}
+        self._ids = count(1)
+        # Журнал изменений: (task_id, user_id) -> (seq, удаление, время)
+        # последнего изменения; user_id -> граница очистки.
+        self._changes: dict[tuple[int, int], tuple[int, bool, datetime]] = {}
+        self._horizons: dict[int, int] = {}
+        self._seq = count(1)
+        # Инвертированный индекс поиска: слово -> {task_id: вес},
+        # плюс отсортированный список слов для поиска по префиксу.
+        self._postings: dict[str, dict[int, float]] = {}
+        self._terms: list[str] = []
+
+    async def create(self, task: Task) -> Task:
+        created = replace(task, id=next(self._ids), version=1)
+        self._tasks[created.id] = created
+        self._index(created)
+        self._log_change(created.id, created.user_id)
+        return replace(created)
+
+    async def create_many(self, tasks: list[Task]) -> list[Task]:
+        return [await self.create(task) for task in tasks]
+
+    async def get_by_id(self, task_id: int) -> Task | None:
+        task = self._tasks.get(task_id)
+        return replace(task) if task is not None else None
+
+    async def get_all(self) -> list[Task]:
+        return [replace(task) for task in self._tasks.values()]
+
+    async def get_page(
+        self,
+        filters: TaskFilter,
+        limit: int,
+        cursor: TaskCursor | None = None,
+        ordering: TaskOrdering = TaskOrdering.ID,
+    ) -> TaskPage:
+        if ordering == TaskOrdering.DUE_DATE:
+
+            def key(task: Task) -> tuple:
+                return (task.due_date, task.id)
+
+            if cursor is not None and cursor.due_date is None:
+                raise ValueError("Cursor does not match ordering")
+            after = (cursor.due_date, cursor.id) if cursor else None
+        else:
+
+            def key(task: Task) -> tuple:
+                return (task.id,)
+
+            after = (cursor.id,) if cursor else None
+
+        tasks = sorted(self._filter(filters), key=key)
+        if after is not None:
+            tasks = [task for task in tasks if key(task) > after]
+        items = [replace(task) for task in tasks[:limit]]
+        next_cursor = None
+        if len(tasks) > limit:
+            last = items[-1]
+            next_cursor = TaskCursor(
+                id=last.id,
+                due_date=(
+                    last.due_date
+                    if ordering == TaskOrdering.DUE_DATE
+                    else None
+                ),
+            )
+        return TaskPage(items=items, next_cursor=next_cursor)
+
+    async def search(
+        self,
+        user_id: int,
+        query: str,
+        limit: int,
+        cursor: TaskCursor | None = None,
+    ) -> TaskPage:
+        if cursor is not None and cursor.rank is None:
+            raise ValueError("Cursor does not match ordering")
+        ranks: dict[int, float] | None = None
+        for term in search_terms(query):
+            weights = self._prefix_weights(term)
+            if ranks is None:
+                ranks = weights
+            else:
+                ranks = {
+                    task_id: rank + weights[task_id]
+                    for task_id, rank in ranks.items()
+                    if task_id in weights
+                }
+        found = sorted(
+            (-rank, task_id)
+            for task_id, rank in (ranks or {}).items()
+            if self._tasks[task_id].user_id == user_id
+        )
+        if cursor is not None:
+            found = [key for key in found if key > (-cursor.rank, cursor.id)]
+        items = [replace(self._tasks[task_id]) for _, task_id in found[:limit]]
+        next_cursor = None
+        if len(found) > limit:
+            rank, task_id = found[limit - 1]
+            next_cursor = TaskCursor(id=task_id, rank=-rank)
+        return TaskPage(items=items, next_cursor=next_cursor)
+
+    async def stream(
+        self, filters: TaskFilter, chunk_size: int
+    ) -> AsyncIterator[list[TaskRecord]]:
+        tasks = sorted(self._filter(filters), key=lambda task: task.id)
+        for start in range(0, len(tasks), chunk_size):
+            yield [
+                task_record(task) for task in tasks[start : start + chunk_size]
+            ]
+
+    async def get_all_by_user_id(self, user_id: int) -> list[Task]:
+        return [
+            replace(task)
+            for task in self._tasks.values()
+            if task.user_id == user_id
+        ]
+
+    async def get_changes(
+        self, user_id: int, since: int, limit: int
+    ) -> TaskChangePage:
+        if 0 < since < self._horizons.get(user_id, 0):
+            raise TaskChangesExpired(
+                f"Cursor {since} is older than the change log"
+            )
+        changed = sorted(
+            (seq, task_id)
+            for (task_id, owner_id), (seq, _, _) in self._changes.items()
+            if owner_id == user_id and seq > since
+        )
+        changes = []
+        for seq, task_id in changed[:limit]:
+            task = self._tasks.get(task_id)
+            if task is not None and task.user_id != user_id:
+                task = None
+            changes.append(
+                TaskChange(
+                    seq=seq,
+                    task_id=task_id,
+                    task=replace(task) if task is not None else None,
+                )
+            )
+        return TaskChangePage(
+            changes=changes,
+            cursor=changes[-1].seq if changes else since,
+            has_more=len(changed) > limit,
+        )
+
+    async def get_version(self, task_id: int) -> int | None:
+        task = self._tasks.get(task_id)
+        return task.version if task is not None else None
+
+    async def get_user_tasks_version(self, user_id: int) -> int:
+        latest = max(
+            (
+                seq
+                for (_, owner_id), (seq, _, _) in self._changes.items()
+                if owner_id == user_id
+            ),
+            default=0,
+        )
+        return max(latest, self._horizons.get(user_id, 0))
+
+    async def get_stats(self, user_id: int, today: date) -> TaskStats:
+        stats = TaskStats()
+        for task in self._tasks.values():
+            if task.user_id != user_id:
+                continue
+            if task.due_date < today:
+                stats.overdue += 1
+            elif task.due_date == today:
+                stats.due_today += 1
+            else:
+                stats.upcoming += 1
+        return stats
+
+    async def update(
+        self, task: Task, expected_version: int | None = None
+    ) -> TaskUpdateResult:
+        current = self._tasks.get(task.id)
+        if current is None:
+            raise NoResultFound(f"Task {task.id} not found")
+        if (
+            expected_version is not None
+            and current.version != expected_version
+        ):
+            raise TaskVersionConflict(
+                f"Task {task.id} version is not {expected_version}"
+            )
+        updated = replace(task, version=current.version + 1)
+        self._unindex(current)
+        self._tasks[task.id] = updated
+        self._index(updated)
+        if current.user_id != task.user_id:
+            self._log_change(task.id, current.user_id, deleted=True)
+        self._log_change(task.id, task.user_id)
+        return TaskUpdateResult(
+            task=replace(updated), previous_user_id=current.user_id
+        )
+
+    async def update_many(self, tasks: list[Task]) -> list[Task]:
+        updated = []
+        for task in tasks:
+            current = self._tasks.get(task.id)
+            if current is None or current.user_id != task.user_id:
+                continue
+            self._unindex(current)
+            self._tasks[task.id] = replace(task, version=current.version + 1)
+            self._index(self._tasks[task.id])
+            self._log_change(task.id, task.user_id)
+            updated.append(replace(self._tasks[task.id]))
+        return updated
+
+    async def delete(self, task_id: int) -> Task:
+        task = self._tasks.pop(task_id, None)
+        if task is None:
+            raise NoResultFound(f"Task {task_id} not found")
+        self._unindex(task)
+        self._log_change(task_id, task.user_id, deleted=True)
+        return task
+
+    async def delete_many(
+        self, task_ids: list[int], user_id: int
+    ) -> list[int]:
+        deleted = []
+        for task_id in task_ids:
+            task = self._tasks.get(task_id)
+            if task is not None and task.user_id == user_id:
+                del self._tasks[task_id]
+                self._unindex(task)
+                self._log_change(task_id, user_id, deleted=True)
+                deleted.append(task_id)
+        return deleted
+
+    async def prune_changes(self, before: datetime, limit: int) -> int:
+        # Вытесненных записей нет: хранится только последнее изменение.
+        expired = sorted(
+            (seq, key)
+            for key, (seq, deleted, changed_at) in self._changes.items()
+            if deleted and changed_at < before
+        )[:limit]
+        for seq, (task_id, user_id) in expired:
+            del self._changes[(task_id, user_id)]
+            self._horizons[user_id] = max(self._horizons.get(user_id, 0), seq)
+        return len(expired)
+
+    def _log_change(
+        self, task_id: int, user_id: int, deleted: bool = False
+    ) -> None:
+        self._changes[(task_id, user_id)] = (
+            next(self._seq),
+            deleted,
+            datetime.now(timezone.utc),
+        )
+
+    def _index(self, task: Task) -> None:
+        for term, weight in _task_terms(task).items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._terms, term)
+            postings[task.id] = weight
+
+    def _unindex(self, task: Task) -> None:
+        for term in _task_terms(task):
+            postings = self._postings[term]
+            del postings[task.id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect_left(self._terms, term)]
+
+    def _prefix_weights(self, prefix: str) -> dict[int, float]:
+        weights: dict[int, float] = {}
+        index = bisect_left(self._terms, prefix)
+        while index < len(self._terms) and self._terms[index].startswith(
+            prefix
+        ):
+            for task_id, weight in self._postings[self._terms[index]].items():
+                weights[task_id] = max(weights.get(task_id, 0.0), weight)
+            index += 1
+        return weights
+
+    def _filter(self, filters: TaskFilter) -> list[Task]:
+        tasks = self._tasks.values()
+        if filters.user_id is not None:
+            tasks = [task for task in tasks if task.user_id == filters.user_id]
+        if filters.due_from is not None:
+            tasks = [
+                task for task in tasks if task.due_date >= filters.due_from
+            ]
+        if filters.due_to is not None:
+            tasks = [task for task in tasks if task.due_date <= filters.due_to]
+        if filters.title_prefix:
+            tasks = [
+                task
+                for task in tasks
+                if task.title.startswith(filters.title_prefix)
+            ]
+        return list(tasks)
+
+
+def _task_terms(task: Task) -> dict[str, float]:
+    terms = {
+        term: _DESCRIPTION_WEIGHT
+        for term in search_terms(task.description or "")
+    }
+    terms.update((term, _TITLE_WEIGHT) for term in search_terms(task.title))
+    return terms
+
+
+class InMemoryTaskReminderRepository(TaskReminderRepository):
+    """
+    Напоминания о задачах InMemoryTaskRepository.
+
+    Один экземпляр, разделяемый несколькими планировщиками, моделирует
+    общую базу нескольких воркеров.
+    """
+
+    def __init__(self, tasks: InMemoryTaskRepository):
+        self._tasks = tasks
+        self._sent: set[tuple[int, date]] = set()
+
+    async def get_pending(
+        self,
+        due_from: date,
+        due_to: date,
+        limit: int,
+        after: TaskReminder | None = None,
+    ) -> list[TaskReminder]:
+        pending = sorted(
+            (
+                TaskReminder(
+                    task_id=task.id,
+                    user_id=task.user_id,
+                    due_date=task.due_date,
+                )
+                for task in self._tasks._tasks.values()
+                if due_from <= task.due_date <= due_to
+                and (task.id, task.due_date) not in self._sent
+            ),
+            key=lambda reminder: (reminder.due_date, reminder.task_id),
+        )
+        if after is not None:
+            pending = [
+                reminder
+                for reminder in pending
+                if (reminder.due_date, reminder.task_id)
+                > (after.due_date, after.task_id)
+            ]
+        return pending[:limit]
+
+    async def claim(self, reminders: list[TaskReminder]) -> list[TaskReminder]:
+        claimed = []
+        for reminder in reminders:
+            key = (reminder.task_id, reminder.due_date)
+            task = self._tasks._tasks.get(reminder.task_id)
+            if (
+                task is None
+                or task.due_date != reminder.due_date
+                or key in self._sent
+            ):
+                continue
+            self._sent.add(key)
+            claimed.append(reminder)
+        return claimed
+
+
+class InMemoryUserRepository(UserRepository):
+    """
+    Репозиторий пользователей в памяти процесса.
+    """
+
+    def __init__(self):
+        self._users: dict[int, User] = {}
+        self._ids = count(1)
+
+    async def create(self, user: User) -> User:
+        if any(
+            existing.username == user.username or existing.email == user.email
+            for existing in self._users.values()
+        ):
+            raise ValueError("Username or email already exists")
+        created = replace(user, id=next(self._ids))
+        self._users[created.id] = created
+        return replace(created)
+
+    async def get_by_id(self, user_id: int) -> User | None:
+        user = self._users.get(user_id)
+        return replace(user) if user is not None else None
+
+    async def get_by_email(self, email: str) -> User | None:
+        return self._find(lambda user: user.email == email)
+
+    async def get_by_username(self, username: str) -> User | None:
+        return self._find(lambda user: user.username == username)
+
+    async def deactivate(self, user_id: int) -> None:
+        user = self._users.get(user_id)
+        if user is not None:
+            self._users[user_id] = replace(user, is_active=False)
+
+    async def delete(self, user_id: int) -> None:
+        self._users.pop(user_id, None)
+
+    def _find(self, predicate) -> User | None:
+        for user in self._users.values():
+            if predicate(user):
+                return replace(user)
+        return None
+
+
+class InMemoryOutboxRepository(OutboxRepository):
+    """
+    Outbox в памяти процесса; время аренды и повторов - по clock.
+
+    Сообщения добавляются явно (add): в памяти нет транзакции, вместе
+    с которой их можно было бы записать.
+    """
+
+    def __init__(self, clock: Callable[[], float] = monotonic):
+        """
+        :param clock: источник текущего времени в секундах
+        """
+        self._clock = clock
+        self._ids = count(1)
+        self._messages: dict[int, OutboxMessage] = {}
+        self._available_at: dict[int, float] = {}
+        self.dead_letters: dict[int, str] = {}
+        self.errors: dict[int, str] = {}
+
+    def add(self, topic: OutboxTopic, payload: dict) -> OutboxMessage:
+        message = OutboxMessage(
+            id=next(self._ids), topic=topic, payload=payload, attempts=0
+        )
+        self._messages[message.id] = message
+        self._available_at[message.id] = self._clock()
+        return message
+
+    def pending(self) -> list[OutboxMessage]:
+        return [
+            message
+            for message in self._messages.values()
+            if message.id not in self.dead_letters
+        ]
+
+    async def claim(
+        self, limit: int, lease_seconds: float
+    ) -> list[OutboxMessage]:
+        now = self._clock()
+        ready = sorted(
+            (
+                message
+                for message in self.pending()
+                if self._available_at[message.id] <= now
+            ),
+            key=lambda message: (self._available_at[message.id], message.id),
+        )[:limit]
+        claimed = []
+        for message in ready:
+            message.attempts += 1
+            self._available_at[message.id] = now + lease_seconds
+            claimed.append(replace(message))
+        return sorted(claimed, key=lambda message: message.id)
+
+    async def complete(self, message: OutboxMessage) -> None:
+        if self._is_current(message):
+            del self._messages[message.id]
+            del self._available_at[message.id]
+
+    async def retry(
+        self, message: OutboxMessage, delay_seconds: float, error: str
+    ) -> None:
+        if self._is_current(message):
+            self._available_at[message.id] = self._clock() + delay_seconds
+            self.errors[message.id] = error
+
+    async def dead_letter(self, message: OutboxMessage, error: str) -> None:
+        if self._is_current(message):
+            self.dead_letters[message.id] = error
+
+    def _is_current(self, message: OutboxMessage) -> bool:
+        stored = self._messages.get(message.id)
+        return stored is not None and stored.attempts == message.attempts
@@ -0,0 +1,57 @@
+from datetime import date
+
+import pytest
+
+from app.domain.entities.task import Task, TaskFilter, TaskOrdering
+from app.tests.fakes import InMemoryTaskRepository
+from benchmarks.compare import compare
+
+
+def _report(**results):
+    return {"meta": {}, "results": results}
+
+
+def test_compare_detects_latency_and_throughput_regressions():
+    baseline = _report(get={"p99_ms": 10.0, "throughput_rps": 1000.0})
+
+    assert (
+        compare(
+            baseline,
+            _report(get={"p99_ms": 10.5, "throughput_rps": 950.0}),
+            0.1,
+        )
+        == []
+    )
+    regressions = compare(
+        baseline,
+        _report(get={"p99_ms": 12.0, "throughput_rps": 800.0}),
+        0.1,
+    )
+    assert [r.split(":")[0] for r in regressions] == [
+        "get.p99_ms",
+        "get.throughput_rps",
+    ]
+    assert compare(baseline, _report(), 0.1) == ["get: missing in current run"]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_repository_paginates_like_sql_repository():
+    repository = InMemoryTaskRepository()
+    for day in (3, 1, 2):
+        await repository.create(
+            Task(id=None, title="t", due_date=date(2030, 1, day), user_id=1)
+        )
+
+    first = await repository.get_page(
+        TaskFilter(user_id=1), limit=2, ordering=TaskOrdering.DUE_DATE
+    )
+    second = await repository.get_page(
+        TaskFilter(user_id=1),
+        limit=2,
+        cursor=first.next_cursor,
+        ordering=TaskOrdering.DUE_DATE,
+    )
+
+    assert [t.due_date.day for t in first.items] == [1, 2]
+    assert [t.due_date.day for t in second.items] == [3]
+    assert second.next_cursor is None
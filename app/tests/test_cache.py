@@ -0,0 +1,83 @@
+from app.common.cache import TTLCache
+from app.entrypoints.api.schemas.user import UserRead
+from app.infrastructure.principal_cache import PrincipalCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set("key", "value")
+
+    assert cache.get("key") == "value"
+    clock.now = 5
+    assert cache.get("key") is None
+    assert cache.stats() == {"size": 0, "hits": 1, "misses": 1}
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_principal_cache_invalidates_user():
+    cache = PrincipalCache(maxsize=10, ttl=60)
+    cache.set(
+        "alice",
+        UserRead(
+            id=1, username="alice", email="a@example.com", is_active=True
+        ),
+    )
+    cache.set(
+        "bob",
+        UserRead(id=2, username="bob", email="b@example.com", is_active=True),
+    )
+
+    cache.invalidate_user(1)
+
+    assert cache.get("alice") is None
+    assert cache.get("bob") is not None
+
+
+def test_principal_cache_index_follows_evictions():
+    clock = FakeClock()
+    cache = PrincipalCache(maxsize=2, ttl=5, clock=clock)
+
+    def principal(user_id: int, username: str) -> UserRead:
+        return UserRead(
+            id=user_id,
+            username=username,
+            email=f"{username}@example.com",
+            is_active=True,
+        )
+
+    cache.set("alice", principal(1, "alice"))
+    cache.set("alice", principal(2, "alice"))
+    assert cache._keys_by_user == {2: {"alice"}}
+
+    cache.set("bob", principal(1, "bob"))
+    cache.set("carol", principal(3, "carol"))
+    assert cache._keys_by_user == {1: {"bob"}, 3: {"carol"}}
+
+    clock.now = 5
+    assert cache.get("bob") is None
+    assert cache._keys_by_user == {3: {"carol"}}
+
+    cache.set("dave", principal(3, "dave"))
+    cache.invalidate_user(3)
+    assert len(cache) == 0
+    assert cache._keys_by_user == {}
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.main import _warm_up, app
+
+
+@pytest.mark.asyncio
+async def test_readiness_waits_for_warm_up(async_client):
+    response = await async_client.get("/health/live")
+    assert response.status_code == 200
+
+    app.state.ready = False
+    response = await async_client.get("/health/ready")
+    assert response.status_code == 503
+
+    app.state.ready = True
+    try:
+        response = await async_client.get("/health/ready")
+    finally:
+        app.state.ready = False
+    assert response.status_code == 200
+
+
+class FlakyDatabase:
+    """
+    База, которая сначала недоступна, а потом прогревается дольше
+    допустимого.
+    """
+
+    def __init__(self):
+        self.attempts = 0
+
+    async def warm_up(self, connections, prepare):
+        self.attempts += 1
+        if self.attempts == 1:
+            raise ConnectionRefusedError("database is starting up")
+        await asyncio.sleep(60)
+
+
+@pytest.mark.asyncio
+async def test_warm_up_retries_and_is_bounded_by_timeout(monkeypatch):
+    async def prepare():
+        pass
+
+    monkeypatch.setattr(settings, "db_warm_up_timeout_seconds", 0.01)
+    database = FlakyDatabase()
+    app.state.ready = False
+    try:
+        await asyncio.wait_for(_warm_up(app, database, prepare), timeout=5)
+        assert app.state.ready
+    finally:
+        app.state.ready = False
+    assert database.attempts == 2
+
+
+class DownDatabase:
+    def __init__(self):
+        self.attempts = 0
+
+    async def warm_up(self, connections, prepare):
+        self.attempts += 1
+        raise ConnectionRefusedError("database is down")
+
+
+@pytest.mark.asyncio
+async def test_warm_up_gives_up_after_max_attempts(monkeypatch):
+    async def prepare():
+        pass
+
+    async def no_sleep(delay):
+        pass
+
+    errors = []
+    monkeypatch.setattr(settings, "db_warm_up_max_attempts", 3)
+    monkeypatch.setattr("app.main.asyncio.sleep", no_sleep)
+    monkeypatch.setattr(
+        "app.main.logger.error", lambda msg, *args: errors.append(msg)
+    )
+    database = DownDatabase()
+    app.state.ready = False
+    try:
+        await _warm_up(app, database, prepare)
+        assert app.state.ready
+    finally:
+        app.state.ready = False
+    assert database.attempts == 3
+    assert len(errors) == 1
@@ -0,0 +1,107 @@
+import json
+import logging
+import queue
+
+import pytest
+
+from app.common.logs import (
+    SAMPLED,
+    JSONFormatter,
+    NonBlockingQueueHandler,
+    SamplingFilter,
+    get_logger,
+    request_id,
+)
+from app.config import settings
+
+
+def make_record(msg: str, *args, **extra) -> logging.LogRecord:
+    record = logging.LogRecord(
+        "app", logging.WARNING, __file__, 1, msg, args, None
+    )
+    record.__dict__.update(extra)
+    return record
+
+
+def test_sampling_filter_limits_repeated_messages():
+    now = [0.0]
+    sampler = SamplingFilter(burst=2, interval=10, clock=lambda: now[0])
+    passed = [
+        sampler.filter(make_record("Login failed: %s", user, **SAMPLED))
+        for user in ("a", "b", "c", "d")
+    ]
+    assert passed == [True, True, False, False]
+    assert sampler.filter(make_record("Login failed: %s", "e"))
+
+    now[0] = 10.0
+    record = make_record("Login failed: %s", "f", **SAMPLED)
+    assert sampler.filter(record)
+    assert record.suppressed == 2
+
+
+def test_queue_handler_drops_when_full_without_blocking():
+    handler = NonBlockingQueueHandler(queue.Queue(1))
+    handler.handle(make_record("first"))
+    handler.handle(make_record("second"))
+    assert handler.queue.qsize() == 1
+    assert handler.queue.get_nowait().msg == "first"
+
+
+def test_queue_handler_defers_formatting_and_adds_request_id():
+    handler = NonBlockingQueueHandler(queue.Queue())
+    token = request_id.set("req-1")
+    try:
+        handler.handle(make_record("Task not found: task_id=%s", 7))
+    finally:
+        request_id.reset(token)
+    record = handler.queue.get_nowait()
+    assert record.args == (7,)
+
+    data = json.loads(JSONFormatter().format(record))
+    assert data["message"] == "Task not found: task_id=7"
+    assert data["request_id"] == "req-1"
+    assert data["level"] == "WARNING"
+
+
+class CapturingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+@pytest.mark.parametrize("log_caller", [False, True])
+def test_caller_lookup_follows_log_caller(monkeypatch, log_caller):
+    monkeypatch.setattr(settings, "log_caller", log_caller)
+    logger = get_logger(f"app.tests.caller.{log_caller}")
+    handler = CapturingHandler()
+    logger.addHandler(handler)
+    try:
+        logger.debug("Caller lookup")
+    finally:
+        logger.removeHandler(handler)
+
+    (record,) = handler.records
+    if log_caller:
+        assert record.funcName == "test_caller_lookup_follows_log_caller"
+        assert record.lineno > 0
+    else:
+        assert record.funcName == "(unknown function)"
+        assert record.lineno == 0
+    assert type(logging.getLogger("third.party")) is logging.Logger
+
+
+@pytest.mark.asyncio
+async def test_request_id_header(async_client):
+    response = await async_client.get(
+        "/health/live", headers={"X-Request-ID": "abc-123"}
+    )
+    assert response.headers["X-Request-ID"] == "abc-123"
+
+    response = await async_client.get(
+        "/health/live", headers={"X-Request-ID": "bad id\n"}
+    )
+    generated = response.headers["X-Request-ID"]
+    assert generated != "bad id" and len(generated) == 32
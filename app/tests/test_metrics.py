@@ -0,0 +1,94 @@
+import pytest
+
+from app.common.metrics import MetricsRegistry
+from app.infrastructure.db.base import statement_fingerprint
+from app.infrastructure.security import (
+    JWT_DECODE,
+    create_access_token,
+    decode_access_token,
+)
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    requests = registry.counter(
+        "http_requests_total", "Requests.", labelnames=("method",)
+    )
+    latency = registry.histogram(
+        "latency_seconds", "Latency.", buckets=(0.1, 1.0)
+    )
+    requests.labels("GET").inc()
+    requests.labels("GET").inc()
+    latency.observe(0.05)
+    latency.observe(0.5)
+
+    text = registry.render()
+
+    assert "# TYPE http_requests_total counter" in text
+    assert 'http_requests_total{method="GET"} 2' in text
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in text
+    assert "latency_seconds_count 2" in text
+
+
+def test_registry_returns_existing_metric():
+    registry = MetricsRegistry()
+    first = registry.gauge("in_use", "In use.")
+    assert registry.gauge("in_use", "In use.") is first
+    with pytest.raises(ValueError):
+        registry.counter("in_use", "In use.")
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(async_client):
+    response = await async_client.get("/metrics")
+    assert response.status_code == 200
+    assert "db_pool_connections_in_use" in response.text
+    assert "db_pool_checkout_wait_seconds_bucket" in response.text
+
+
+@pytest.mark.asyncio
+async def test_request_metrics_use_route_template(async_client):
+    await async_client.get("/tasks/12345")
+    await async_client.get("/tasks/67890")
+
+    text = (await async_client.get("/metrics")).text
+
+    assert (
+        'http_request_duration_seconds_count{method="GET",'
+        'route="/tasks/{task_id}",status="401"' in text
+    )
+    assert 'route="/tasks/12345"' not in text
+    assert 'http_requests_in_flight{method="GET",route="/metrics"} 1' in text
+
+
+def test_statement_fingerprint_collapses_parameters_and_batches():
+    single = statement_fingerprint(
+        "INSERT INTO tasks (title, due_date) "
+        "VALUES ($1::VARCHAR, $2::DATE) RETURNING tasks.id"
+    )
+    batch = statement_fingerprint(
+        "INSERT INTO tasks (title, due_date) VALUES "
+        "($1::VARCHAR, $2::DATE, 0), ($3::VARCHAR, $4::DATE, 1)\n"
+        "RETURNING tasks.id"
+    )
+
+    assert single == (
+        "INSERT INTO tasks (title, due_date) VALUES (?, ?) RETURNING tasks.id"
+    )
+    assert batch == (
+        "INSERT INTO tasks (title, due_date) VALUES (?, ?, ?), ... "
+        "RETURNING tasks.id"
+    )
+
+
+def test_jwt_decode_counters():
+    invalid = JWT_DECODE.labels("invalid").value
+    ok = JWT_DECODE.labels("ok").value
+
+    assert decode_access_token("not-a-token") is None
+    assert decode_access_token(create_access_token({"sub": "alice"}))
+
+    assert JWT_DECODE.labels("invalid").value == invalid + 1
+    assert JWT_DECODE.labels("ok").value == ok + 1
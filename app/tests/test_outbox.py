@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from app.domain.entities.outbox import OutboxTopic
+from app.domain.interfaces.outbox import OutboxHandler
+from app.infrastructure.outbox import OutboxWorkerPool
+from app.tests.fakes import InMemoryOutboxRepository
+
+
+class FlakyHandler(OutboxHandler):
+    def __init__(self, failures: dict[int, int]):
+        self.failures = failures
+        self.handled = []
+        self.closed = False
+
+    async def handle(self, message) -> None:
+        if self.failures.get(message.id, 0) >= message.attempts:
+            raise ConnectionError("webhook is unavailable")
+        self.handled.append(message.id)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+async def run_until(pool: OutboxWorkerPool, condition) -> None:
+    task = asyncio.create_task(pool.run())
+    try:
+        for _ in range(200):
+            if condition():
+                break
+            await asyncio.sleep(0.005)
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_retries_then_dead_letters():
+    repository = InMemoryOutboxRepository()
+    ok = repository.add(OutboxTopic.TASK_CREATED, {"task_id": 1})
+    flaky = repository.add(OutboxTopic.TASK_UPDATED, {"task_id": 1})
+    broken = repository.add(OutboxTopic.USER_DELETED, {"user_id": 2})
+    handler = FlakyHandler({flaky.id: 2, broken.id: 100})
+    pool = OutboxWorkerPool(
+        repository,
+        handler,
+        concurrency=2,
+        batch_size=2,
+        queue_size=2,
+        poll_interval=0.001,
+        max_attempts=3,
+        backoff_base=0.001,
+        backoff_max=0.001,
+    )
+
+    await run_until(pool, lambda: not repository.pending())
+
+    assert sorted(handler.handled) == [ok.id, flaky.id]
+    assert list(repository.dead_letters) == [broken.id]
+    assert "ConnectionError" in repository.dead_letters[broken.id]
+    assert handler.closed
+
+
+@pytest.mark.asyncio
+async def test_stale_lease_does_not_complete_reclaimed_message():
+    now = [0.0]
+    repository = InMemoryOutboxRepository(clock=lambda: now[0])
+    repository.add(OutboxTopic.TASK_DELETED, {"task_id": 3})
+
+    [first] = await repository.claim(10, lease_seconds=60)
+    assert await repository.claim(10, lease_seconds=60) == []
+    now[0] = 61.0
+    [second] = await repository.claim(10, lease_seconds=60)
+    assert second.attempts == first.attempts + 1
+
+    await repository.complete(first)
+    assert len(repository.pending()) == 1
+    await repository.complete(second)
+    assert repository.pending() == []
+
+
+def test_retry_delay_grows_exponentially_up_to_max():
+    pool = OutboxWorkerPool(
+        InMemoryOutboxRepository(),
+        FlakyHandler({}),
+        backoff_base=1.0,
+        backoff_max=8.0,
+    )
+    for attempts, delay in ((1, 1.0), (2, 2.0), (3, 4.0), (6, 8.0)):
+        assert delay / 2 <= pool.retry_delay(attempts) <= delay
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.infrastructure import security
+from app.infrastructure.security import (
+    AccessTokenVerifier,
+    PasswordHasherBusyError,
+    PooledPasswordHasher,
+    create_access_token,
+)
+
+
+@pytest.mark.asyncio
+async def test_pooled_password_hasher_roundtrip():
+    hasher = PooledPasswordHasher(max_workers=1, max_pending=1)
+    try:
+        hashed = await hasher.hash("secret-password")
+        assert await hasher.verify("secret-password", hashed)
+        assert not await hasher.verify("wrong-password", hashed)
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pooled_password_hasher_rejects_when_saturated():
+    hasher = PooledPasswordHasher(max_workers=1, max_pending=0)
+    try:
+        running = asyncio.create_task(hasher.hash("secret-password"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(PasswordHasherBusyError):
+            await hasher.hash("another-password")
+
+        await running
+        assert hasher.rejected == 1
+    finally:
+        hasher.shutdown()
+
+
+def test_access_token_verifier_caches_claims(monkeypatch):
+    decoded = []
+    decode = security.decode_access_token
+
+    def counting_decode(token):
+        decoded.append(token)
+        return decode(token)
+
+    monkeypatch.setattr(security, "decode_access_token", counting_decode)
+    verifier = AccessTokenVerifier(maxsize=10, ttl=60)
+    token = create_access_token({"sub": "alice"})
+
+    assert verifier.verify(token)["sub"] == "alice"
+    assert verifier.verify(token)["sub"] == "alice"
+    assert verifier.verify("not-a-token") is None
+    assert verifier.verify("not-a-token") is None
+    assert decoded == [token, "not-a-token", "not-a-token"]
+
+
+def test_access_token_verifier_honours_exp():
+    now = time.time()
+    verifier = AccessTokenVerifier(maxsize=10, ttl=3600, clock=lambda: now)
+    token = create_access_token(
+        {"sub": "alice"}, expires_delta=timedelta(seconds=30)
+    )
+    assert verifier.verify(token) is not None
+
+    now += 31
+    assert verifier.verify(token) is None
@@ -0,0 +1,148 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.common.single_flight import SingleFlight
+from app.domain.entities.task import Task
+from app.infrastructure.db.unit_of_work import UnitOfWork
+from app.infrastructure.repositories.cached_task_repository import (
+    CachedTaskRepository,
+)
+from app.tests.fakes import InMemoryTaskRepository
+from app.infrastructure.task_cache import InMemoryTaskCache, RedisTaskCache
+
+
+class CountingTaskRepository(InMemoryTaskRepository):
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    async def get_by_id(self, task_id: int) -> Task | None:
+        self.reads += 1
+        await asyncio.sleep(0.01)
+        return await super().get_by_id(task_id)
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value.encode()
+        self.expiry[key] = px
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+class BrokenRedis:
+    async def get(self, key):
+        raise ConnectionError("redis is down")
+
+    async def set(self, key, value, px=None):
+        raise ConnectionError("redis is down")
+
+
+def _task(title: str = "Task") -> Task:
+    return Task(id=None, title=title, due_date=date(2030, 1, 1), user_id=1)
+
+
+@pytest.fixture(params=["memory", "redis"])
+def cache(request):
+    if request.param == "memory":
+        return InMemoryTaskCache(maxsize=100, ttl=60)
+    return RedisTaskCache(FakeRedis(), ttl=60)
+
+
+@pytest.fixture
+def repository():
+    return CountingTaskRepository()
+
+
+@pytest.fixture
+def cached(repository, cache):
+    return CachedTaskRepository(repository, cache, SingleFlight())
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_produce_one_query(cached, repository):
+    created = await cached.create(_task())
+
+    tasks = await asyncio.gather(
+        *(cached.get_by_id(created.id) for _ in range(20))
+    )
+
+    assert repository.reads == 1
+    assert all(task == created for task in tasks)
+    assert len({id(task) for task in tasks}) == 20
+
+    await cached.get_by_id(created.id)
+    assert repository.reads == 1
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_cached_task(cached, repository):
+    created = await cached.create(_task())
+    await cached.get_by_id(created.id)
+
+    await cached.update(
+        Task(
+            id=created.id,
+            title="Updated",
+            due_date=created.due_date,
+            user_id=created.user_id,
+        )
+    )
+    assert (await cached.get_by_id(created.id)).title == "Updated"
+    assert repository.reads == 2
+
+    await cached.delete(created.id)
+    assert await cached.get_by_id(created.id) is None
+
+
+@pytest.mark.asyncio
+async def test_stale_fill_during_transaction_is_dropped(cached, cache):
+    created = await cached.create(_task())
+
+    async with UnitOfWork() as unit_of_work:
+        await cached.update(
+            Task(
+                id=created.id,
+                title="Updated",
+                due_date=created.due_date,
+                user_id=created.user_id,
+            )
+        )
+        # Конкурентное чтение до фиксации кладёт в кэш старую версию.
+        await cache.set(created)
+        assert (await cached.get_by_id(created.id)).title == "Updated"
+        await unit_of_work.commit()
+
+    assert await cache.get(created.id) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_cache_roundtrip_and_failures():
+    redis = FakeRedis()
+    cache = RedisTaskCache(redis, ttl=1.5)
+    task = Task(
+        id=7,
+        title="Task",
+        due_date=date(2030, 1, 1),
+        user_id=1,
+        description="Text",
+    )
+
+    await cache.set(task)
+    assert await cache.get(7) == task
+    assert redis.expiry["task:7"] == 1500
+
+    broken = RedisTaskCache(BrokenRedis(), ttl=1)
+    await broken.set(task)
+    assert await broken.get(7) is None
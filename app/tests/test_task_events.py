@@ -0,0 +1,152 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.application.services.task_service import TaskService
+from app.domain.entities.task import Task, TaskEvent, TaskEventType
+from app.entrypoints.api.routes.tasks import _encode_sse
+from app.entrypoints.api.schemas.task import TaskCreate, TaskUpdate
+from app.infrastructure.db.unit_of_work import UnitOfWork
+from app.tests.fakes import InMemoryTaskRepository
+from app.infrastructure.task_events import (
+    InProcessTaskEventBackend,
+    TaskEventHub,
+    _decode_event,
+    _encode_event,
+)
+
+
+def make_event(user_id: int, task_id: int = 1) -> TaskEvent:
+    return TaskEvent(
+        type=TaskEventType.DELETED, task_id=task_id, user_id=user_id
+    )
+
+
+@pytest.mark.asyncio
+async def test_hub_delivers_only_own_user_events():
+    hub = TaskEventHub(InProcessTaskEventBackend())
+    async with hub.subscribe(1) as mine, hub.subscribe(2) as other:
+        await hub.publish(make_event(user_id=1))
+        assert (await mine.get(timeout=1)).user_id == 1
+        with pytest.raises(asyncio.TimeoutError):
+            await other.get(timeout=0.01)
+    assert hub.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_hub_drops_slow_subscriber():
+    hub = TaskEventHub(InProcessTaskEventBackend(), queue_size=2)
+    async with hub.subscribe(1) as slow:
+        for task_id in range(3):
+            await hub.publish(make_event(user_id=1, task_id=task_id))
+        assert await slow.get(timeout=1) is None
+        assert slow.overflowed
+        assert hub.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_hub_publishes_after_commit_only():
+    hub = TaskEventHub(InProcessTaskEventBackend())
+    async with hub.subscribe(1) as subscription:
+        async with UnitOfWork() as unit_of_work:
+            await hub.publish(make_event(user_id=1, task_id=1))
+            with pytest.raises(asyncio.TimeoutError):
+                await subscription.get(timeout=0.01)
+            await unit_of_work.rollback()
+
+        async with UnitOfWork() as unit_of_work:
+            await hub.publish(make_event(user_id=1, task_id=2))
+            await unit_of_work.commit()
+        assert (await subscription.get(timeout=1)).task_id == 2
+
+
+@pytest.mark.asyncio
+async def test_hub_close_ends_subscriptions():
+    hub = TaskEventHub(InProcessTaskEventBackend())
+    async with hub.subscribe(1) as subscription:
+        await hub.close()
+        assert await subscription.get(timeout=1) is None
+        assert not subscription.overflowed
+
+
+@pytest.mark.asyncio
+async def test_task_service_publishes_mutations():
+    hub = TaskEventHub(InProcessTaskEventBackend())
+    service = TaskService(InMemoryTaskRepository(), task_events=hub)
+    async with hub.subscribe(7) as subscription:
+        task = await service.create_task(
+            TaskCreate(title="One", due_date=date(2025, 1, 1)), user_id=7
+        )
+        await service.update_task(
+            TaskUpdate(title="Two", due_date=date(2025, 1, 1)),
+            task.id,
+            user_id=7,
+        )
+        await service.delete_task(task.id)
+        events = [await subscription.get(timeout=1) for _ in range(3)]
+    assert [event.type for event in events] == [
+        TaskEventType.CREATED,
+        TaskEventType.UPDATED,
+        TaskEventType.DELETED,
+    ]
+    assert events[1].task.title == "Two"
+    assert events[2].task is None
+
+
+@pytest.mark.asyncio
+async def test_task_service_publishes_move_to_both_owners():
+    hub = TaskEventHub(InProcessTaskEventBackend())
+    service = TaskService(InMemoryTaskRepository(), task_events=hub)
+    task = await service.create_task(
+        TaskCreate(title="One", due_date=date(2025, 1, 1)), user_id=7
+    )
+    async with hub.subscribe(7) as previous, hub.subscribe(8) as current:
+        await service.update_task(
+            TaskUpdate(title="Two", due_date=date(2025, 1, 1)),
+            task.id,
+            user_id=8,
+        )
+        removed = await previous.get(timeout=1)
+        added = await current.get(timeout=1)
+    assert (removed.type, removed.task_id, removed.task) == (
+        TaskEventType.DELETED,
+        task.id,
+        None,
+    )
+    assert added.type == TaskEventType.UPDATED
+    assert added.task.user_id == 8
+
+
+def test_event_payload_drops_oversized_task():
+    task = Task(
+        id=1,
+        title="Big",
+        due_date=date(2025, 1, 1),
+        user_id=1,
+        description="x" * 100,
+    )
+    event = TaskEvent(
+        type=TaskEventType.UPDATED, task_id=1, user_id=1, task=task
+    )
+    assert _decode_event(_encode_event(event, limit=8000)) == event
+    assert _decode_event(_encode_event(event, limit=50)).task is None
+
+
+@pytest.mark.asyncio
+async def test_encode_sse_heartbeat_and_resync():
+    hub = TaskEventHub(InProcessTaskEventBackend(), queue_size=1)
+    async with hub.subscribe(1) as subscription:
+        stream = _encode_sse(subscription, heartbeat=0.01)
+        assert await stream.__anext__() == b": keepalive\n\n"
+
+        await hub.publish(make_event(user_id=1, task_id=5))
+        chunk = await stream.__anext__()
+        assert chunk.startswith(b"event: deleted\ndata: ")
+        assert b'"task_id":5' in chunk
+
+        await hub.publish(make_event(user_id=1))
+        await hub.publish(make_event(user_id=1))
+        assert await stream.__anext__() == b"event: resync\ndata: {}\n\n"
+        with pytest.raises(StopAsyncIteration):
+            await stream.__anext__()
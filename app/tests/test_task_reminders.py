@@ -0,0 +1,86 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from app.domain.entities.task import Task, TaskEventType
+from app.tests.fakes import (
+    InMemoryTaskReminderRepository,
+    InMemoryTaskRepository,
+)
+from app.infrastructure.task_reminders import TaskReminderScheduler
+
+
+class ListPublisher:
+    def __init__(self):
+        self.events = []
+
+    async def publish(self, event) -> None:
+        self.events.append(event)
+
+
+async def create_task(tasks: InMemoryTaskRepository, due_date: date) -> Task:
+    return await tasks.create(
+        Task(id=None, title="Task", due_date=due_date, user_id=1)
+    )
+
+
+@pytest.mark.asyncio
+async def test_reminder_fires_once_across_schedulers():
+    tasks = InMemoryTaskRepository()
+    reminders = InMemoryTaskReminderRepository(tasks)
+    publisher = ListPublisher()
+    now = [datetime(2025, 6, 9, 23, 58, tzinfo=timezone.utc)]
+    schedulers = [
+        TaskReminderScheduler(
+            reminders,
+            publisher,
+            lead_seconds=86400,
+            window_seconds=300,
+            clock=lambda: now[0],
+        )
+        for _ in range(2)
+    ]
+    due = await create_task(tasks, date(2025, 6, 11))
+    moved = await create_task(tasks, date(2025, 6, 11))
+    await create_task(tasks, date(2025, 6, 12))
+    await create_task(tasks, date(2025, 6, 8))
+
+    # Напоминание за сутки до 2025-06-11 - в полночь, через 120 секунд.
+    assert [await scheduler.tick() for scheduler in schedulers] == [120, 120]
+    assert [scheduler.queue_size() for scheduler in schedulers] == [2, 2]
+
+    moved.due_date = date(2025, 6, 20)
+    await tasks.update(moved)
+    now[0] = datetime(2025, 6, 10, tzinfo=timezone.utc)
+    for scheduler in schedulers:
+        await scheduler.tick()
+
+    assert [event.task_id for event in publisher.events] == [due.id]
+    assert publisher.events[0].type is TaskEventType.REMINDER
+    assert [scheduler.queue_size() for scheduler in schedulers] == [0, 0]
+
+
+@pytest.mark.asyncio
+async def test_failed_claim_keeps_reminders_queued(monkeypatch):
+    tasks = InMemoryTaskRepository()
+    reminders = InMemoryTaskReminderRepository(tasks)
+    publisher = ListPublisher()
+    scheduler = TaskReminderScheduler(
+        reminders,
+        publisher,
+        clock=lambda: datetime(2025, 6, 10, 12, tzinfo=timezone.utc),
+    )
+    task = await create_task(tasks, date(2025, 6, 10))
+    claim = reminders.claim
+
+    async def failing_claim(batch):
+        raise ConnectionError("database is unavailable")
+
+    monkeypatch.setattr(reminders, "claim", failing_claim)
+    with pytest.raises(ConnectionError):
+        await scheduler.tick()
+    assert scheduler.queue_size() == 1
+
+    monkeypatch.setattr(reminders, "claim", claim)
+    await scheduler.tick()
+    assert [event.task_id for event in publisher.events] == [task.id]
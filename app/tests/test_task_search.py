@@ -0,0 +1,81 @@
+from datetime import date
+
+import pytest
+
+from app.domain.entities.task import Task, TaskCursor, search_terms
+from app.tests.fakes import InMemoryTaskRepository
+
+
+def make_task(title: str, description: str | None = None, user_id: int = 1):
+    return Task(
+        id=None,
+        title=title,
+        description=description,
+        due_date=date(2025, 1, 1),
+        user_id=user_id,
+    )
+
+
+def test_search_terms():
+    assert search_terms("  Fix the BUG, fix-it!") == [
+        "fix",
+        "the",
+        "bug",
+        "it",
+    ]
+    assert search_terms("?!") == []
+
+
+@pytest.mark.asyncio
+async def test_in_memory_search_ranks_title_matches_first():
+    repository = InMemoryTaskRepository()
+    in_description = await repository.create(
+        make_task("Groceries", "buy milk for the report meeting")
+    )
+    in_title = await repository.create(make_task("Write report"))
+    await repository.create(make_task("Report", user_id=2))
+    await repository.create(make_task("Unrelated"))
+
+    page = await repository.search(1, "rep", limit=10)
+    assert [task.id for task in page.items] == [
+        in_title.id,
+        in_description.id,
+    ]
+    assert page.next_cursor is None
+
+    page = await repository.search(1, "report milk", limit=10)
+    assert [task.id for task in page.items] == [in_description.id]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_search_follows_updates_and_deletes():
+    repository = InMemoryTaskRepository()
+    task = await repository.create(make_task("Old title"))
+    task.title = "New title"
+    await repository.update(task)
+    assert (await repository.search(1, "old", limit=10)).items == []
+    assert len((await repository.search(1, "new", limit=10)).items) == 1
+
+    await repository.delete(task.id)
+    assert (await repository.search(1, "title", limit=10)).items == []
+    assert repository._terms == []
+
+
+@pytest.mark.asyncio
+async def test_in_memory_search_pagination():
+    repository = InMemoryTaskRepository()
+    for index in range(5):
+        await repository.create(make_task(f"Task {index}"))
+
+    seen = []
+    cursor = None
+    while True:
+        page = await repository.search(1, "task", limit=2, cursor=cursor)
+        seen.extend(task.id for task in page.items)
+        if page.next_cursor is None:
+            break
+        cursor = TaskCursor.decode(page.next_cursor.encode())
+    assert seen == [1, 2, 3, 4, 5]
+
+    with pytest.raises(ValueError):
+        await repository.search(1, "task", limit=2, cursor=TaskCursor(id=1))
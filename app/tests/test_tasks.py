@@ -1,9 +1,30 @@
+import json
 import pytest
+from sqlalchemy.exc import NoResultFound
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
 from app.main import app
+from app.application.services.task_service import TaskService
+from app.application.use_cases.task import (
+    CreateTasksBatchUseCase,
+    DeleteTasksBatchUseCase,
+    UpdateTasksBatchUseCase,
+)
+from app.entrypoints.api import responses
 from app.entrypoints.api.dependencies import get_current_user
-from app.container import Container
+from app.entrypoints.api.schemas.task import TaskRead
+from app.config import settings
+from app.tests.fakes import InMemoryTaskRepository
+from app.infrastructure.task_change_retention import TaskChangePruner
+from app.domain.entities.task import (
+    Task,
+    TaskBatchError,
+    TaskChangesExpired,
+    TaskCursor,
+    TaskPage,
+    TaskVersionConflict,
+    task_record,
+)
 
 
 @dataclass
@@ -13,12 +34,14 @@ class MockTask:
     description: str
     due_date: str
     user_id: int
+    version: int = 1
 
 
 class TestTaskService:
     def __init__(self):
         self.tasks = {}
         self.next_id = 1
+        self.changes = 0
 
     async def create_task(self, task_create, user_id):
         task = MockTask(
@@ -30,11 +53,38 @@ class TestTaskService:
         )
         self.tasks[self.next_id] = task
         self.next_id += 1
+        self.changes += 1
         return task
 
     async def get_all_tasks(self):
         return list(self.tasks.values())
 
+    async def get_tasks_page(self, filters, limit, cursor=None, ordering=None):
+        tasks = sorted(self.tasks.values(), key=lambda task: task.id)
+        if filters.user_id is not None:
+            tasks = [task for task in tasks if task.user_id == filters.user_id]
+        if filters.title_prefix:
+            tasks = [
+                task
+                for task in tasks
+                if task.title.startswith(filters.title_prefix)
+            ]
+        if cursor is not None:
+            tasks = [task for task in tasks if task.id > cursor.id]
+        next_cursor = None
+        if len(tasks) > limit:
+            next_cursor = TaskCursor(id=tasks[limit - 1].id)
+        return TaskPage(items=tasks[:limit], next_cursor=next_cursor)
+
+    async def export_tasks(self, filters, chunk_size):
+        tasks = sorted(self.tasks.values(), key=lambda task: task.id)
+        if filters.user_id is not None:
+            tasks = [task for task in tasks if task.user_id == filters.user_id]
+        for start in range(0, len(tasks), chunk_size):
+            yield [
+                task_record(task) for task in tasks[start : start + chunk_size]
+            ]
+
     async def get_all_tasks_by_user_id(self, user_id):
         return [
             task for task in self.tasks.values() if task.user_id == user_id
@@ -43,19 +93,34 @@ class TestTaskService:
     async def get_task_by_id(self, task_id):
         return self.tasks.get(task_id)
 
-    async def update_task(self, task_update, task_id, user_id):
+    async def get_task_version(self, task_id):
+        task = self.tasks.get(task_id)
+        return task.version if task else None
+
+    async def get_user_tasks_version(self, user_id):
+        return self.changes
+
+    async def update_task(
+        self, task_update, task_id, user_id, expected_version=None
+    ):
         task = self.tasks.get(task_id)
         if task and task.user_id == user_id:
+            if expected_version not in (None, task.version):
+                raise TaskVersionConflict(f"Task {task_id} was modified")
+            task.version += 1
             task.title = task_update.title
             task.description = task_update.description
             task.due_date = task_update.due_date
             self.tasks[task_id] = task
+            self.changes += 1
             return task
-        return None
+        raise NoResultFound(f"Task {task_id} not found")
 
     async def delete_task(self, task_id):
-        if task_id in self.tasks:
-            del self.tasks[task_id]
+        if task_id not in self.tasks:
+            raise NoResultFound(f"Task {task_id} not found")
+        del self.tasks[task_id]
+        self.changes += 1
 
 
 class TestUser:
@@ -67,10 +132,10 @@ class TestUser:
 
 @pytest.fixture
 def override_dependencies():
-    Container.task_service.override(TestTaskService())
+    app.container.task_service.override(TestTaskService())
     app.dependency_overrides[get_current_user] = lambda: TestUser()
     yield
-    Container.task_service.reset_override()
+    app.container.task_service.reset_override()
     app.dependency_overrides.clear()
 
 
@@ -106,6 +171,89 @@ async def test_get_all_tasks(async_client, override_dependencies):
     assert tasks[0]["title"] == "Test Task"
 
 
+@pytest.mark.asyncio
+async def test_get_all_tasks_paginated(async_client, override_dependencies):
+    for title in ("Alpha", "Beta", "Alpine"):
+        await async_client.post(
+            "/tasks/",
+            json={"title": title, "due_date": date.today().isoformat()},
+        )
+
+    response = await async_client.get(
+        "/tasks/", params={"limit": 1, "title_prefix": "Al"}
+    )
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["Alpha"]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = await async_client.get(
+        "/tasks/", params={"limit": 1, "title_prefix": "Al", "cursor": cursor}
+    )
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["Alpine"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_get_all_tasks_invalid_cursor(
+    async_client, override_dependencies
+):
+    response = await async_client.get("/tasks/", params={"cursor": "%%%"})
+    assert response.status_code == 400
+
+
+def test_task_cursor_roundtrip():
+    cursor = TaskCursor(id=42, due_date=date(2025, 1, 31))
+    assert TaskCursor.decode(cursor.encode()) == cursor
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_ndjson(async_client, override_dependencies):
+    for title in ("First", "Second"):
+        await async_client.post(
+            "/tasks/",
+            json={"title": title, "due_date": date.today().isoformat()},
+        )
+
+    response = await async_client.get("/tasks/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["title"] for line in lines] == [
+        "First",
+        "Second",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_json(async_client, override_dependencies):
+    for title in ("First", "Second"):
+        await async_client.post(
+            "/tasks/",
+            json={"title": title, "due_date": date.today().isoformat()},
+        )
+
+    response = await async_client.get(
+        "/tasks/export", params={"format": "json"}
+    )
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["First", "Second"]
+
+
+@pytest.mark.asyncio
+async def test_export_tasks_rejects_inverted_due_range(
+    async_client, override_dependencies
+):
+    app.container.task_service.override(TaskService(InMemoryTaskRepository()))
+    params = {"due_from": "2025-02-01", "due_to": "2025-01-01"}
+    for path in ("/tasks/", "/tasks/export"):
+        response = await async_client.get(path, params=params)
+        assert response.status_code == 400
+        assert response.json() == {
+            "detail": "due_from must not be after due_to"
+        }
+
+
 @pytest.mark.asyncio
 async def test_get_tasks_by_user(async_client, override_dependencies):
     task_data = {
@@ -182,3 +330,467 @@ async def test_delete_task(async_client, override_dependencies):
 
     response_get = await async_client.get(f"/tasks/{task_id}")
     assert response_get.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_update_missing_task(async_client, override_dependencies):
+    update_data = {
+        "title": "Updated Task",
+        "due_date": date.today().isoformat(),
+    }
+    response = await async_client.put("/tasks/999", json=update_data)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_delete_missing_task(async_client, override_dependencies):
+    response = await async_client.delete("/tasks/999")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_batch(async_client, override_dependencies):
+    app.container.task_service.override(TaskService(InMemoryTaskRepository()))
+    batch = {
+        "items": [
+            {"title": "First", "due_date": date.today().isoformat()},
+            {"title": " ", "due_date": date.today().isoformat()},
+            {"title": "Third", "due_date": date.today().isoformat()},
+        ]
+    }
+    response = await async_client.post("/tasks/batch", json=batch)
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["title"] for task in data["tasks"]] == ["First", "Third"]
+    assert data["errors"] == [
+        {"index": 1, "detail": "Title cannot be empty", "task_id": None}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_tasks_batch(async_client, override_dependencies):
+    app.container.task_service.override(TaskService(InMemoryTaskRepository()))
+    response_create = await async_client.post(
+        "/tasks/",
+        json={"title": "Original", "due_date": date.today().isoformat()},
+    )
+    task_id = response_create.json()["id"]
+
+    batch = {
+        "items": [
+            {
+                "id": task_id,
+                "title": "Updated",
+                "due_date": date.today().isoformat(),
+            },
+            {
+                "id": 999,
+                "title": "Missing",
+                "due_date": date.today().isoformat(),
+            },
+        ]
+    }
+    response = await async_client.patch("/tasks/batch", json=batch)
+    assert response.status_code == 200
+    data = response.json()
+    assert [task["title"] for task in data["tasks"]] == ["Updated"]
+    assert data["errors"] == [
+        {"index": 1, "detail": "Task not found", "task_id": 999}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks_batch(async_client, override_dependencies):
+    app.container.task_service.override(TaskService(InMemoryTaskRepository()))
+    response_create = await async_client.post(
+        "/tasks/",
+        json={"title": "To delete", "due_date": date.today().isoformat()},
+    )
+    task_id = response_create.json()["id"]
+
+    response = await async_client.request(
+        "DELETE", "/tasks/batch", json={"ids": [task_id, 999]}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["deleted_ids"] == [task_id]
+    assert data["errors"] == [
+        {"index": 1, "detail": "Task not found", "task_id": 999}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batch_size_limit(
+    async_client, override_dependencies, monkeypatch
+):
+    monkeypatch.setattr(settings, "task_batch_max_size", 1)
+    response = await async_client.request(
+        "DELETE", "/tasks/batch", json={"ids": [1, 2]}
+    )
+    assert response.status_code == 413
+
+
+def make_task(title: str, task_id: int | None = None, user_id: int = 1):
+    return Task(
+        id=task_id, title=title, due_date=date(2025, 1, 1), user_id=user_id
+    )
+
+
+@pytest.mark.asyncio
+async def test_create_tasks_batch_use_case():
+    repository = InMemoryTaskRepository()
+    result = await CreateTasksBatchUseCase(repository).execute(
+        [make_task("First"), make_task(" "), make_task("Third")]
+    )
+    assert [task.title for task in result.tasks] == ["First", "Third"]
+    assert result.errors == [
+        TaskBatchError(index=1, detail="Title cannot be empty")
+    ]
+    assert len(await repository.get_all()) == 2
+
+
+@pytest.mark.asyncio
+async def test_update_tasks_batch_use_case():
+    repository = InMemoryTaskRepository()
+    first, second = await repository.create_many(
+        [make_task("First"), make_task("Second")]
+    )
+    foreign = await repository.create(make_task("Foreign", user_id=2))
+
+    result = await UpdateTasksBatchUseCase(repository).execute(
+        [
+            make_task("Missing", task_id=999),
+            make_task("First v2", task_id=first.id),
+            make_task("", task_id=second.id),
+            make_task("First v3", task_id=first.id),
+            make_task("Foreign v2", task_id=foreign.id),
+            make_task("Second v2", task_id=second.id),
+        ]
+    )
+    assert [task.title for task in result.tasks] == ["First v2", "Second v2"]
+    assert result.errors == [
+        TaskBatchError(index=0, detail="Task not found", task_id=999),
+        TaskBatchError(
+            index=2, detail="Title cannot be empty", task_id=second.id
+        ),
+        TaskBatchError(index=3, detail="Duplicate task id", task_id=first.id),
+        TaskBatchError(index=4, detail="Task not found", task_id=foreign.id),
+    ]
+    assert (await repository.get_by_id(first.id)).title == "First v2"
+    assert (await repository.get_by_id(foreign.id)).title == "Foreign"
+
+
+@pytest.mark.asyncio
+async def test_delete_tasks_batch_use_case():
+    repository = InMemoryTaskRepository()
+    first, second = await repository.create_many(
+        [make_task("First"), make_task("Second")]
+    )
+    foreign = await repository.create(make_task("Foreign", user_id=2))
+
+    result = await DeleteTasksBatchUseCase(repository).execute(
+        [foreign.id, second.id, 999, second.id, first.id], user_id=1
+    )
+    assert result.deleted_ids == [second.id, first.id]
+    assert result.errors == [
+        TaskBatchError(index=0, detail="Task not found", task_id=foreign.id),
+        TaskBatchError(index=2, detail="Task not found", task_id=999),
+        TaskBatchError(index=3, detail="Duplicate task id", task_id=second.id),
+    ]
+    assert await repository.get_all() == [foreign]
+
+
+@pytest.mark.asyncio
+async def test_get_task_not_modified(async_client, override_dependencies):
+    response = await async_client.post(
+        "/tasks/",
+        json={"title": "Cached", "due_date": "2025-12-31"},
+    )
+    task_id = response.json()["id"]
+
+    response = await async_client.get(f"/tasks/{task_id}")
+    etag = response.headers["ETag"]
+    assert etag == f'"{task_id}.1"'
+
+    response = await async_client.get(
+        f"/tasks/{task_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+
+    await async_client.put(
+        f"/tasks/{task_id}",
+        json={"title": "Changed", "due_date": "2025-12-31"},
+    )
+    response = await async_client.get(
+        f"/tasks/{task_id}", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{task_id}.2"'
+
+
+@pytest.mark.asyncio
+async def test_get_tasks_by_user_not_modified(
+    async_client, override_dependencies
+):
+    await async_client.post(
+        "/tasks/", json={"title": "One", "due_date": "2025-12-31"}
+    )
+    response = await async_client.get("/tasks/user")
+    etag = response.headers["ETag"]
+
+    response = await async_client.get(
+        "/tasks/user", headers={"If-None-Match": f'W/{etag}, "other"'}
+    )
+    assert response.status_code == 304
+
+    await async_client.post(
+        "/tasks/", json={"title": "Two", "due_date": "2025-12-31"}
+    )
+    response = await async_client.get(
+        "/tasks/user", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_user_tasks_version_follows_moves_and_pruning():
+    repository = InMemoryTaskRepository()
+    assert await repository.get_user_tasks_version(1) == 0
+    first, second = await repository.create_many(
+        [make_task("First"), make_task("Second")]
+    )
+    foreign = await repository.create(make_task("Foreign", user_id=2))
+    version = await repository.get_user_tasks_version(1)
+
+    # Встречный перенос сохраняет количество, id и сумму версий набора.
+    first.user_id, foreign.user_id = 2, 1
+    await repository.update(first)
+    await repository.update(foreign)
+    assert await repository.get_user_tasks_version(1) > version
+
+    version = await repository.get_user_tasks_version(1)
+    await repository.delete(second.id)
+    deleted_version = await repository.get_user_tasks_version(1)
+    assert deleted_version > version
+    later = datetime.now(timezone.utc) + timedelta(days=1)
+    assert await repository.prune_changes(later, 100) > 0
+    assert await repository.get_user_tasks_version(1) == deleted_version
+
+
+@pytest.mark.asyncio
+async def test_update_task_if_match(async_client, override_dependencies):
+    response = await async_client.post(
+        "/tasks/", json={"title": "Original", "due_date": "2025-12-31"}
+    )
+    task_id = response.json()["id"]
+    payload = {"title": "Updated", "due_date": "2025-12-31"}
+
+    response = await async_client.put(
+        f"/tasks/{task_id}", json=payload, headers={"If-Match": '"999.1"'}
+    )
+    assert response.status_code == 412
+
+    response = await async_client.put(
+        f"/tasks/{task_id}",
+        json=payload,
+        headers={"If-Match": f'"{task_id}.1"'},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] == f'"{task_id}.2"'
+
+    response = await async_client.put(
+        f"/tasks/{task_id}",
+        json=payload,
+        headers={"If-Match": f'"{task_id}.1"'},
+    )
+    assert response.status_code == 412
+
+
+@pytest.mark.asyncio
+async def test_get_task_changes(async_client, override_dependencies):
+    app.container.task_service.override(TaskService(InMemoryTaskRepository()))
+    ids = []
+    for title in ("One", "Two", "Three"):
+        response = await async_client.post(
+            "/tasks/", json={"title": title, "due_date": "2025-12-31"}
+        )
+        ids.append(response.json()["id"])
+
+    response = await async_client.get("/tasks/changes?limit=2")
+    assert response.status_code == 200
+    page = response.json()
+    assert [change["task_id"] for change in page["changes"]] == ids[:2]
+    assert page["has_more"] is True
+
+    response = await async_client.get(f"/tasks/changes?since={page['cursor']}")
+    page = response.json()
+    assert [change["task_id"] for change in page["changes"]] == ids[2:]
+    assert page["has_more"] is False
+    cursor = page["cursor"]
+
+    await async_client.put(
+        f"/tasks/{ids[0]}",
+        json={"title": "Updated", "due_date": "2025-12-31"},
+    )
+    await async_client.delete(f"/tasks/{ids[1]}")
+    response = await async_client.get(f"/tasks/changes?since={cursor}")
+    changes = response.json()["changes"]
+    assert [change["task_id"] for change in changes] == ids[:2]
+    assert changes[0]["task"]["title"] == "Updated"
+    assert changes[1]["deleted"] is True
+    assert changes[1]["task"] is None
+
+    response = await async_client.get("/tasks/changes?since=-1")
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_task_changes_tombstone_on_move_and_retention(
+    async_client, override_dependencies
+):
+    repository = InMemoryTaskRepository()
+    app.container.task_service.override(TaskService(repository))
+    kept, moved, deleted = [
+        await repository.create(
+            Task(id=None, title=title, due_date=date(2025, 1, 1), user_id=1)
+        )
+        for title in ("Kept", "Moved", "Deleted")
+    ]
+    cursor = (await repository.get_changes(1, 0, 10)).cursor
+
+    moved.user_id = 2
+    await repository.update(moved)
+    await repository.delete(deleted.id)
+    changes = (await repository.get_changes(1, cursor, 10)).changes
+    assert [(c.task_id, c.deleted) for c in changes] == [
+        (moved.id, True),
+        (deleted.id, True),
+    ]
+    changes = (await repository.get_changes(2, 0, 10)).changes
+    assert [(c.task_id, c.deleted) for c in changes] == [(moved.id, False)]
+
+    later = datetime.now(timezone.utc) + timedelta(days=31)
+    pruner = TaskChangePruner(
+        repository, retention_seconds=30 * 86400, clock=lambda: later
+    )
+    assert await pruner.prune() == 2
+
+    with pytest.raises(TaskChangesExpired):
+        await repository.get_changes(1, cursor, 10)
+    response = await async_client.get(f"/tasks/changes?since={cursor}")
+    assert response.status_code == 410
+    response = await async_client.get("/tasks/changes")
+    assert [change["task_id"] for change in response.json()["changes"]] == [
+        kept.id
+    ]
+
+
+@pytest.mark.asyncio
+async def test_search_tasks_endpoint(async_client, override_dependencies):
+    app.container.task_service.override(TaskService(InMemoryTaskRepository()))
+    for title in ("Plan sprint", "Sprint review", "Lunch"):
+        await async_client.post(
+            "/tasks/", json={"title": title, "due_date": "2025-12-31"}
+        )
+
+    response = await async_client.get("/tasks/search?q=spr&limit=1")
+    assert response.status_code == 200
+    assert [task["title"] for task in response.json()] == ["Plan sprint"]
+
+    response = await async_client.get(
+        "/tasks/search",
+        params={"q": "spr", "cursor": response.headers["X-Next-Cursor"]},
+    )
+    assert [task["title"] for task in response.json()] == ["Sprint review"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = await async_client.get("/tasks/search?q=%21%21")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_task_stats(async_client, override_dependencies):
+    app.container.task_service.override(TaskService(InMemoryTaskRepository()))
+    for due_date in ("2025-06-01", "2025-06-10", "2025-06-10", "2025-07-01"):
+        await async_client.post(
+            "/tasks/", json={"title": "Task", "due_date": due_date}
+        )
+
+    response = await async_client.get("/tasks/stats?today=2025-06-10")
+    assert response.status_code == 200
+    assert response.json() == {
+        "overdue": 1,
+        "due_today": 2,
+        "upcoming": 1,
+        "total": 4,
+    }
+
+
+@pytest.mark.asyncio
+async def test_fast_serialization_matches_response_model(
+    async_client, override_dependencies, monkeypatch
+):
+    app.container.task_service.override(TaskService(InMemoryTaskRepository()))
+    for title, description in (("Première", None), ("Second", "два")):
+        await async_client.post(
+            "/tasks/",
+            json={
+                "title": title,
+                "description": description,
+                "due_date": "2025-12-31",
+            },
+        )
+
+    paths = ("/tasks/?limit=1", "/tasks/user", "/tasks/search?q=s", "/tasks/1")
+    expected = [await async_client.get(path) for path in paths]
+    monkeypatch.setattr(settings, "task_fast_serialization", True)
+    for path, slow in zip(paths, expected):
+        fast = await async_client.get(path)
+        assert fast.status_code == slow.status_code == 200
+        assert fast.content == slow.content
+        assert fast.headers["content-type"] == slow.headers["content-type"]
+        for header in ("X-Next-Cursor", "ETag"):
+            assert fast.headers.get(header) == slow.headers.get(header)
+
+
+def test_fast_serialization_without_orjson(monkeypatch):
+    tasks = [
+        Task(id=1, title="Über", due_date=date(2025, 1, 1), user_id=1),
+        Task(
+            id=2,
+            title="Two",
+            description="два",
+            due_date=date(2025, 1, 2),
+            user_id=1,
+        ),
+    ]
+    expected = (
+        "["
+        + ",".join(
+            TaskRead.model_validate(task).model_dump_json() for task in tasks
+        )
+        + "]"
+    ).encode()
+    monkeypatch.setattr(responses, "orjson", None)
+    assert responses.encode_tasks(tasks) == expected
+    assert responses.encode_task(tasks[0]) == (
+        TaskRead.model_validate(tasks[0]).model_dump_json().encode()
+    )
+    assert responses.encode_record_lines(
+        [task_record(task) for task in tasks]
+    ) == b"".join(
+        TaskRead.model_validate(task).model_dump_json().encode() + b"\n"
+        for task in tasks
+    )
+
+
+def test_services_are_resolved_once():
+    container = app.container
+    try:
+        assert container.task_service() is container.task_service()
+        assert container.user_service() is container.user_service()
+    finally:
+        container.shutdown_resources()
+        container.reset_singletons()
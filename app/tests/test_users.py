@@ -1,7 +1,23 @@
 import pytest
-from app.entrypoints.api.dependencies import get_user_service
+from app.entrypoints.api.dependencies import (
+    get_current_user,
+    get_user_service,
+)
+from app.entrypoints.api.schemas.user import Principal
+from app.infrastructure.db.unit_of_work import UnitOfWork
+from app.infrastructure.principal_cache import PrincipalCache
+from app.infrastructure.repositories.user_repository import (
+    SQLAlchemyUserRepository,
+)
+from app.infrastructure.security import (
+    AccessTokenVerifier,
+    PasswordHasherBusyError,
+    create_access_token,
+)
+from fastapi import HTTPException
 from httpx import AsyncClient
 from app.main import app
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
 
 
@@ -64,6 +80,25 @@ async def test_create_user(async_client):
     assert "id" in data
 
 
+class BusyUserService(TestUserService):
+    async def create_user(self, user):
+        raise PasswordHasherBusyError("Password hashing pool is saturated")
+
+
+@pytest.mark.asyncio
+async def test_create_user_when_hasher_saturated(async_client):
+    app.dependency_overrides[get_user_service] = lambda: BusyUserService()
+    user_data = {
+        "username": "testuser",
+        "email": "testuser@example.com",
+        "password": "testpassword",
+    }
+
+    response = await async_client.post("/users/", json=user_data)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
 @pytest.mark.asyncio
 async def test_get_user_by_id(async_client):
     app.dependency_overrides[get_user_service] = lambda: TestUserService()
@@ -75,3 +110,98 @@ async def test_get_user_by_id(async_client):
     assert user["id"] == test_user_id
     assert user["username"] == "testuser"
     assert user["email"] == "testuser@example.com"
+
+
+class CountingUserService(TestUserService):
+    def __init__(self):
+        self.lookups = 0
+
+    async def get_user_by_username(self, username):
+        self.lookups += 1
+        return await super().get_user_by_username(username)
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_uses_principal_cache():
+    user_service = CountingUserService()
+    principal_cache = PrincipalCache(maxsize=10, ttl=60)
+    token_verifier = AccessTokenVerifier(maxsize=10, ttl=60)
+    token = create_access_token(data={"sub": "cacheduser"})
+
+    first = await get_current_user(
+        token, user_service, principal_cache, token_verifier
+    )
+    second = await get_current_user(
+        token, user_service, principal_cache, token_verifier
+    )
+
+    assert first == second
+    assert first.username == "cacheduser"
+    assert user_service.lookups == 1
+    assert principal_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_from_embedded_claims():
+    user_service = CountingUserService()
+    token = create_access_token(
+        data={"sub": "tokenuser", "uid": 42, "active": True}
+    )
+
+    principal = await get_current_user(
+        token,
+        user_service,
+        PrincipalCache(maxsize=10, ttl=60),
+        AccessTokenVerifier(maxsize=10, ttl=60),
+    )
+
+    assert principal.id == 42
+    assert principal.username == "tokenuser"
+    assert user_service.lookups == 0
+
+
+@pytest.mark.asyncio
+async def test_get_current_user_rejects_inactive_user():
+    token = create_access_token(
+        data={"sub": "tokenuser", "uid": 42, "active": False}
+    )
+
+    with pytest.raises(HTTPException) as error:
+        await get_current_user(
+            token,
+            CountingUserService(),
+            PrincipalCache(maxsize=10, ttl=60),
+            AccessTokenVerifier(maxsize=10, ttl=60),
+        )
+    assert error.value.status_code == 403
+
+
+class NoOpSession:
+    async def execute(self, statement):
+        return None
+
+
+@asynccontextmanager
+async def noop_session():
+    yield NoOpSession()
+
+
+@pytest.mark.asyncio
+async def test_principal_invalidated_after_commit_only():
+    principal_cache = PrincipalCache(maxsize=10, ttl=60)
+    repository = SQLAlchemyUserRepository(
+        noop_session, principal_cache=principal_cache
+    )
+    principal = Principal(id=5, username="leaving", is_active=True)
+
+    async with UnitOfWork() as unit_of_work:
+        principal_cache.set("leaving", principal)
+        await repository.deactivate(5)
+        # До фиксации аутентификация ещё видит активного пользователя.
+        assert principal_cache.get("leaving") == principal
+        await unit_of_work.commit()
+        assert principal_cache.get("leaving") is None
+
+    principal_cache.set("leaving", principal)
+    await repository.delete(5)
+    assert principal_cache.get("leaving") is None
@@ -0,0 +1,288 @@
+"""
+Нагрузочный бенчмарк горячих путей API.
+
+Замеряет пропускную способность и p50/p95/p99 для логина, создания,
+списка, получения, обновления и удаления задач при заданной
+конкурентности. Цель — либо запущенный сервис на одноразовой базе
+PostgreSQL (--base-url), либо приложение в этом же процессе с
+репозиториями в памяти (--in-memory).
+
+    python -m benchmarks.api --in-memory --concurrency 16 --output run.json
+    python -m benchmarks.api --base-url http://localhost:8000
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import time
+import uuid
+from contextlib import AsyncExitStack, asynccontextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import AsyncIterator, Awaitable, Callable
+
+import httpx
+from dependency_injector import providers
+
+from benchmarks.stats import summarize
+
+SCENARIOS = ("login", "create", "list", "get", "update", "delete")
+BATCH_SIZE = 500
+PASSWORD = "bench-password"
+
+
+@dataclass
+class BenchState:
+    username: str
+    headers: dict[str, str] = field(default_factory=dict)
+    task_ids: list[int] = field(default_factory=list)
+    disposable_ids: list[int] = field(default_factory=list)
+
+
+def _task_payload(index: int) -> dict:
+    due_date = date(2030, 1, 1) + timedelta(days=index % 365)
+    return {
+        "title": f"bench task {index}",
+        "description": "created by benchmarks.api",
+        "due_date": due_date.isoformat(),
+    }
+
+
+@asynccontextmanager
+async def in_memory_client() -> AsyncIterator[httpx.AsyncClient]:
+    """
+    Клиент к приложению в этом процессе с репозиториями в памяти.
+    """
+    from app.container import Container
+    from app.tests.fakes import (
+        InMemoryTaskRepository,
+        InMemoryUserRepository,
+    )
+    from app.main import app, lifespan
+
+    task_repository = providers.Object(InMemoryTaskRepository())
+    user_repository = providers.Object(InMemoryUserRepository())
+    async with AsyncExitStack() as stack:
+        await stack.enter_async_context(lifespan(app))
+        for container in (Container, app.container):
+            stack.enter_context(
+                container.task_repository.override(task_repository)
+            )
+            stack.enter_context(
+                container.user_repository.override(user_repository)
+            )
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://benchmark",
+            )
+        )
+        yield client
+
+
+async def _login(client: httpx.AsyncClient, username: str) -> httpx.Response:
+    return await client.post(
+        "/login", data={"username": username, "password": PASSWORD}
+    )
+
+
+async def _create_tasks(
+    client: httpx.AsyncClient, state: BenchState, count: int
+) -> list[int]:
+    ids = []
+    for start in range(0, count, BATCH_SIZE):
+        items = [
+            _task_payload(index)
+            for index in range(start, min(count, start + BATCH_SIZE))
+        ]
+        response = await client.post(
+            "/tasks/batch", json={"items": items}, headers=state.headers
+        )
+        response.raise_for_status()
+        ids.extend(task["id"] for task in response.json()["tasks"])
+    return ids
+
+
+async def prepare(
+    client: httpx.AsyncClient, args: argparse.Namespace
+) -> BenchState:
+    """
+    Создать пользователя и задачи, которые используют сценарии.
+
+    Подготовка не входит в замеры.
+    """
+    state = BenchState(username=f"bench_{uuid.uuid4().hex[:12]}")
+    response = await client.post(
+        "/users/",
+        json={
+            "username": state.username,
+            "email": f"{state.username}@example.com",
+            "password": PASSWORD,
+        },
+    )
+    response.raise_for_status()
+    response = await _login(client, state.username)
+    response.raise_for_status()
+    state.headers = {
+        "Authorization": f"Bearer {response.json()['access_token']}"
+    }
+    state.task_ids = await _create_tasks(client, state, args.seed)
+    if "delete" in args.scenarios:
+        state.disposable_ids = await _create_tasks(
+            client, state, args.requests
+        )
+    return state
+
+
+def build_requests(
+    client: httpx.AsyncClient, state: BenchState, args: argparse.Namespace
+) -> dict[str, Callable[[int], Awaitable[httpx.Response]]]:
+    rng = random.Random(args.seed_value)
+
+    async def login(_: int) -> httpx.Response:
+        return await _login(client, state.username)
+
+    async def create(index: int) -> httpx.Response:
+        return await client.post(
+            "/tasks/", json=_task_payload(index), headers=state.headers
+        )
+
+    async def list_tasks(_: int) -> httpx.Response:
+        return await client.get(
+            "/tasks/",
+            params={"limit": args.page_size},
+            headers=state.headers,
+        )
+
+    async def get(_: int) -> httpx.Response:
+        task_id = rng.choice(state.task_ids)
+        return await client.get(f"/tasks/{task_id}", headers=state.headers)
+
+    async def update(index: int) -> httpx.Response:
+        task_id = rng.choice(state.task_ids)
+        return await client.put(
+            f"/tasks/{task_id}",
+            json=_task_payload(index),
+            headers=state.headers,
+        )
+
+    async def delete(index: int) -> httpx.Response:
+        task_id = state.disposable_ids[index]
+        return await client.delete(f"/tasks/{task_id}", headers=state.headers)
+
+    return {
+        "login": login,
+        "create": create,
+        "list": list_tasks,
+        "get": get,
+        "update": update,
+        "delete": delete,
+    }
+
+
+async def run_scenario(
+    request: Callable[[int], Awaitable[httpx.Response]],
+    total: int,
+    concurrency: int,
+) -> dict:
+    """
+    Выполнить total запросов в concurrency параллельных воркерах.
+
+    :param request: функция, отправляющая запрос с порядковым номером
+    :param total: общее количество запросов
+    :param concurrency: количество параллельных воркеров
+    """
+    latencies = []
+    errors = 0
+    indexes = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for index in indexes:
+            started = time.perf_counter()
+            try:
+                response = await request(index)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - started)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+async def main(args: argparse.Namespace) -> dict:
+    if args.in_memory:
+        client_context = in_memory_client()
+    else:
+        client_context = httpx.AsyncClient(
+            base_url=args.base_url, timeout=args.timeout
+        )
+
+    results = {}
+    async with client_context as client:
+        state = await prepare(client, args)
+        requests = build_requests(client, state, args)
+        for scenario in args.scenarios:
+            total = (
+                args.login_requests if scenario == "login" else args.requests
+            )
+            results[scenario] = await run_scenario(
+                requests[scenario], total, args.concurrency
+            )
+            print(json.dumps({"scenario": scenario, **results[scenario]}))
+
+    return {
+        "meta": {
+            "target": "in-memory" if args.in_memory else args.base_url,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "login_requests": args.login_requests,
+            "seed": args.seed,
+            "python": platform.python_version(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--base-url")
+    target.add_argument("--in-memory", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument(
+        "--login-requests",
+        type=int,
+        default=50,
+        help="bcrypt делает логин на порядки дороже остальных сценариев",
+    )
+    parser.add_argument("--seed", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed-value", type=int, default=0)
+    parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=SCENARIOS,
+        default=list(SCENARIOS),
+    )
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = asyncio.run(main(arguments))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
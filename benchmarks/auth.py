@@ -0,0 +1,123 @@
+"""
+Микробенчмарк накладных расходов аутентификации на запрос.
+
+Замеряются проверка токена python-jose без кэша, проверка через
+AccessTokenVerifier с кэшем claims и зависимость get_current_user
+целиком в трёх режимах: пользователь из claims токена, из
+PrincipalCache и из репозитория (в памяти, то есть без стоимости
+сетевого обращения к базе). Берётся лучший из --repeat прогонов.
+
+    python -m benchmarks.auth --calls 20000 --output auth.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
+
+from app.application.services.user_service import UserService
+from app.domain.entities.user import User
+from app.entrypoints.api.dependencies import get_current_user
+from app.infrastructure.principal_cache import PrincipalCache
+from app.infrastructure.security import (
+    AccessTokenVerifier,
+    create_access_token,
+    decode_access_token,
+)
+from app.tests.fakes import InMemoryUserRepository
+
+
+async def measure(
+    call: Callable[[], Awaitable[object]], calls: int, repeat: int
+) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            await call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+async def run(calls: int, repeat: int) -> dict:
+    repository = InMemoryUserRepository()
+    user = await repository.create(
+        User(
+            id=None,
+            username="bench",
+            email="bench@example.com",
+            hashed_password="",
+            is_active=True,
+        )
+    )
+    user_service = UserService(repository, password_hasher=None)
+    token = create_access_token({"sub": user.username})
+    claims_token = create_access_token(
+        {"sub": user.username, "uid": user.id, "active": user.is_active}
+    )
+    verifier = AccessTokenVerifier(maxsize=1024, ttl=3600)
+    principal_cache = PrincipalCache(maxsize=1024, ttl=3600)
+    # Нулевой ttl: каждая запись сразу устаревает, всегда промах.
+    no_principal_cache = PrincipalCache(maxsize=1024, ttl=0)
+
+    async def decode() -> object:
+        return decode_access_token(token)
+
+    async def verify_cached() -> object:
+        return verifier.verify(token)
+
+    async def dependency(token: str, cache: PrincipalCache) -> object:
+        return await get_current_user(token, user_service, cache, verifier)
+
+    stages = {
+        "decode": decode,
+        "verify_cached": verify_cached,
+        "dependency_claims": lambda: dependency(
+            claims_token, no_principal_cache
+        ),
+        "dependency_principal_cache": lambda: dependency(
+            token, principal_cache
+        ),
+        "dependency_repository": lambda: dependency(token, no_principal_cache),
+    }
+
+    results = {}
+    for name, stage in stages.items():
+        best = await measure(stage, calls, repeat)
+        results[name] = {
+            "calls": calls,
+            "per_call_us": round(best / calls * 1_000_000, 3),
+            "calls_per_s": round(calls / best, 2),
+        }
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = {
+        "meta": {
+            "calls": arguments.calls,
+            "repeat": arguments.repeat,
+            "python": platform.python_version(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": asyncio.run(run(arguments.calls, arguments.repeat)),
+    }
+    print(json.dumps(report["results"]))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
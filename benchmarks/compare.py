@@ -0,0 +1,80 @@
+"""
+Сравнение результатов бенчмарка с сохранённым базовым прогоном.
+
+Работает с JSON от benchmarks.api и benchmarks.conversion. Задержки
+(*_ms, *_us) и память (*_bytes) не должны вырасти, а пропускная
+способность (*_rps, *_per_s) не должна упасть больше чем на
+--threshold. При регрессии, а также если в текущем прогоне нет
+сценария из базового, код выхода равен 1.
+
+    python -m benchmarks.compare baseline.json run.json --threshold 0.1
+"""
+
+import argparse
+import json
+import sys
+
+LOWER_IS_BETTER = ("_ms", "_us", "_bytes")
+HIGHER_IS_BETTER = ("_rps", "_per_s")
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """
+    Найти регрессии текущего прогона относительно базового.
+
+    :param baseline: результаты базового прогона
+    :param current: результаты текущего прогона
+    :param threshold: допустимое относительное ухудшение, например 0.1
+    :return: описания регрессий; пустой список, если их нет
+    """
+    regressions = []
+    for scenario, expected in baseline["results"].items():
+        actual = current["results"].get(scenario)
+        if actual is None:
+            regressions.append(f"{scenario}: missing in current run")
+            continue
+        for metric, before in expected.items():
+            after = actual.get(metric)
+            if after is None or not before:
+                continue
+            change = (after - before) / before
+            if metric.endswith(LOWER_IS_BETTER):
+                regressed = change > threshold
+            elif metric.endswith(HIGHER_IS_BETTER):
+                regressed = -change > threshold
+            else:
+                continue
+            if regressed:
+                regressions.append(
+                    f"{scenario}.{metric}: {before} -> {after} "
+                    f"({change:+.1%})"
+                )
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    with open(args.baseline) as baseline, open(args.current) as current:
+        regressions = compare(
+            json.load(baseline), json.load(current), args.threshold
+        )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"OK: no regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
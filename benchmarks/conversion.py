@@ -0,0 +1,171 @@
+"""
+Микробенчмарк преобразования строки -> Task -> TaskRead.
+
+Каждый этап замеряется отдельно на одном и том же наборе строк:
+отображение кортежа колонок в сущность (как в репозитории), валидация
+сущности в схему ответа, сериализация схемы в JSON и весь путь целиком.
+Загрузка из базы сравнивается в двух вариантах: ORM-объекты TaskModel
+с копированием в Task и кортежи колонок через _row_to_task (SQLite
+в памяти, чтобы мерить обработку результата, а не сеть). Для загрузки
+также снимается пиковая память на строку. Берётся лучший из --repeat
+прогонов.
+
+    python -m benchmarks.conversion --rows 10000 --output conversion.json
+"""
+
+import argparse
+import json
+import platform
+import timeit
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import Engine, create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.domain.entities.task import Task
+from app.entrypoints.api.schemas.task import TaskRead
+from app.infrastructure.db.models.task import TaskModel
+from app.infrastructure.repositories.task_repository import (
+    _TASK_COLUMNS,
+    _row_to_task,
+)
+
+
+def make_rows(rows: int) -> list[tuple]:
+    return [
+        (
+            index,
+            f"task {index}",
+            None if index % 3 else f"description {index}",
+            date(2030, 1, 1) + timedelta(days=index % 365),
+            index % 100 + 1,
+            1,
+        )
+        for index in range(1, rows + 1)
+    ]
+
+
+def make_database(rows: list[tuple]) -> Engine:
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        # Без search_vector и индексов PostgreSQL: в выборку они не входят.
+        connection.execute(
+            text(
+                "CREATE TABLE tasks (id INTEGER PRIMARY KEY, title TEXT, "
+                "description TEXT, due_date DATE, user_id INTEGER, "
+                "version INTEGER)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO tasks VALUES (:id, :title, :description, "
+                ":due_date, :user_id, :version)"
+            ),
+            [
+                dict(zip(("id", "title", "description"), row[:3]))
+                | {
+                    "due_date": row[3].isoformat(),
+                    "user_id": row[4],
+                    "version": row[5],
+                }
+                for row in rows
+            ],
+        )
+    return engine
+
+
+def load_orm(engine: Engine) -> list[Task]:
+    with Session(engine) as session:
+        return [
+            Task(
+                id=t.id,
+                title=t.title,
+                description=t.description,
+                due_date=t.due_date,
+                user_id=t.user_id,
+                version=t.version,
+            )
+            for t in session.execute(select(TaskModel)).scalars().all()
+        ]
+
+
+def load_columns(engine: Engine) -> list[Task]:
+    with Session(engine) as session:
+        result = session.execute(select(*_TASK_COLUMNS))
+        return [_row_to_task(row) for row in result]
+
+
+def peak_bytes(stage: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        stage()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(rows: int, repeat: int) -> dict:
+    columns = make_rows(rows)
+    tasks = [_row_to_task(row) for row in columns]
+    reads = [TaskRead.model_validate(task) for task in tasks]
+    engine = make_database(columns)
+
+    stages = {
+        "row_to_task": lambda: [_row_to_task(row) for row in columns],
+        "task_to_read": lambda: [
+            TaskRead.model_validate(task) for task in tasks
+        ],
+        "read_to_json": lambda: [read.model_dump_json() for read in reads],
+        "end_to_end": lambda: [
+            TaskRead.model_validate(_row_to_task(row)).model_dump_json()
+            for row in columns
+        ],
+        "load_orm": lambda: load_orm(engine),
+        "load_columns": lambda: load_columns(engine),
+    }
+
+    results = {}
+    for name, stage in stages.items():
+        best = min(timeit.repeat(stage, number=1, repeat=repeat))
+        results[name] = {
+            "rows": rows,
+            "per_row_us": round(best / rows * 1_000_000, 3),
+            "rows_per_s": round(rows / best, 2),
+        }
+    for name in ("load_orm", "load_columns"):
+        results[f"{name}_memory"] = {
+            "rows": rows,
+            "per_row_bytes": round(peak_bytes(stages[name]) / rows, 1),
+        }
+    engine.dispose()
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = {
+        "meta": {
+            "rows": arguments.rows,
+            "repeat": arguments.repeat,
+            "python": platform.python_version(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": run(arguments.rows, arguments.repeat),
+    }
+    print(json.dumps(report["results"]))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
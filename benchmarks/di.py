@@ -0,0 +1,124 @@
+"""
+Микробенчмарк стоимости получения зависимостей на один запрос.
+
+Замеряется то, что делают зависимости роутов задач на каждый запрос:
+получение TaskService и UserService из контейнера приложения. Режим
+factory воспроизводит прежние провайдеры Factory (репозиторий, сервис
+и все его сценарии собираются заново), режим singleton - текущий
+контейнер. К базе бенчмарк не подключается. Берётся лучший из
+--repeat прогонов.
+
+    python -m benchmarks.di --calls 20000 --output di.json
+"""
+
+import argparse
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from dependency_injector import providers
+
+from app.application.services.task_service import TaskService
+from app.application.services.user_service import UserService
+from app.config import settings
+from app.container import Container
+from app.infrastructure.repositories.task_repository import (
+    SQLAlchemyTaskRepository,
+)
+from app.infrastructure.repositories.user_repository import (
+    SQLAlchemyUserRepository,
+)
+
+
+def per_request_providers(
+    container: Container,
+) -> tuple[providers.Factory, providers.Factory]:
+    user_repository = providers.Factory(
+        SQLAlchemyUserRepository,
+        session_contextmanager=container.session_contextmanager,
+        principal_cache=container.principal_cache,
+    )
+    user_service = providers.Factory(
+        UserService,
+        user_repository=user_repository,
+        password_hasher=container.password_hasher,
+    )
+    task_service = providers.Factory(
+        TaskService,
+        task_repository=providers.Factory(
+            SQLAlchemyTaskRepository,
+            session_contextmanager=container.session_contextmanager,
+            search_fuzzy=settings.task_search_fuzzy,
+        ),
+        task_events=container.task_event_hub,
+    )
+    return task_service, user_service
+
+
+def measure(call: Callable[[], object], calls: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(calls):
+            call()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(calls: int, repeat: int) -> dict:
+    container = Container()
+    factory_task_service, factory_user_service = per_request_providers(
+        container
+    )
+
+    def factory() -> object:
+        return factory_task_service(), factory_user_service()
+
+    def singleton() -> object:
+        return container.task_service(), container.user_service()
+
+    results = {}
+    try:
+        for name, stage in {
+            "factory": factory,
+            "singleton": singleton,
+        }.items():
+            best = measure(stage, calls, repeat)
+            results[name] = {
+                "calls": calls,
+                "per_call_us": round(best / calls * 1_000_000, 3),
+                "calls_per_s": round(calls / best, 2),
+            }
+    finally:
+        container.shutdown_resources()
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--calls", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = {
+        "meta": {
+            "calls": arguments.calls,
+            "repeat": arguments.repeat,
+            "python": platform.python_version(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": run(arguments.calls, arguments.repeat),
+    }
+    print(json.dumps(report["results"]))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
@@ -0,0 +1,122 @@
+"""
+Задержка чтения задач во время "шторма" логинов.
+
+Моделирует обработчик чтения задачи (короткое ожидание I/O) и параллельно
+выполняет проверки bcrypt: либо прямо в event loop, как раньше делал
+роут /login, либо через PooledPasswordHasher. Печатает p50/p95/p99
+задержки чтения для каждого режима.
+
+    python -m benchmarks.password_hashing --duration 5 --logins 8
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+from app.infrastructure.security import (
+    PasswordHasherBusyError,
+    PooledPasswordHasher,
+)
+from benchmarks.stats import percentile
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+async def task_reads(
+    stop: asyncio.Event, interval: float, io_time: float
+) -> list[float]:
+    latencies = []
+
+    async def read_task() -> None:
+        started = time.perf_counter()
+        await asyncio.sleep(io_time)
+        latencies.append(time.perf_counter() - started)
+
+    pending = set()
+    while not stop.is_set():
+        task = asyncio.create_task(read_task())
+        pending.add(task)
+        task.add_done_callback(pending.discard)
+        await asyncio.sleep(interval)
+    await asyncio.gather(*pending)
+    return latencies
+
+
+async def login_storm(
+    stop: asyncio.Event, concurrency: int, hashed: str, verify
+) -> int:
+    logins = 0
+
+    async def worker() -> None:
+        nonlocal logins
+        while not stop.is_set():
+            try:
+                await verify("secret-password", hashed)
+                logins += 1
+                await asyncio.sleep(0)
+            except PasswordHasherBusyError:
+                await asyncio.sleep(0.01)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return logins
+
+
+async def run_mode(mode: str, args: argparse.Namespace, hashed: str) -> dict:
+    stop = asyncio.Event()
+    hasher = None
+    jobs = [task_reads(stop, args.interval, args.io_time)]
+
+    if mode == "inline":
+
+        async def verify(password: str, hashed_password: str) -> bool:
+            return pwd_context.verify(password, hashed_password)
+
+        jobs.append(login_storm(stop, args.logins, hashed, verify))
+    elif mode == "pooled":
+        hasher = PooledPasswordHasher(
+            max_workers=args.workers, max_pending=args.max_pending
+        )
+        jobs.append(login_storm(stop, args.logins, hashed, hasher.verify))
+
+    asyncio.get_running_loop().call_later(args.duration, stop.set)
+    results = await asyncio.gather(*jobs)
+    if hasher is not None:
+        hasher.shutdown()
+
+    latencies = [value * 1000 for value in results[0]]
+    return {
+        "mode": mode,
+        "reads": len(latencies),
+        "logins": results[1] if len(results) > 1 else 0,
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+    }
+
+
+async def main(args: argparse.Namespace) -> list[dict]:
+    hashed = pwd_context.hash("secret-password")
+    return [
+        await run_mode(mode, args, hashed)
+        for mode in ("idle", "inline", "pooled")
+    ]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--logins", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--interval", type=float, default=0.005)
+    parser.add_argument("--io-time", type=float, default=0.001)
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    for result in asyncio.run(main(parse_args())):
+        print(json.dumps(result))
@@ -0,0 +1,172 @@
+"""
+Микробенчмарк сериализации ответов со списком задач, одной задачей
+и выгрузкой.
+
+Каждый замер начинается со строк выборки (кортежей колонок) и проходит
+тот же путь, что и роут. Для списка и одной задачи строки превращаются
+в Task (_row_to_task), как во всех чтениях: Task нужен для ETag и кэша
+задач. Дальше сравниваются путь FastAPI через response_model
+(валидация в TaskRead, сериализация и JSONResponse) и быстрый режим
+TaskJSONResponse с orjson и без него (TypeAdapter pydantic). Для
+одной задачи замеряется --rows отдельных ответов. Выгрузка
+(/tasks/export, NDJSON) собирает записи прямо из строк
+(_rows_to_records) и сравнивается с прежним путём через Task
+и TaskRead. Берётся лучший из --repeat прогонов.
+
+    python -m benchmarks.serialization --rows 10000 --output ser.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import timeit
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+
+from app.entrypoints.api import responses
+from app.entrypoints.api.responses import (
+    TaskJSONResponse,
+    encode_record_lines,
+)
+from app.entrypoints.api.schemas.task import TaskRead
+from app.infrastructure.repositories.task_repository import (
+    _row_to_task,
+    _rows_to_records,
+)
+from app.main import app
+
+
+def make_rows(rows: int) -> list[tuple]:
+    """
+    Строки в порядке _TASK_COLUMNS: id, title, description, due_date,
+    user_id, version.
+    """
+    return [
+        (
+            index,
+            f"task {index}",
+            None if index % 3 else f"description {index}",
+            date(2030, 1, 1) + timedelta(days=index % 365),
+            index % 100 + 1,
+            1,
+        )
+        for index in range(1, rows + 1)
+    ]
+
+
+def response_field(path: str):
+    for route in app.routes:
+        if (
+            isinstance(route, APIRoute)
+            and route.path == path
+            and "GET" in route.methods
+        ):
+            return route.response_field
+    raise LookupError(path)
+
+
+def run(rows: int, repeat: int) -> dict:
+    task_rows = make_rows(rows)
+    # Выгрузка выбирает колонки без версии.
+    record_rows = [row[:-1] for row in task_rows]
+    list_field = response_field("/tasks/")
+    detail_field = response_field("/tasks/{task_id}")
+    loop = asyncio.new_event_loop()
+
+    def response_model(field, content) -> bytes:
+        serialized = loop.run_until_complete(
+            serialize_response(field=field, response_content=content)
+        )
+        return JSONResponse(serialized).body
+
+    def fast(orjson) -> dict:
+        def list_stage() -> bytes:
+            responses.orjson = orjson
+            tasks = [_row_to_task(row) for row in task_rows]
+            return TaskJSONResponse(tasks).body
+
+        def detail_stage() -> list[bytes]:
+            responses.orjson = orjson
+            return [
+                TaskJSONResponse(_row_to_task(row)).body for row in task_rows
+            ]
+
+        def export_stage() -> bytes:
+            responses.orjson = orjson
+            return encode_record_lines(_rows_to_records(record_rows))
+
+        return {
+            "list": list_stage,
+            "detail": detail_stage,
+            "export": export_stage,
+        }
+
+    modes = {
+        "response_model": {
+            "list": lambda: response_model(
+                list_field, [_row_to_task(row) for row in task_rows]
+            ),
+            "detail": lambda: [
+                response_model(detail_field, _row_to_task(row))
+                for row in task_rows
+            ],
+            # Прежняя выгрузка: Task на строку и TaskRead на задачу.
+            "export": lambda: b"".join(
+                TaskRead.model_validate(_row_to_task(row))
+                .model_dump_json()
+                .encode()
+                + b"\n"
+                for row in task_rows
+            ),
+        },
+        "fast_type_adapter": fast(None),
+    }
+    installed_orjson = responses.orjson
+    if installed_orjson is not None:
+        modes["fast_orjson"] = fast(installed_orjson)
+
+    results = {}
+    try:
+        for mode, stages in modes.items():
+            for stage, call in stages.items():
+                best = min(timeit.repeat(call, number=1, repeat=repeat))
+                results[f"{mode}_{stage}"] = {
+                    "rows": rows,
+                    "per_row_us": round(best / rows * 1_000_000, 3),
+                    "rows_per_s": round(rows / best, 2),
+                }
+    finally:
+        responses.orjson = installed_orjson
+        loop.close()
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="файл для результатов в JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    report = {
+        "meta": {
+            "rows": arguments.rows,
+            "repeat": arguments.repeat,
+            "python": platform.python_version(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": run(arguments.rows, arguments.repeat),
+    }
+    print(json.dumps(report["results"]))
+    if arguments.output:
+        with open(arguments.output, "w") as output:
+            json.dump(report, output, indent=2)
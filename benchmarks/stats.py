@@ -0,0 +1,32 @@
+import statistics
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """
+    Перцентиль методом ближайшего ранга.
+
+    :param samples: выборка
+    :param q: квантиль от 0 до 1
+    """
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def summarize(latencies: list[float], elapsed: float, errors: int) -> dict:
+    """
+    Сводка по замеру: пропускная способность и перцентили задержки.
+
+    :param latencies: задержки запросов в секундах
+    :param elapsed: общее время замера в секундах
+    :param errors: количество неуспешных запросов
+    """
+    latencies_ms = [value * 1000 for value in latencies] or [0.0]
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0,
+        "p50_ms": round(statistics.median(latencies_ms), 3),
+        "p95_ms": round(percentile(latencies_ms, 0.95), 3),
+        "p99_ms": round(percentile(latencies_ms, 0.99), 3),
+    }
@@ -1,5 +1,24 @@
 #!/bin/sh
 set -e
 
-alembic upgrade head || echo "Alembic migration failed or not configured, skipping"
-exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
\ No newline at end of file
+# Режим запуска: dev (по умолчанию), prod или migrate. Миграции
+# выполняются отдельным запуском с режимом migrate, а не при старте
+# воркеров, в том числе в dev: несколько реплик не должны применять
+# их одновременно.
+MODE="${1:-${APP_MODE:-dev}}"
+
+case "$MODE" in
+  migrate)
+    exec alembic upgrade head
+    ;;
+  prod)
+    exec gunicorn app.main:app --config gunicorn.conf.py
+    ;;
+  dev)
+    exec uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload
+    ;;
+  *)
+    echo "Unknown mode: $MODE (expected dev, prod or migrate)" >&2
+    exit 64
+    ;;
+esac
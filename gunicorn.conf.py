@@ -0,0 +1,19 @@
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "app.entrypoints.worker.UvicornWorker"
+
+# Приложение импортируется в каждом воркере после fork: движок, пул
+# соединений и пулы потоков не должны наследоваться от мастер-процесса.
+preload_app = False
+
+timeout = int(os.getenv("WORKER_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+max_requests = int(os.getenv("MAX_REQUESTS", "0"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "0"))
+
+accesslog = None
+errorlog = "-"